@@ -7,12 +7,27 @@
 
 """Command-line tools for invenio app rdm."""
 
+import gzip
+from importlib import import_module
+from inspect import signature
+from uuid import UUID
+
 import click
+from flask import current_app
 from flask.cli import with_appcontext
-from invenio_access.permissions import system_identity
+from flask_principal import Identity
+from invenio_access.permissions import any_user, system_identity
 from invenio_records_resources.proxies import current_service_registry
 
 from .fixtures import FixturesEngine, Pages
+from .records_ui.exports import BulkExporter
+from .tasks import warm_up_vocabularies_cache
+from .utils.indices import (
+    get_reindex_targets,
+    iter_index_drift,
+    queue_service_index,
+    rebuild_indices,
+)
 
 
 @click.group()
@@ -56,11 +71,8 @@ def create_fixtures():
     click.secho("Created required fixtures!", fg="green")
 
 
-@rdm.command("rebuild-all-indices")
-@click.option("-o", "--order", default="")
-@with_appcontext
-def rebuild_all_indices(order):
-    """Schedule reindexing of (all) items for search with optional selecting and ordering."""
+def _select_services(order):
+    """Get the services to reindex (or check) by name, ``None`` if unknown."""
     services = current_service_registry._services
     service_names = services.keys()
     services_to_reindex = order.split(",") if order else service_names
@@ -75,9 +87,128 @@ def rebuild_all_indices(order):
                 f"You can chose out of these services: {' , '.join(service_names)}",
                 fg="red",
             )
-            return
+            return None
+    return {name: services[name] for name in services_to_reindex}
+
+
+def _read_ids(ids_file):
+    """Read the record ids (UUIDs) of a file, one per line."""
+    if ids_file is None:
+        return None
+    ids = []
+    for line in ids_file:
+        # the output of check-indices is "<id> <reason>"
+        value = line.split(maxsplit=1)[0] if line.strip() else None
+        if not value or value.startswith("#"):
+            continue
+        try:
+            ids.append(UUID(value))
+        except ValueError:
+            raise click.BadParameter(f"Invalid record id: {value}")
+    return ids
+
+
+@rdm.command("rebuild-all-indices")
+@click.option("-o", "--order", default="")
+@click.option(
+    "--direct",
+    is_flag=True,
+    help="Index the records directly with the bulk API, instead of queuing them.",
+)
+@click.option(
+    "--workers",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Number of services reindexed concurrently (with --direct).",
+)
+@click.option(
+    "--chunk-size",
+    default=500,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Number of documents per bulk request (with --direct).",
+)
+@click.option(
+    "--max-rate",
+    default=0,
+    show_default=True,
+    type=click.IntRange(0),
+    help="Maximum number of documents indexed per second, 0 for no limit "
+    "(with --direct).",
+)
+@click.option(
+    "--swap",
+    is_flag=True,
+    help="Load new indices and swap their aliases with the live ones once "
+    "complete, keeping the old indices (implies --direct).",
+)
+@click.option(
+    "--restart",
+    is_flag=True,
+    help="Ignore the checkpoints of a previous rebuild (with --direct).",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    help="Only reindex the records updated since this UTC date(time), and "
+    "remove the ones deleted since then.",
+)
+@click.option(
+    "--ids-file",
+    type=click.File(),
+    help="Only reindex the records whose ids are listed in this file, one "
+    "per line (e.g. the output of check-indices).",
+)
+@with_appcontext
+def rebuild_all_indices(
+    order, direct, workers, chunk_size, max_rate, swap, restart, since, ids_file
+):
+    """Schedule reindexing of (all) items for search with optional selecting and ordering."""
+    services = _select_services(order)
+    if services is None:
+        return
+    services_to_reindex = services.keys()
+    ids = _read_ids(ids_file)
+    if swap and (since is not None or ids is not None):
+        raise click.UsageError("--swap cannot be combined with --since or --ids-file.")
+
+    if direct or swap:
+        click.secho("Rebuilding the indices.", fg="yellow")
+        results = rebuild_indices(
+            services,
+            workers=workers,
+            chunk_size=chunk_size,
+            max_rate=max_rate or None,
+            resume=not restart,
+            swap=swap,
+            since=since,
+            ids=ids,
+        )
+        for name in services_to_reindex:
+            if results.get(name) is None:
+                click.secho(
+                    f"{name} does not use the search cluster, skipping.", fg="green"
+                )
+            elif isinstance(results[name], Exception):
+                click.secho(
+                    f"{name} failed, run the command again to resume it.", fg="red"
+                )
+        return
 
     click.secho("Scheduling bulk indexing.", fg="yellow")
+    if since is not None or ids is not None:
+        for name, service in services.items():
+            try:
+                queued = queue_service_index(name, service, since=since, ids=ids)
+            except NotImplementedError:
+                click.secho(
+                    f"{name} cannot be reindexed partially, skipping.", fg="yellow"
+                )
+            else:
+                click.secho(f"{name}: {queued} records queued.", fg="green")
+        return
+
     for service_to_reindex in services_to_reindex:
         service = services[service_to_reindex]
         if hasattr(service, "rebuild_index"):
@@ -93,3 +224,164 @@ def rebuild_all_indices(order):
             else:
                 # success
                 click.secho("Done.", fg="green")
+
+
+@rdm.command("check-indices")
+@click.option("-o", "--order", default="")
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    help="Only check the records updated since this UTC date(time).",
+)
+@click.option("--chunk-size", default=500, show_default=True, type=click.IntRange(1))
+@click.option(
+    "--output",
+    type=click.File("w"),
+    help="Write the ids of the drifted records to this file, for --ids-file.",
+)
+@with_appcontext
+def check_indices(order, since, chunk_size, output):
+    """Find the records whose indexed document differs from the database."""
+    services = _select_services(order)
+    if services is None:
+        return
+
+    drifted = 0
+    for name, service in services.items():
+        for record_cls, indexer in get_reindex_targets(service):
+            click.secho(f"Checking {name} ({record_cls.__name__})...", fg="yellow")
+            for id_, reason in iter_index_drift(
+                record_cls, indexer, chunk_size=chunk_size, since=since
+            ):
+                drifted += 1
+                click.echo(f"{id_} {reason}", file=output)
+
+    click.secho(
+        f"{drifted} records drifted.", fg="green" if not drifted else "red", err=True
+    )
+
+
+@rdm.command("upgrade")
+@click.argument("script")
+@click.option("--workers", default=1, show_default=True, type=click.IntRange(1))
+@click.option("--batch-size", default=1000, show_default=True, type=click.IntRange(1))
+@click.option("--dry-run", is_flag=True, help="Report the changes, without them.")
+@with_appcontext
+def upgrade(script, workers, batch_size, dry_run):
+    """Run the data migration of an upgrade script, e.g. migrate_12_0_to_13_0."""
+    name = f"invenio_app_rdm.upgrade_scripts.{script}"
+    try:
+        module = import_module(name)
+    except ModuleNotFoundError as e:
+        # only the script itself, not what it imports
+        if e.name != name:
+            raise
+        raise click.BadParameter(f"Unknown upgrade script: {script}")
+
+    # e.g. the engine of the scripts, which is not one
+    execute_upgrade = getattr(module, "execute_upgrade", None)
+    if execute_upgrade is None:
+        raise click.BadParameter(f"Unknown upgrade script: {script}")
+
+    params = signature(execute_upgrade).parameters
+    if "workers" not in params:
+        raise click.BadParameter(
+            f"{script} does not support batches, run it with invenio shell."
+        )
+    execute_upgrade(dry_run=dry_run, batch_size=batch_size, workers=workers)
+
+
+@rdm.command("warm-up-vocabularies")
+@with_appcontext
+def warm_up_vocabularies():
+    """Cache the deposit form vocabularies options of all the languages."""
+    if not current_app.config.get("APP_RDM_DEPOSIT_FORM_VOCABULARIES_CACHE_ENABLED"):
+        click.secho("The vocabularies cache is disabled, nothing to do.", fg="yellow")
+        return
+    warm_up_vocabularies_cache()
+    click.secho("Vocabularies cached.", fg="green")
+
+
+def _open_export_output(output, compression):
+    """Open the output file of an export, optionally compressed."""
+    if compression == "gzip":
+        return gzip.open(output, "wt", encoding="utf-8")
+    elif compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise click.UsageError(
+                "zstd compression requires the 'zstandard' package to be installed."
+            )
+        return zstandard.open(output, "wt", encoding="utf-8")
+    return click.open_file(output, "w", encoding="utf-8")
+
+
+@rdm.command("export")
+@click.argument("export_format")
+@click.option(
+    "-o",
+    "--output",
+    default="-",
+    show_default=True,
+    help="Output file, '-' for the standard output.",
+)
+@click.option(
+    "-c",
+    "--compression",
+    type=click.Choice(["none", "gzip", "zstd"]),
+    default="none",
+    show_default=True,
+    help="Compression of the output file.",
+)
+@click.option("-q", "--query", default="", help="Only export the matching records.")
+@click.option(
+    "-w",
+    "--workers",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of processes serializing the records.",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of records serialized at once.",
+)
+@click.option(
+    "--include-restricted",
+    default=False,
+    is_flag=True,
+    help="Export all the records, not only the public ones.",
+)
+@with_appcontext
+def export_records(
+    export_format, output, compression, query, workers, batch_size, include_restricted
+):
+    """Export all the records in one of the APP_RDM_RECORD_EXPORTERS formats."""
+    if include_restricted:
+        identity = system_identity
+    else:
+        identity = Identity(None)
+        identity.provides.add(any_user)
+
+    try:
+        exporter = BulkExporter(
+            export_format,
+            identity,
+            params={"q": query} if query else None,
+            batch_size=batch_size,
+        )
+    except KeyError:
+        exporters = current_app.config.get("APP_RDM_RECORD_EXPORTERS", {})
+        raise click.BadParameter(
+            f"You can chose out of these formats: {' , '.join(exporters)}",
+            param_hint="EXPORT_FORMAT",
+        )
+
+    chunks = exporter.iter_parallel(workers) if workers > 1 else iter(exporter)
+    with _open_export_output(output, compression) as fp:
+        for chunk in chunks:
+            fp.write(chunk)
@@ -786,8 +786,12 @@ APP_RDM_ROUTES = {
     "record_search": "/search",
     "record_detail": "/records/<pid_value>",
     "record_export": "/records/<pid_value>/export/<export_format>",
+    "records_bulk_export": "/records/export/<export_format>",
     "record_file_preview": "/records/<pid_value>/preview/<path:filename>",
     "record_file_download": "/records/<pid_value>/files/<path:filename>",
+    "record_files_list": "/records/<pid_value>/files-list",
+    "record_media_files_list": "/records/<pid_value>/media-files-list",
+    "record_file_derivative": "/records/<pid_value>/derivatives/<name>/<path:filename>",
     "record_thumbnail": "/records/<pid_value>/thumb<int:size>",
     "record_media_file_download": "/records/<pid_value>/media-files/<path:filename>",
     "record_from_pid": "/<any({schemes}):pid_scheme>/<path:pid_value>",
@@ -891,6 +895,96 @@ APP_RDM_RECORD_EXPORTERS = {
     },
 }
 
+APP_RDM_RECORD_EXPORT_CACHE_ENABLED = False
+"""Cache the serialized records of the export views.
+
+Only public records exported by anonymous users are cached, keyed by record
+revision, export format and serializer configuration.
+"""
+
+APP_RDM_RECORD_EXPORT_CACHE_SIZE = 512
+"""Maximum number of serialized records kept in each worker's memory."""
+
+APP_RDM_RECORD_EXPORT_CACHE_SHARED = False
+"""Also store the serialized records in the configured (shared) cache."""
+
+APP_RDM_RECORD_EXPORT_CACHE_TIMEOUT = 24 * 60 * 60
+"""Timeout in seconds of the serialized records in the shared cache."""
+
+APP_RDM_RECORDS_BULK_EXPORT_ENABLED = False
+"""Enable the bulk export view, streaming all the visible records in a format.
+
+The ``invenio rdm export`` command is always available.
+"""
+
+APP_RDM_RECORDS_BULK_EXPORT_BATCH_SIZE = 500
+"""Number of records serialized and emitted at once by bulk exports."""
+
+APP_RDM_RECORDS_BULK_EXPORT_XML_WRAPPER = "records"
+"""Root element wrapping the records of XML bulk exports."""
+
+APP_RDM_FILES_DOWNLOAD_OFFLOAD = None
+"""Hand the transfer of downloaded record files to the front-end proxy.
+
+Available options:
+
+- ``None`` (default): files are streamed by the application.
+- ``x-accel-redirect``: for Nginx, with the ``X-Accel-Redirect`` header.
+- ``x-sendfile``: for Apache (mod_xsendfile) or lighttpd, with the
+  ``X-Sendfile`` header.
+
+Permissions are checked and stats events emitted by the application in any
+case. Only files whose location matches ``APP_RDM_FILES_DOWNLOAD_OFFLOAD_PATHS``
+are offloaded, the others are still streamed.
+"""
+
+APP_RDM_FILES_DOWNLOAD_OFFLOAD_PATHS = {}
+"""Mapping of file location prefixes to the paths served by the proxy.
+
+For instance, with files stored under ``/opt/invenio/data`` and an Nginx
+``internal`` location ``/protected-files/`` aliased to that directory:
+
+.. code-block:: python
+
+    APP_RDM_FILES_DOWNLOAD_OFFLOAD_PATHS = {
+        "/opt/invenio/data/": "/protected-files/",
+    }
+
+For ``x-sendfile``, map the prefix to itself to send the file system path.
+"""
+
+APP_RDM_FILES_DOWNLOAD_RANGES_ENABLED = True
+"""Serve the byte ranges requested with the ``Range`` header of downloads.
+
+This allows clients to resume interrupted downloads, or read parts of a file.
+Requests continuing a transfer are not counted as downloads in the stats.
+"""
+
+APP_RDM_FILES_DOWNLOAD_MAX_RANGES = 20
+"""Maximum number of ranges in a request, the whole file is sent above."""
+
+APP_RDM_STATS_EVENTS_BUFFER_ENABLED = False
+"""Buffer the record view and file download stats events in memory.
+
+Events are published in batches from a background thread of each process,
+instead of within the request.
+"""
+
+APP_RDM_STATS_EVENTS_BUFFER_SIZE = 10000
+"""Maximum number of buffered stats events, the oldest are dropped above."""
+
+APP_RDM_STATS_EVENTS_BUFFER_BATCH_SIZE = 500
+"""Maximum number of stats events published at once."""
+
+APP_RDM_STATS_EVENTS_BUFFER_FLUSH_INTERVAL = 1
+"""Time (in seconds) between two flushes of the stats events buffer."""
+
+APP_RDM_REQUEST_MEMO_DEBUG = False
+"""Expose the hit/miss counters of the request-scoped memo of service reads.
+
+When enabled, responses get an ``X-App-RDM-Memo`` header.
+"""
+
 APP_RDM_RECORD_LANDING_PAGE_EXTERNAL_LINKS = []
 """ Default format used for adding badges to a record.
 
@@ -962,11 +1056,76 @@ APP_RDM_DISPLAY_DECIMAL_FILE_SIZES = True
 APP_RDM_DEPOSIT_FORM_PUBLISH_MODAL_EXTRA = ""
 """Additional text/html to be displayed in the publish and submit for review modal."""
 
+APP_RDM_DEPOSIT_FORM_RESOURCE_TYPES_LIMIT = 1000
+"""Maximum number of resource types read for the deposit form.
+
+A warning is logged if the vocabulary has more entries.
+"""
+
+APP_RDM_DEPOSIT_FORM_VOCABULARIES_CACHE_ENABLED = False
+"""Cache the vocabularies options of the deposit form, per language.
+
+Options are stored in the configured cache (see ``CACHE_TYPE``) and
+invalidated whenever a vocabulary entry is created, updated or deleted. They
+can be cached ahead of the first deposit with
+``invenio rdm warm-up-vocabularies`` (or the ``warm_up_vocabularies_cache``
+task, e.g. scheduled with ``CELERY_BEAT_SCHEDULE``).
+"""
+
+APP_RDM_DEPOSIT_FORM_VOCABULARIES_CACHE_TIMEOUT = 60 * 60 * 24
+"""Time (in seconds) the vocabularies options of the deposit form are cached."""
+
+APP_RDM_CUSTOM_FIELDS_OPTIONS_CACHE_ENABLED = False
+"""Cache the options of the vocabulary custom fields, per language.
+
+Like the deposit form vocabularies, the options are invalidated whenever a
+vocabulary entry is created, updated or deleted.
+"""
+
+APP_RDM_CUSTOM_FIELDS_OPTIONS_CACHE_TIMEOUT = 60 * 60 * 24
+"""Time (in seconds) the options of the vocabulary custom fields are cached."""
+
 APP_RDM_RECORD_LANDING_PAGE_TEMPLATE = "invenio_app_rdm/records/detail.html"
 
+APP_RDM_RECORD_LANDING_PAGE_CACHE_ENABLED = False
+"""Cache the rendered landing page of public records for anonymous users.
+
+Pages are stored in the configured cache (see ``CACHE_TYPE``) and keyed by
+record, record and parent revisions, latest version and locale, so that a new
+revision or version is served right after being published. Statistics shown
+on the page may lag behind by up to the cache timeout.
+"""
+
+APP_RDM_RECORD_LANDING_PAGE_CACHE_TIMEOUT = 60 * 60
+"""Timeout in seconds of the cached landing pages."""
+
+APP_RDM_RECORD_FILES_PAGE_SIZE = 100
+"""Number of file entries rendered in the landing page and request pages.
+
+The totals of the files are still shown, and the remaining entries can be
+listed from the ``record_files_list`` route. ``None`` renders all the entries.
+"""
+
+APP_RDM_RECORD_FILES_LIST_MAX_SIZE = 1000
+"""Maximum number of file entries per page of the ``record_files_list`` route."""
+
 APP_RDM_RECORD_THUMBNAIL_SIZES = [10, 50, 100, 250, 750, 1200]
 """Allowed record thumbnail sizes."""
 
+APP_RDM_RECORD_THUMBNAIL_CACHE_TIMEOUT = 60 * 60 * 24
+"""Timeout in seconds of the cached thumbnail files of public records.
+
+The thumbnail file of public records is always cached per record revision.
+"""
+
+APP_RDM_RECORD_THUMBNAIL_RENDERED_CACHE_ENABLED = False
+"""Serve the thumbnails of public records from the cache.
+
+Thumbnails are rendered once per size by the IIIF service and stored in the
+configured cache (see ``CACHE_TYPE``) like the IIIF derivatives, instead of
+redirecting to the IIIF server for every request.
+"""
+
 APP_RDM_DETAIL_SIDE_BAR_TEMPLATES = [
     "invenio_app_rdm/records/details/side_bar/manage_menu.html",
     "invenio_app_rdm/records/details/side_bar/metrics.html",
@@ -986,11 +1145,44 @@ APP_RDM_DETAIL_SIDE_BAR_TEMPLATES = [
 APP_RDM_FILES_INTEGRITY_REPORT_TEMPLATE = (
     "invenio_app_rdm/files_integrity_report/email/files_integrity_report.html"
 )
-"""Files integrity report template"""
+"""Files integrity report template.
+
+Each of its ``entries`` has the ``file``, and the ``filename``, ``record`` and
+``draft`` of the file if any. Only the ``id`` of the ``record`` and ``draft``
+is available, not their whole JSON.
+"""
 
 APP_RDM_FILES_INTEGRITY_REPORT_SUBJECT = "Files integrity report"
 """Files integrity report subject"""
 
+APP_RDM_FILES_INTEGRITY_VERIFY_WORKERS = 4
+"""Number of threads verifying the pending files before the integrity report.
+
+It bounds the number of files read at once from the storage.
+"""
+
+APP_RDM_FILES_INTEGRITY_VERIFY_CHUNK_SIZE = 100
+"""Number of files verified, and committed, together by a thread."""
+
+APP_RDM_FILES_INTEGRITY_VERIFY_TIME_BUDGET = 60 * 60
+"""Time in seconds after which the pending files are left for the next report.
+
+``None`` verifies all the pending files.
+"""
+
+APP_RDM_FILES_INTEGRITY_VERIFY_BYTES_BUDGET = None
+"""Maximum number of bytes read to verify the pending files, ``None`` for all."""
+
+APP_RDM_FILES_INTEGRITY_REPORT_BATCH_SIZE = 1000
+"""Number of files whose records and drafts are looked up at once in the report."""
+
+APP_RDM_FILES_INTEGRITY_REPORT_ATTACHMENT_THRESHOLD = 1000
+"""Maximum number of files listed in the integrity report e-mail.
+
+Larger reports list only the first files in the e-mail, and all of them in an
+attached CSV file. ``None`` always lists all the files in the e-mail.
+"""
+
 APP_RDM_ADMIN_EMAIL_RECIPIENT = "info@inveniosoftware.org"
 """Admin e-mail"""
 
@@ -1096,6 +1288,26 @@ IIIF_SIMPLE_PREVIEWER_NATIVE_EXTENSIONS = ["gif", "png"]
 IIIF_SIMPLE_PREVIEWER_SIZE = "!800,800"
 """Size of image in IIIF preview window. Must be a valid IIIF Image API size parameter."""
 
+APP_RDM_IIIF_DERIVATIVES_ENABLED = False
+"""Use pre-rendered derivatives of the images in the simple IIIF previewer.
+
+The previewer rendition (see ``IIIF_SIMPLE_PREVIEWER_SIZE``) of each image of
+a record, and the thumbnails of its thumbnail image, are rendered once in a
+background task and stored in the configured cache (see ``CACHE_TYPE``),
+keyed by file checksum. The task is scheduled by the first request of a
+missing derivative, which is served by the IIIF server in the meantime.
+"""
+
+APP_RDM_IIIF_DERIVATIVES_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+"""Timeout in seconds of the cached derivatives and rendered thumbnails."""
+
+APP_RDM_IIIF_DERIVATIVES_WORKERS = 1
+"""Number of processes rendering the derivatives of a record.
+
+Daemonic processes, such as the default Celery workers, always render them
+sequentially.
+"""
+
 IIIF_FORMATS = {
     "pdf": "application/pdf",
     "gif": "image/gif",
@@ -1125,6 +1337,7 @@ IIIF_FORMATS_PIL_MAP = {
 # See https://github.com/inveniosoftware/invenio-previewer/blob/master/invenio_previewer/config.py  # noqa
 
 PREVIEWER_PREFERENCE = [
+    "csv_head",
     "csv_papaparsejs",
     "pdfjs",
     "iiif_simple",
@@ -1135,10 +1348,47 @@ PREVIEWER_PREFERENCE = [
     "video_videojs",
     "audio_videojs",
     "ipynb",
+    "zip_listing",
     "zip",
+    "txt_head",
     "txt",
 ]
-"""Preferred previewers."""
+"""Preferred previewers.
+
+``csv_head``, ``zip_listing`` and ``txt_head`` only read the head (or the
+central directory) of the files of the records, the previewers following them
+are used for the other files.
+"""
+
+APP_RDM_PREVIEWER_DEFAULT_MAX_READ_BYTES = 16 * 1024 * 1024
+"""Maximum number of bytes a previewer reads from a file, ``None`` if unbounded.
+
+Previewers reading past it see the end of the file, so that previewing a
+large file only loads its head in memory.
+"""
+
+APP_RDM_PREVIEWER_MAX_READ_BYTES = {
+    "zip": None,
+    "zip_listing": None,
+}
+"""Maximum number of bytes read per previewer, overriding the default.
+
+The ZIP previewer only reads the central directory at the end of the file,
+and must be able to seek there.
+"""
+
+APP_RDM_PREVIEWER_CSV_MAX_LINES = 1000
+"""Number of lines of a CSV file shown by the ``csv_head`` previewer."""
+
+APP_RDM_PREVIEWER_CACHE_ENABLED = False
+"""Cache the artifacts computed from previewed files (head, lines, listings).
+
+Artifacts are stored in the configured cache (see ``CACHE_TYPE``) and keyed by
+file checksum.
+"""
+
+APP_RDM_PREVIEWER_CACHE_TIMEOUT = 60 * 60 * 24
+"""Timeout in seconds of the cached preview artifacts."""
 
 # Invenio-Pages
 # =============
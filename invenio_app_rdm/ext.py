@@ -15,6 +15,8 @@ from flask_menu import current_menu
 from invenio_i18n import lazy_gettext as _
 
 from .communities_ui.views.ui import _show_browse_page
+from .records_ui.cache import register_vocabularies_options_invalidation
+from .records_ui.custom_fields import init_custom_fields_plan
 
 
 def _is_branded_community():
@@ -29,6 +31,8 @@ def finalize_app(app):
     """Finalize app."""
     init_menu(app)
     init_config(app)
+    init_cache(app)
+    init_custom_fields_plan(app)
 
 
 def init_config(app):
@@ -66,6 +70,15 @@ def init_config(app):
         )
 
 
+def init_cache(app):
+    """Initialize the caches of the vocabularies options."""
+    config = app.config
+    if config.get("APP_RDM_DEPOSIT_FORM_VOCABULARIES_CACHE_ENABLED") or config.get(
+        "APP_RDM_CUSTOM_FIELDS_OPTIONS_CACHE_ENABLED"
+    ):
+        register_vocabularies_options_invalidation()
+
+
 def init_menu(app):
     """Init menu."""
     current_menu.submenu("actions.deposit").register(
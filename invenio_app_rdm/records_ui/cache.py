@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Caching helpers for the record pages."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from uuid import uuid4
+
+from flask import current_app, request, session
+from flask_login import current_user
+from invenio_cache import current_cache
+from invenio_i18n.ext import current_i18n
+from invenio_vocabularies.proxies import current_service as vocabulary_service
+from invenio_vocabularies.records.models import VocabularyMetadata, VocabularyScheme
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+
+class LRUCache:
+    """Thread-safe in-process least recently used cache."""
+
+    def __init__(self):
+        """Constructor."""
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """Return the cached value or ``None``."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, maxsize):
+        """Cache a value, evicting the least recently used ones above maxsize."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached values."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        """Number of cached values."""
+        return len(self._data)
+
+
+def is_public_anonymous_request(record, is_preview=False, include_deleted=False):
+    """Check if a record is requested anonymously and is fully public.
+
+    Anything that can make the response differ between two anonymous visitors
+    (previews, secret links, flashed messages) makes the request non public.
+    """
+    if is_preview or include_deleted or current_user.is_authenticated:
+        return False
+    if request.args.get("token") or session.get("token") or "_flashes" in session:
+        return False
+
+    access = record.data.get("access", {})
+    return access.get("record") == "public" and access.get("files") == "public"
+
+
+def record_cache_key(prefix, record, *extra):
+    """Build a cache key bound to the current revision of a record.
+
+    The key changes whenever a new revision of the record or of its parent is
+    committed, or a new version of the record is published, so outdated
+    entries are never served and simply expire from the cache.
+    """
+    record_ = record._record
+    parts = [
+        prefix,
+        str(record.id),
+        str(record_.revision_id),
+        str(record_.parent.revision_id),
+        str(record_.versions.latest_id),
+    ]
+    parts.extend(str(e) for e in extra)
+    return ":".join(parts)
+
+
+#
+# Landing page
+#
+def is_landing_page_cacheable(record, is_preview=False, include_deleted=False):
+    """Check if the rendered landing page of a record can be cached.
+
+    Only the pages of published and fully public records, rendered for
+    anonymous users, are cached.
+    """
+    if not current_app.config.get("APP_RDM_RECORD_LANDING_PAGE_CACHE_ENABLED"):
+        return False
+    return is_public_anonymous_request(record, is_preview, include_deleted)
+
+
+def landing_page_cache_key(record):
+    """Build the landing page cache key of a record."""
+    community_id = record._record.parent.get("communities", {}).get("default") or ""
+    return record_cache_key(
+        "app-rdm:landing-page", record, current_i18n.locale, community_id
+    )
+
+
+def get_cached_landing_page(cache_key):
+    """Return the cached landing page or ``None``."""
+    return current_cache.get(cache_key)
+
+
+def set_cached_landing_page(cache_key, page):
+    """Cache a rendered landing page."""
+    current_cache.set(
+        cache_key,
+        page,
+        timeout=current_app.config["APP_RDM_RECORD_LANDING_PAGE_CACHE_TIMEOUT"],
+    )
+
+
+#
+# Exports
+#
+_exports_cache = LRUCache()
+"""Per-process cache of serialized records."""
+
+
+def is_export_cacheable(record, is_preview=False):
+    """Check if the serialization of a record can be cached."""
+    if not current_app.config.get("APP_RDM_RECORD_EXPORT_CACHE_ENABLED"):
+        return False
+    return is_public_anonymous_request(record, is_preview)
+
+
+def export_cache_key(record, export_format, exporter):
+    """Build the export cache key of a record for the given format."""
+    serializer_hash = hashlib.md5(
+        repr((exporter["serializer"], exporter.get("params", {}))).encode("utf-8")
+    ).hexdigest()
+    return record_cache_key("app-rdm:export", record, export_format, serializer_hash)
+
+
+def get_cached_export(cache_key):
+    """Return the cached serialized record or ``None``.
+
+    The per-process cache is looked up first, then the shared cache if
+    enabled.
+    """
+    exported_record = _exports_cache.get(cache_key)
+    if exported_record is None and current_app.config.get(
+        "APP_RDM_RECORD_EXPORT_CACHE_SHARED"
+    ):
+        exported_record = current_cache.get(cache_key)
+        if exported_record is not None:
+            _exports_cache.set(
+                cache_key,
+                exported_record,
+                current_app.config["APP_RDM_RECORD_EXPORT_CACHE_SIZE"],
+            )
+    return exported_record
+
+
+def set_cached_export(cache_key, exported_record):
+    """Cache a serialized record."""
+    config = current_app.config
+    _exports_cache.set(
+        cache_key, exported_record, config["APP_RDM_RECORD_EXPORT_CACHE_SIZE"]
+    )
+    if config.get("APP_RDM_RECORD_EXPORT_CACHE_SHARED"):
+        current_cache.set(
+            cache_key,
+            exported_record,
+            timeout=config["APP_RDM_RECORD_EXPORT_CACHE_TIMEOUT"],
+        )
+
+
+#
+# Preview artifacts
+#
+def get_preview_artifact(checksum, name, compute):
+    """Get an artifact computed from a previewed file, e.g. its first lines.
+
+    Artifacts are cached by file checksum if
+    ``APP_RDM_PREVIEWER_CACHE_ENABLED`` is set.
+    """
+    config = current_app.config
+    if not checksum or not config.get("APP_RDM_PREVIEWER_CACHE_ENABLED"):
+        return compute()
+
+    cache_key = f"app-rdm:preview:{checksum}:{name}"
+    artifact = current_cache.get(cache_key)
+    if artifact is None:
+        artifact = compute()
+        current_cache.set(
+            cache_key, artifact, timeout=config["APP_RDM_PREVIEWER_CACHE_TIMEOUT"]
+        )
+    return artifact
+
+
+#
+# Deposit form vocabularies
+#
+_vocabularies_generation_key = "app-rdm:deposit-vocabularies:generation"
+
+_vocabularies_settle_time = 60
+"""Seconds after a vocabulary change during which options are cached briefly.
+
+Vocabularies are indexed after their changes are committed, so the options
+built right after a change might still miss it.
+"""
+
+
+def is_vocabularies_options_cacheable():
+    """Check if the vocabularies options of the deposit form can be cached."""
+    return current_app.config.get("APP_RDM_DEPOSIT_FORM_VOCABULARIES_CACHE_ENABLED")
+
+
+def _new_vocabularies_generation(changed_at=0):
+    """Build a generation identifier, prefixed by the time of the change."""
+    return f"{int(changed_at)}-{uuid4().hex}"
+
+
+def _vocabularies_generation():
+    """Get the identifier of the current generation of the vocabularies.
+
+    It is renewed whenever a vocabulary changes, to invalidate at once all the
+    cached options that are built from vocabularies.
+    """
+    generation = current_cache.get(_vocabularies_generation_key)
+    if generation is None:
+        # another process might be initializing it at the same time
+        current_cache.add(
+            _vocabularies_generation_key, _new_vocabularies_generation(), timeout=0
+        )
+        generation = current_cache.get(_vocabularies_generation_key)
+    return generation
+
+
+def _vocabularies_options_timeout(timeout):
+    """Get the timeout of options built from the current generation.
+
+    Options built while a change settles are cached until it is settled, then
+    rebuilt from the refreshed index.
+    """
+    changed_at, _, _ = _vocabularies_generation().partition("-")
+    try:
+        settled_in = int(changed_at) + _vocabularies_settle_time - time.time()
+    except ValueError:
+        return timeout
+    if settled_in <= 0:
+        return timeout
+    return min(timeout, int(settled_in) + 1)
+
+
+def vocabularies_options_cache_key(locale):
+    """Build the vocabularies options cache key for a locale."""
+    return f"app-rdm:deposit-vocabularies:{_vocabularies_generation()}:{locale}"
+
+
+def get_cached_vocabularies_options(cache_key):
+    """Return the cached vocabularies options or ``None``."""
+    return current_cache.get(cache_key)
+
+
+def set_cached_vocabularies_options(cache_key, vocabularies):
+    """Cache the vocabularies options of a locale."""
+    current_cache.set(
+        cache_key,
+        vocabularies,
+        timeout=_vocabularies_options_timeout(
+            current_app.config["APP_RDM_DEPOSIT_FORM_VOCABULARIES_CACHE_TIMEOUT"]
+        ),
+    )
+
+
+def is_custom_field_options_cacheable():
+    """Check if the vocabulary options of custom fields can be cached."""
+    return current_app.config.get("APP_RDM_CUSTOM_FIELDS_OPTIONS_CACHE_ENABLED")
+
+
+def _custom_field_options_cache_key(field_name, locale):
+    """Build the options cache key of a custom field for a locale."""
+    generation = _vocabularies_generation()
+    return f"app-rdm:custom-field-options:{generation}:{field_name}:{locale}"
+
+
+def get_cached_custom_field_options(field_name, locale):
+    """Return the cached options of a custom field or ``None``."""
+    return current_cache.get(_custom_field_options_cache_key(field_name, locale))
+
+
+def set_cached_custom_field_options(field_name, locale, options):
+    """Cache the options of a custom field for a locale."""
+    current_cache.set(
+        _custom_field_options_cache_key(field_name, locale),
+        options,
+        timeout=_vocabularies_options_timeout(
+            current_app.config["APP_RDM_CUSTOM_FIELDS_OPTIONS_CACHE_TIMEOUT"]
+        ),
+    )
+
+
+def forget_read_all_vocabulary(type, fields):
+    """Delete the cache entry of ``read_all`` for a vocabulary and fields.
+
+    ``read_all`` keeps its own untimed cache entries, which are not
+    invalidated on changes, and looks them up even when asked not to cache.
+    Options cached here must not be built from them.
+    """
+    current_cache.delete(f"{type}__{'-'.join(fields)}")
+
+
+def read_all_vocabulary(identity, type, fields, cache=True, **kwargs):
+    """Read all the entries of a vocabulary, optionally bypassing its cache."""
+    if not cache:
+        forget_read_all_vocabulary(type, fields)
+    return vocabulary_service.read_all(
+        identity, fields=fields, type=type, cache=cache, **kwargs
+    )
+
+
+def invalidate_vocabularies_options():
+    """Invalidate the cached vocabularies options of all locales.
+
+    This includes the options of the vocabulary custom fields.
+    """
+    current_cache.set(
+        _vocabularies_generation_key,
+        _new_vocabularies_generation(changed_at=time.time()),
+        timeout=0,
+    )
+
+
+def _mark_vocabularies_changed(mapper, connection, target):
+    """Flag the session of a changed vocabulary entry."""
+    session = object_session(target)
+    if session is not None:
+        session.info["app_rdm_vocabularies_changed"] = True
+
+
+def _invalidate_changed_vocabularies(session):
+    """Invalidate the vocabularies options once the changes are committed."""
+    if session.info.pop("app_rdm_vocabularies_changed", False):
+        invalidate_vocabularies_options()
+
+
+def _discard_changed_vocabularies(session):
+    """Forget about the changes of a rolled back session."""
+    session.info.pop("app_rdm_vocabularies_changed", None)
+
+
+def register_vocabularies_options_invalidation():
+    """Invalidate the vocabularies options whenever a vocabulary is changed."""
+    for model in (VocabularyMetadata, VocabularyScheme):
+        for name in ("after_insert", "after_update", "after_delete"):
+            if not event.contains(model, name, _mark_vocabularies_changed):
+                event.listen(model, name, _mark_vocabularies_changed)
+
+    for name, listener in (
+        ("after_commit", _invalidate_changed_vocabularies),
+        ("after_rollback", _discard_changed_vocabularies),
+    ):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
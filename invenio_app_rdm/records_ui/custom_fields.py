@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Compiled custom fields UI configuration."""
+
+from copy import copy
+from types import MappingProxyType
+
+from flask import current_app, g
+from invenio_i18n.ext import current_i18n
+
+from .cache import (
+    forget_read_all_vocabulary,
+    get_cached_custom_field_options,
+    is_custom_field_options_cacheable,
+    set_cached_custom_field_options,
+)
+
+
+class CustomFieldsPlan:
+    """Custom fields UI configuration, compiled once per application.
+
+    The UI configuration is copied from ``RDM_CUSTOM_FIELDS_UI`` so that the
+    application config is never modified, and must not be modified itself.
+    Neither are the ``RDM_CUSTOM_FIELDS`` instances: the options of the
+    vocabulary fields whose ``sort_by`` is set in the UI configuration are read
+    from copies of the fields, with this ``sort_by``.
+    """
+
+    def __init__(self, ui, fields, vocabularies, error_labels, sort_by=None):
+        """Constructor."""
+        self.ui = ui
+        self.fields = MappingProxyType(fields)
+        self.vocabularies = tuple(vocabularies)
+        self.error_labels = MappingProxyType(error_labels)
+        self.sort_by = MappingProxyType(sort_by or {})
+        options_fields = {}
+        for name, field_sort_by in self.sort_by.items():
+            options_fields[name] = copy(fields[name])
+            options_fields[name].sort_by = field_sort_by
+        self._options_fields = options_fields
+
+    @classmethod
+    def compile(cls, config):
+        """Compile the custom fields configuration of an application."""
+        # copy the sections and fields, which are the only levels modified
+        conf_ui = [
+            {**section_cfg, "fields": [dict(f) for f in section_cfg["fields"]]}
+            for section_cfg in config.get("RDM_CUSTOM_FIELDS_UI", [])
+        ]
+        conf_backend = {cf.name: cf for cf in config.get("RDM_CUSTOM_FIELDS", [])}
+        vocabularies = []
+        error_labels = {}
+        sort_by = {}
+
+        for section_cfg in conf_ui:
+            for field in section_cfg["fields"]:
+                field_instance = conf_backend.get(field["field"])
+                # Compute the dictionary to map field path to error labels
+                # for each custom field. This is the label shown at the top of
+                # the upload form
+                field_error_label = field.get("props", {}).get("label")
+                if field_error_label:
+                    error_labels[f"custom_fields.{field['field']}"] = field_error_label
+                if getattr(field_instance, "relation_cls", None):
+                    field_sort_by = field.get("props", {}).get("sort_by")
+                    if field_sort_by:
+                        sort_by[field["field"]] = field_sort_by
+                    # mark field as vocabulary
+                    field["is_vocabulary"] = True
+                    vocabularies.append(field["field"])
+
+        return cls(conf_ui, conf_backend, vocabularies, error_labels, sort_by)
+
+    def load(self):
+        """Load the UI configuration, with the options of vocabulary fields."""
+        ui = []
+        for section_cfg in self.ui:
+            fields = []
+            for field in section_cfg["fields"]:
+                if field.get("is_vocabulary"):
+                    field = {
+                        **field,
+                        "props": {
+                            **field.get("props", {}),
+                            "options": self.options(field["field"]),
+                        },
+                    }
+                fields.append(field)
+            ui.append({**section_cfg, "fields": fields})
+
+        return {
+            "ui": ui,
+            "vocabularies": list(self.vocabularies),
+            "error_labels": dict(self.error_labels),
+        }
+
+    def read_options(self, field_name):
+        """Read the vocabulary options of a field, with the field itself."""
+        field = self._options_fields.get(field_name) or self.fields[field_name]
+        return field.options(g.identity)
+
+    def options(self, field_name):
+        """Get the vocabulary options of a field, cached per locale if enabled."""
+        if not is_custom_field_options_cacheable():
+            return self.read_options(field_name)
+
+        locale = current_i18n.locale
+        options = get_cached_custom_field_options(field_name, locale)
+        if options is None:
+            # invalidated on changes, unlike the cache of ``read_all``
+            field = self.fields[field_name]
+            vocabulary_id = getattr(field, "vocabulary_id", None)
+            if vocabulary_id is not None:
+                forget_read_all_vocabulary(vocabulary_id, field.field_keys)
+            options = self.read_options(field_name)
+            set_cached_custom_field_options(field_name, locale, options)
+        return options
+
+
+def init_custom_fields_plan(app):
+    """Compile the custom fields plan of an application."""
+    app.extensions["invenio-app-rdm-custom-fields"] = CustomFieldsPlan.compile(
+        app.config
+    )
+
+
+def get_custom_fields_plan():
+    """Get the custom fields plan of the current application."""
+    app = current_app._get_current_object()
+    if "invenio-app-rdm-custom-fields" not in app.extensions:
+        init_custom_fields_plan(app)
+    return app.extensions["invenio-app-rdm-custom-fields"]
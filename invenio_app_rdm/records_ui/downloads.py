@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Delivery of the record files."""
+
+from datetime import timezone
+from urllib.parse import quote
+from uuid import uuid4
+
+from flask import current_app, request
+from invenio_files_rest.helpers import sanitize_mimetype
+
+_offload_headers = {
+    "x-accel-redirect": "X-Accel-Redirect",
+    "x-sendfile": "X-Sendfile",
+}
+
+_security_headers = {
+    "Content-Security-Policy": "default-src 'none';",
+    "X-Content-Type-Options": "nosniff",
+    "X-Download-Options": "noopen",
+    "X-Permitted-Cross-Domain-Policies": "none",
+    "X-Frame-Options": "deny",
+}
+
+
+def get_offload_path(uri):
+    """Map the URI of a stored file to the path served by the proxy.
+
+    The longest matching prefix of ``APP_RDM_FILES_DOWNLOAD_OFFLOAD_PATHS`` is
+    replaced. Without a matching prefix, ``None`` is returned so that the file
+    is streamed by the application instead (e.g. for remote storages).
+    """
+    paths = current_app.config.get("APP_RDM_FILES_DOWNLOAD_OFFLOAD_PATHS", {})
+    for prefix in sorted(paths, key=len, reverse=True):
+        if uri.startswith(prefix):
+            return paths[prefix] + uri[len(prefix) :]
+    return None
+
+
+def content_disposition(filename, as_attachment):
+    """Build the Content-Disposition header value of a file."""
+    disposition = "attachment" if as_attachment else "inline"
+    try:
+        filename.encode("ascii")
+    except UnicodeEncodeError:
+        return f"{disposition}; filename*=UTF-8''{quote(filename)}"
+    filename = filename.replace("\\", "\\\\").replace('"', '\\"')
+    return f'{disposition}; filename="{filename}"'
+
+
+def _set_file_headers(response, obj, as_attachment):
+    """Set the headers describing a sent file."""
+    file_instance = obj.file
+    response.headers["Content-Disposition"] = content_disposition(
+        obj.key, as_attachment
+    )
+    response.headers.update(_security_headers)
+    if file_instance.checksum:
+        response.set_etag(file_instance.checksum)
+    response.last_modified = file_instance.updated
+
+
+def offload_file_download(file_item, as_attachment=False):
+    """Hand the transfer of a file to the front-end proxy, if configured.
+
+    Returns ``None`` when the file must be streamed by the application, i.e.
+    when offloading is disabled or the file is not in a mapped location.
+    """
+    mode = current_app.config.get("APP_RDM_FILES_DOWNLOAD_OFFLOAD")
+    if mode not in _offload_headers or request.method not in ("GET", "HEAD"):
+        return None
+
+    obj = file_item._file.object_version
+    file_instance = obj.file
+    if file_instance is None or not file_instance.uri:
+        return None
+    path = get_offload_path(file_instance.uri)
+    if path is None:
+        return None
+
+    response = current_app.response_class(
+        mimetype=sanitize_mimetype(obj.mimetype, filename=obj.key)
+    )
+    response.headers[_offload_headers[mode]] = (
+        quote(path) if mode == "x-accel-redirect" else path
+    )
+    _set_file_headers(response, obj, as_attachment)
+    return response
+
+
+#
+# Range requests
+#
+_range_chunk_size = 64 * 1024
+
+
+def _is_ranges_enabled():
+    """Check if range requests are served."""
+    return current_app.config.get("APP_RDM_FILES_DOWNLOAD_RANGES_ENABLED", False)
+
+
+def _to_utc(dt):
+    """Make a (possibly naive UTC) datetime aware, without microseconds."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _if_range_matches(file_instance):
+    """Check the ``If-Range`` precondition of the request against a file."""
+    if_range = request.if_range
+    if if_range.etag:
+        return if_range.etag == file_instance.checksum
+    if if_range.date:
+        return _to_utc(if_range.date) == _to_utc(file_instance.updated)
+    return True
+
+
+def _requested_ranges(size):
+    """Get the satisfiable ``(start, stop)`` byte ranges of the request.
+
+    Returns ``None`` when the whole file must be sent instead.
+    """
+    range_ = request.range
+    if range_ is None or range_.units != "bytes":
+        return None
+    max_ranges = current_app.config["APP_RDM_FILES_DOWNLOAD_MAX_RANGES"]
+    if len(range_.ranges) > max_ranges:
+        # like most servers, ignore abusive range requests
+        return None
+
+    ranges = []
+    for begin, end in range_.ranges:
+        if begin < 0:
+            start, stop = max(size + begin, 0), size
+        else:
+            start, stop = begin, size if end is None else min(end, size)
+        if start < stop:
+            ranges.append((start, stop))
+    return ranges
+
+
+def is_partial_download(file_item):
+    """Check if the request continues a transfer instead of starting one.
+
+    Such requests fetch a range that does not start at the beginning of the
+    file, and are not counted as downloads. When the ``If-Range``
+    precondition fails, the whole file is sent and counted.
+    """
+    if not _is_ranges_enabled():
+        return False
+    range_ = request.range
+    if range_ is None or range_.units != "bytes" or not range_.ranges:
+        return False
+    file_instance = file_item._file.object_version.file
+    if file_instance is None or not _if_range_matches(file_instance):
+        return False
+    return all(begin != 0 for begin, _ in range_.ranges)
+
+
+def _read_range(fp, start, stop):
+    """Yield the bytes of a range of an opened file, in chunks."""
+    fp.seek(start)
+    remaining = stop - start
+    while remaining > 0:
+        chunk = fp.read(min(_range_chunk_size, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _stream_ranges(file_instance, ranges, mimetype, boundary):
+    """Yield the requested ranges, as a multipart body if more than one."""
+    fp = file_instance.storage().open()
+    try:
+        if boundary is None:
+            start, stop = ranges[0]
+            yield from _read_range(fp, start, stop)
+            return
+        for start, stop in ranges:
+            yield _part_header(boundary, mimetype, start, stop, file_instance.size)
+            yield from _read_range(fp, start, stop)
+            yield b"\r\n"
+        yield f"--{boundary}--\r\n".encode("ascii")
+    finally:
+        fp.close()
+
+
+def _part_header(boundary, mimetype, start, stop, size):
+    """Header of a part of a ``multipart/byteranges`` body."""
+    return (
+        f"--{boundary}\r\n"
+        f"Content-Type: {mimetype}\r\n"
+        f"Content-Range: bytes {start}-{stop - 1}/{size}\r\n\r\n"
+    ).encode("ascii")
+
+
+def send_file_ranges(file_item, as_attachment=False):
+    """Send the requested byte ranges of a file.
+
+    Only the requested ranges are read from the storage. Returns ``None`` when
+    the whole file must be sent instead, i.e. without (valid) ``Range`` header
+    or when the ``If-Range`` precondition fails.
+    """
+    if not _is_ranges_enabled() or request.method not in ("GET", "HEAD"):
+        return None
+
+    obj = file_item._file.object_version
+    file_instance = obj.file
+    if file_instance is None or not file_instance.uri:
+        return None
+    size = file_instance.size
+    ranges = _requested_ranges(size)
+    if ranges is None or not _if_range_matches(file_instance):
+        return None
+
+    mimetype = sanitize_mimetype(obj.mimetype, filename=obj.key)
+    if not ranges:
+        response = current_app.response_class(status=416)
+        response.headers["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if len(ranges) == 1:
+        start, stop = ranges[0]
+        boundary = None
+        content_length = stop - start
+    else:
+        boundary = uuid4().hex
+        content_length = sum(
+            len(_part_header(boundary, mimetype, start, stop, size)) + stop - start + 2
+            for start, stop in ranges
+        ) + len(f"--{boundary}--\r\n")
+
+    response = current_app.response_class(
+        _stream_ranges(file_instance, ranges, mimetype, boundary),
+        status=206,
+        direct_passthrough=True,
+    )
+    if boundary is None:
+        response.mimetype = mimetype
+        response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    else:
+        response.content_type = f"multipart/byteranges; boundary={boundary}"
+    response.content_length = content_length
+    response.headers["Accept-Ranges"] = "bytes"
+    _set_file_headers(response, obj, as_attachment)
+    return response
+
+
+def send_file_item(file_item, as_attachment=False):
+    """Send a file, offloading it to the front-end proxy if configured.
+
+    Otherwise, the requested byte ranges or the whole file are streamed.
+    """
+    response = offload_file_download(file_item, as_attachment=as_attachment)
+    if response is None:
+        response = send_file_ranges(file_item, as_attachment=as_attachment)
+    if response is None:
+        response = file_item.send_file(as_attachment=as_attachment)
+        if _is_ranges_enabled() and response.status_code == 200:
+            response.headers["Accept-Ranges"] = "bytes"
+    return response
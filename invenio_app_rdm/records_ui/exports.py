@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Bulk export of records in any of the configured export formats."""
+
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import get_context
+
+from flask import current_app
+from invenio_db import db
+from invenio_rdm_records.proxies import current_rdm_records
+from invenio_search import current_search
+
+from .utils import get_export_serializer
+
+_xml_declaration = re.compile(r"^\s*<\?xml[^>]*\?>\s*")
+
+
+def get_bulk_format(exporter):
+    """Get how the serialized records of an exporter are framed in a dump.
+
+    Returns one of ``jsonl`` (one JSON document per line), ``xml`` (XML
+    documents concatenated inside a wrapper element) or ``text`` (documents
+    separated by a blank line, e.g. BibTeX). It can be set explicitly with the
+    ``bulk-format`` key of the exporter, otherwise it is guessed from the
+    exporter's content type.
+    """
+    bulk_format = exporter.get("bulk-format")
+    if bulk_format:
+        return bulk_format
+
+    content_type = exporter.get("content-type", "")
+    if content_type.endswith("json"):
+        return "jsonl"
+    if content_type.endswith("xml"):
+        return "xml"
+    return "text"
+
+
+def serialize_record(exporter, record):
+    """Serialize a single record for a bulk export of the given exporter."""
+    serialized = get_export_serializer(exporter).serialize_object(record)
+    if isinstance(serialized, bytes):
+        serialized = serialized.decode("utf-8")
+
+    bulk_format = get_bulk_format(exporter)
+    if bulk_format == "jsonl":
+        return json.dumps(json.loads(serialized), ensure_ascii=False) + "\n"
+    elif bulk_format == "xml":
+        return _xml_declaration.sub("", serialized).strip() + "\n"
+    return serialized.strip() + "\n\n"
+
+
+#
+# Process pool workers
+#
+_worker_app = None
+
+
+def _init_worker(app):
+    """Keep the (forked) application, to run the serializers in its context.
+
+    The connections inherited from the parent are not shared: the pool of the
+    database engine is replaced, without closing the parent's connections, and
+    the search client is built again on first use.
+    """
+    global _worker_app
+    _worker_app = app
+    with app.app_context():
+        db.engine.dispose(close=False)
+        # invenio-search has no public way to reset its client: its ``client``
+        # property builds (and keeps) a new one when ``_client`` is unset
+        current_search._client = None
+
+
+def _serialize_batch(export_format, records):
+    """Serialize a batch of records inside a pool worker."""
+    with _worker_app.app_context():
+        exporter = current_app.config["APP_RDM_RECORD_EXPORTERS"][export_format]
+        return "".join(serialize_record(exporter, r) for r in records)
+
+
+class BulkExporter:
+    """Stream all the records visible to an identity in an export format."""
+
+    def __init__(self, export_format, identity, params=None, batch_size=None):
+        """Constructor.
+
+        :param export_format: A key of ``APP_RDM_RECORD_EXPORTERS``.
+        :param identity: The identity used to search the records.
+        :param params: Search parameters (e.g. ``{"q": "..."}``).
+        :param batch_size: Number of records serialized and emitted at once.
+        """
+        exporters = current_app.config.get("APP_RDM_RECORD_EXPORTERS", {})
+        if export_format not in exporters:
+            raise KeyError(export_format)
+
+        self.export_format = export_format
+        self.exporter = exporters[export_format]
+        self.identity = identity
+        self.params = params or {}
+        self.batch_size = (
+            batch_size or current_app.config["APP_RDM_RECORDS_BULK_EXPORT_BATCH_SIZE"]
+        )
+        self.bulk_format = get_bulk_format(self.exporter)
+
+    @property
+    def content_type(self):
+        """Content type of the dump."""
+        if self.bulk_format == "jsonl":
+            return "application/x-ndjson"
+        elif self.bulk_format == "xml":
+            return "application/xml"
+        return self.exporter.get("content-type", "text/plain")
+
+    @property
+    def filename(self):
+        """Default file name of the dump."""
+        if self.bulk_format == "jsonl":
+            return "records.jsonl"
+        elif self.bulk_format == "xml":
+            return "records.xml"
+        return self.exporter.get("filename", self.export_format).format(id="records")
+
+    def header(self):
+        """Content emitted before the records."""
+        if self.bulk_format == "xml":
+            wrapper = current_app.config["APP_RDM_RECORDS_BULK_EXPORT_XML_WRAPPER"]
+            return f'<?xml version="1.0" encoding="UTF-8"?>\n<{wrapper}>\n'
+        return ""
+
+    def footer(self):
+        """Content emitted after the records."""
+        if self.bulk_format == "xml":
+            wrapper = current_app.config["APP_RDM_RECORDS_BULK_EXPORT_XML_WRAPPER"]
+            return f"</{wrapper}>\n"
+        return ""
+
+    def iter_records(self):
+        """Scroll through the records of the search cluster."""
+        result = current_rdm_records.records_service.scan(
+            self.identity, params=self.params
+        )
+        return result.hits
+
+    def iter_batches(self):
+        """Yield lists of (at most ``batch_size``) records."""
+        records = iter(self.iter_records())
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def __iter__(self):
+        """Yield the serialized dump in chunks, one chunk per batch."""
+        yield self.header()
+        for batch in self.iter_batches():
+            yield "".join(serialize_record(self.exporter, r) for r in batch)
+        yield self.footer()
+
+    def iter_parallel(self, workers):
+        """Same as iterating, but serializing the batches in a process pool.
+
+        The pool is forked from the current process so that workers share the
+        application, but not its database and search connections; batches are
+        submitted ``workers`` at a time to keep memory bounded, and emitted in
+        order.
+        """
+        app = current_app._get_current_object()
+        yield self.header()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("fork"),
+            initializer=_init_worker,
+            initargs=(app,),
+        ) as executor:
+            batches = self.iter_batches()
+            while True:
+                futures = [
+                    executor.submit(_serialize_batch, self.export_format, batch)
+                    for batch in islice(batches, workers)
+                ]
+                if not futures:
+                    break
+                for future in futures:
+                    yield future.result()
+        yield self.footer()
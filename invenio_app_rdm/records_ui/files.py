@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Paginated listing of the record files."""
+
+from copy import copy
+
+from flask import current_app
+from invenio_records_resources.proxies import current_transfer_registry
+
+from .views.filters import order_entries
+
+sort_options = {
+    "order": None,
+    "key": (lambda f: f["key"].lower(), False),
+    "-key": (lambda f: f["key"].lower(), True),
+    "size": (lambda f: f.get("size") or 0, False),
+    "-size": (lambda f: f.get("size") or 0, True),
+}
+"""Sort options of the files listing, ``order`` keeps the order of the record."""
+
+
+def get_files_page_size():
+    """Get how many file entries are rendered in the pages, ``None`` for all."""
+    return current_app.config.get("APP_RDM_RECORD_FILES_PAGE_SIZE")
+
+
+def _completed_entries(files):
+    """Get the completed file entries, in the order of the record."""
+    return [f for f in order_entries(files) if f.get("status") == "completed"]
+
+
+def _totals(entries):
+    """Count the file entries and their bytes."""
+    return {
+        "count": len(entries),
+        "bytes": sum(f.get("size") or 0 for f in entries),
+    }
+
+
+def paginate_files(files, size=None):
+    """Keep the first ``size`` completed entries of the dumped files.
+
+    The totals of all the completed entries are added under ``totals``, and
+    ``next`` is the cursor of the following entries, if any. The default
+    preview file is always kept, so that it is previewed whatever its position.
+    """
+    if files is None:
+        return None
+    size = size or get_files_page_size()
+    if not size:
+        return files
+
+    entries = _completed_entries(files)
+    page = entries[:size]
+    next_ = page[-1]["key"] if len(entries) > size else None
+    default_preview = files.get("default_preview")
+    if default_preview and all(f["key"] != default_preview for f in page):
+        page += [f for f in entries[size:] if f["key"] == default_preview]
+
+    return {
+        **files,
+        "entries": page,
+        "order": [f["key"] for f in page],
+        "totals": _totals(entries),
+        "next": next_,
+    }
+
+
+def _summarize_file_list(file_list):
+    """Summarize the entries of a ``FileList`` without serializing them.
+
+    :returns: the ``key``, ``size`` and ``status`` of each entry, with the
+        file record under ``record``.
+    """
+    summaries = []
+    for file_record in file_list._results:
+        transfer = current_transfer_registry.get_transfer(
+            file_record=file_record,
+            file_service=file_list._service,
+            record=file_list._record,
+        )
+        summaries.append(
+            {
+                "key": file_record.key,
+                "size": file_record.file.file.size if file_record.has_content else 0,
+                "status": transfer.status,
+                "record": file_record,
+            }
+        )
+    return summaries
+
+
+def paginate_file_list(file_list, size=None):
+    """Dump the first ``size`` completed entries of a ``FileList``.
+
+    Same as ``paginate_files(file_list.to_dict())``, but only the entries of
+    the page are serialized (with their links), which is what takes time on
+    records with many files.
+    """
+    if file_list is None:
+        return None
+    size = size or get_files_page_size()
+    record_files = file_list._record.files
+    if not size or not record_files.enabled or len(file_list._results) <= size:
+        return paginate_files(file_list.to_dict(), size)
+
+    summaries = _summarize_file_list(file_list)
+    files = {"order": record_files.order, "entries": summaries}
+    page = paginate_files(
+        {**files, "default_preview": record_files.default_preview}, size
+    )
+    return {
+        **_dump_file_list_page(file_list, page["entries"]),
+        "order": page["order"],
+        "totals": page["totals"],
+        "next": page["next"],
+    }
+
+
+def _dump_file_list_page(file_list, summaries):
+    """Dump a ``FileList`` restricted to some of its (summarized) entries."""
+    page_list = copy(file_list)
+    page_list._results = [f["record"] for f in summaries]
+    return page_list.to_dict()
+
+
+def list_files_page(files, size, after=None, prefix=None, sort="order"):
+    """Get a page of the dumped files, for cursor-based pagination.
+
+    :param files: the dumped files of a record.
+    :param size: the maximum number of entries of the page.
+    :param after: the key of the last entry of the previous page.
+    :param prefix: keep only the files whose key starts with this prefix.
+    :param sort: one of the ``sort_options``.
+    :raises ValueError: if the sort option or the cursor is unknown.
+    """
+    if sort not in sort_options:
+        raise ValueError(f"Unknown sort option: {sort}")
+
+    entries = _completed_entries(files)
+    if prefix:
+        entries = [f for f in entries if f["key"].startswith(prefix)]
+    if sort_options[sort] is not None:
+        key, reverse = sort_options[sort]
+        entries.sort(key=key, reverse=reverse)
+
+    start = 0
+    if after is not None:
+        start = next((i + 1 for i, f in enumerate(entries) if f["key"] == after), None)
+        if start is None:
+            raise ValueError(f"Unknown cursor: {after}")
+
+    page = entries[start : start + size]
+    has_more = start + size < len(entries)
+    return {
+        "entries": page,
+        "totals": _totals(entries),
+        "next": page[-1]["key"] if has_more and page else None,
+    }
+
+
+def list_file_list_page(file_list, size, **kwargs):
+    """Get a page of a ``FileList``, only serializing the entries of the page.
+
+    See ``list_files_page`` for the arguments.
+    """
+    if not file_list._record.files.enabled:
+        return list_files_page(file_list.to_dict(), size, **kwargs)
+    files = {
+        "order": file_list._record.files.order,
+        "entries": _summarize_file_list(file_list),
+    }
+    page = list_files_page(files, size, **kwargs)
+    return {
+        **page,
+        "entries": _dump_file_list_page(file_list, page["entries"])["entries"],
+    }
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Thumbnails and IIIF derivatives of the record images."""
+
+import itertools
+import mimetypes
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import current_process, get_context
+from pathlib import Path
+
+from flask import current_app, g
+from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
+from invenio_rdm_records.proxies import current_rdm_records
+
+from .cache import record_cache_key
+from .previewer.iiif_simple import native_extensions
+from .previewer.iiif_simple import previewable_extensions as image_extensions
+
+
+def _is_public_record(record):
+    """Check if a published record and its files are public."""
+    if getattr(record._record, "is_draft", False):
+        return False
+    access = record.data.get("access", {})
+    return access.get("record") == "public" and access.get("files") == "public"
+
+
+def select_thumbnail_file(record):
+    """Select the file used as thumbnail of a record, if any.
+
+    The default preview file is preferred, then the first image.
+    """
+    files = record.data.get("files", {})
+    default_preview = files.get("default_preview")
+    file_entries = files.get("entries", {})
+    extensions = set(image_extensions)
+    return next(
+        (
+            key
+            for key in itertools.chain([default_preview], file_entries)
+            if key and Path(key).suffix[1:] in extensions
+        ),
+        None,
+    )
+
+
+def _read_thumbnail(record):
+    """Select the thumbnail file of a record and read its IIIF base URL."""
+    file_key = select_thumbnail_file(record)
+    if not file_key:
+        return None, None
+    file = current_rdm_records.records_service.files.read_file_metadata(
+        id_=record.id, file_key=file_key, identity=g.identity
+    )
+    return file_key, file["links"]["iiif_base"]
+
+
+def get_thumbnail(record):
+    """Get the thumbnail file key and IIIF base URL of a record.
+
+    They are cached per revision for public records, which are the same for
+    everyone, so that thumbnail requests do not need to read the file.
+    """
+    if not _is_public_record(record):
+        return _read_thumbnail(record)
+
+    cache_key = record_cache_key("app-rdm:thumbnail", record)
+    thumbnail = current_cache.get(cache_key)
+    if thumbnail is None:
+        thumbnail = _read_thumbnail(record)
+        current_cache.set(
+            cache_key,
+            thumbnail,
+            timeout=current_app.config["APP_RDM_RECORD_THUMBNAIL_CACHE_TIMEOUT"],
+        )
+    return thumbnail
+
+
+def render_image(identity, record_id, file_key, size, image_format="png"):
+    """Render an image file of a published record through the IIIF service."""
+    image = current_rdm_records.iiif_service.image_api(
+        identity=identity,
+        uuid=f"record:{record_id}:{file_key}",
+        region="full",
+        size=size,
+        rotation="0",
+        quality="default",
+        image_format=image_format,
+    )
+    if hasattr(image, "getvalue"):
+        return image.getvalue()
+    return image.read()
+
+
+def is_rendered_thumbnail_cacheable(record):
+    """Check if the rendered thumbnails of a record can be cached."""
+    if not current_app.config.get("APP_RDM_RECORD_THUMBNAIL_RENDERED_CACHE_ENABLED"):
+        return False
+    return _is_public_record(record)
+
+
+def get_rendered_thumbnail(record, file_key, size):
+    """Get a rendered thumbnail of a record, rendering and caching it if needed."""
+    checksum = record.data["files"]["entries"][file_key]["checksum"]
+    name = f"thumbnail-{size}"
+    thumbnail = get_cached_derivative(checksum, name)
+    if thumbnail is None:
+        size_, image_format = get_derivative_spec(file_key, name)
+        thumbnail = render_image(g.identity, record.id, file_key, size_, image_format)
+        set_cached_derivative(checksum, name, thumbnail)
+    return thumbnail
+
+
+#
+# IIIF derivatives
+#
+def is_derivatives_enabled():
+    """Check if the IIIF derivatives of the images are used."""
+    return current_app.config.get("APP_RDM_IIIF_DERIVATIVES_ENABLED", False)
+
+
+def get_derivative_spec(file_key, name):
+    """Get the IIIF size and format of a derivative, ``None`` if unknown.
+
+    The ``preview`` derivative is the rendition of the simple IIIF previewer,
+    and ``thumbnail-<size>`` the ones of the record thumbnails.
+    """
+    config = current_app.config
+    if name == "preview":
+        ext = Path(file_key).suffix[1:].lower()
+        image_format = ext if ext in native_extensions else "jpg"
+        return config["IIIF_SIMPLE_PREVIEWER_SIZE"], image_format
+    for size in config["APP_RDM_RECORD_THUMBNAIL_SIZES"]:
+        if name == f"thumbnail-{size}":
+            return f"{size},", "png"
+    return None
+
+
+def get_derivative_mimetype(file_key, name):
+    """Get the mimetype of a derivative."""
+    _, image_format = get_derivative_spec(file_key, name)
+    return mimetypes.guess_type(f"derivative.{image_format}")[0]
+
+
+def _derivative_cache_key(checksum, name):
+    """Build the cache key of a derivative, bound to the file content."""
+    return f"app-rdm:iiif-derivative:{checksum}:{name}"
+
+
+def get_cached_derivative(checksum, name):
+    """Return a cached derivative or ``None``."""
+    return current_cache.get(_derivative_cache_key(checksum, name))
+
+
+def set_cached_derivative(checksum, name, derivative):
+    """Cache a derivative."""
+    current_cache.set(
+        _derivative_cache_key(checksum, name),
+        derivative,
+        timeout=current_app.config["APP_RDM_IIIF_DERIVATIVES_CACHE_TIMEOUT"],
+    )
+
+
+def schedule_derivatives(record_id):
+    """Schedule the generation of the derivatives of a record, once at a time."""
+    lock_key = f"app-rdm:iiif-derivatives-lock:{record_id}"
+    if current_cache.add(lock_key, True, timeout=60 * 10):
+        from ..tasks import generate_iiif_derivatives
+
+        generate_iiif_derivatives.delay(record_id)
+
+
+_worker_app = None
+
+
+def _init_worker(app):
+    """Keep the (forked) application, to render the images in its context."""
+    global _worker_app
+    _worker_app = app
+
+
+def _render_derivative(record_id, file_key, size, image_format):
+    """Render a derivative inside a pool worker."""
+    with _worker_app.app_context():
+        return render_image(system_identity, record_id, file_key, size, image_format)
+
+
+def generate_derivatives(record_id, workers=None):
+    """Render and cache the missing derivatives of the images of a record.
+
+    All images get a ``preview`` derivative, and the thumbnail file gets one
+    derivative per thumbnail size. Images are rendered in a process pool of
+    ``workers`` processes, or sequentially in daemonic processes (e.g. Celery
+    workers) which cannot have children.
+    """
+    record = current_rdm_records.records_service.read(system_identity, record_id)
+    entries = record.data.get("files", {}).get("entries", {})
+    thumbnail_key = select_thumbnail_file(record)
+    extensions = set(image_extensions)
+
+    missing = []
+    for file_key, entry in entries.items():
+        if Path(file_key).suffix[1:] not in extensions:
+            continue
+        names = ["preview"]
+        if file_key == thumbnail_key:
+            sizes = current_app.config["APP_RDM_RECORD_THUMBNAIL_SIZES"]
+            names += [f"thumbnail-{size}" for size in sizes]
+        for name in names:
+            if get_cached_derivative(entry["checksum"], name) is None:
+                missing.append((file_key, entry["checksum"], name))
+
+    workers = workers or current_app.config["APP_RDM_IIIF_DERIVATIVES_WORKERS"]
+    if workers <= 1 or current_process().daemon:
+        for file_key, checksum, name in missing:
+            size, image_format = get_derivative_spec(file_key, name)
+            derivative = render_image(
+                system_identity, record_id, file_key, size, image_format
+            )
+            set_cached_derivative(checksum, name, derivative)
+        return len(missing)
+
+    app = current_app._get_current_object()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("fork"),
+        initializer=_init_worker,
+        initargs=(app,),
+    ) as executor:
+        futures = {
+            executor.submit(
+                _render_derivative,
+                record_id,
+                file_key,
+                *get_derivative_spec(file_key, name),
+            ): (checksum, name)
+            for file_key, checksum, name in missing
+        }
+        for future, (checksum, name) in futures.items():
+            set_cached_derivative(checksum, name, future.result())
+    return len(missing)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Request-scoped memoization of service reads.
+
+Results are keyed by service, method, arguments and identity (including its
+needs), and errors are never memoized.
+"""
+
+from flask import current_app, g, has_request_context, request
+from flask_login import current_user
+from invenio_users_resources.proxies import current_user_resources
+
+
+class RequestMemo:
+    """Values computed during a request, with hit/miss counters."""
+
+    def __init__(self):
+        """Constructor."""
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_call(self, key, func):
+        """Return the memoized value of ``key``, or compute it with ``func``."""
+        try:
+            value = self._values[key]
+        except KeyError:
+            self.misses += 1
+            value = self._values[key] = func()
+            return value
+        self.hits += 1
+        return value
+
+    def stats(self):
+        """Hit/miss counters, for debugging."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._values)}
+
+
+def current_request_memo():
+    """Get the memo of the current request, ``None`` outside of requests.
+
+    The memo is stored on the request, not on ``g``: an application context
+    can outlive its requests (e.g. in tests or when pushed manually).
+    """
+    if not has_request_context():
+        return None
+    memo = getattr(request, "app_rdm_memo", None)
+    if memo is None:
+        memo = request.app_rdm_memo = RequestMemo()
+    return memo
+
+
+def identity_key(identity):
+    """Hashable key of an identity, which changes when its needs change."""
+    return (identity.id, frozenset(identity.provides))
+
+
+def memoize(key, func):
+    """Memoize the result of ``func`` for the current request."""
+    memo = current_request_memo()
+    if memo is None:
+        return func()
+    return memo.get_or_call(key, func)
+
+
+def memoized_call(service, method, identity, **kwargs):
+    """Call a service method, memoized for the current request.
+
+    :param service: The service, e.g. ``current_communities.service``.
+    :param method: The name of the method, e.g. ``"read"``.
+    :param identity: The identity performing the call.
+    :param kwargs: The (hashable) keyword arguments of the call.
+    """
+    key = (id(service), method, identity_key(identity), frozenset(kwargs.items()))
+    return memoize(key, lambda: getattr(service, method)(identity=identity, **kwargs))
+
+
+def get_user_avatar():
+    """Get the avatar link of the current user, memoized for the request."""
+    return memoize(
+        ("avatar", identity_key(g.identity)),
+        lambda: current_user_resources.users_service.links_item_tpl.expand(
+            g.identity, current_user
+        )["avatar"],
+    )
+
+
+def add_memo_debug_header(response):
+    """Expose the request memo counters in a response header, for debugging."""
+    memo = getattr(request, "app_rdm_memo", None)
+    if memo is not None and current_app.config.get("APP_RDM_REQUEST_MEMO_DEBUG"):
+        response.headers["X-App-RDM-Memo"] = "hits={hits}; misses={misses}".format(
+            **memo.stats()
+        )
+    return response
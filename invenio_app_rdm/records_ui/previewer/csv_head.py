@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""CSV preview, rendering only the first lines of the file as a table."""
+
+import csv
+from io import BytesIO
+
+from flask import current_app, render_template
+from invenio_previewer.utils import detect_encoding
+
+previewable_extensions = ["csv", "dsv"]
+
+
+def can_preview(file):
+    """Check if the file can be previewed.
+
+    :param file: The file to be previewed, which must be able to read its lines.
+    :returns: Boolean
+    """
+    return (
+        hasattr(file, "read_lines")
+        and file.is_local()
+        and file.has_extensions(*[f".{ext}" for ext in previewable_extensions])
+    )
+
+
+def read_rows(file):
+    """Read the first rows of the file.
+
+    :returns: the rows, and whether the file has more of them.
+    """
+    max_lines = current_app.config["APP_RDM_PREVIEWER_CSV_MAX_LINES"]
+    lines = file.read_lines(max_lines)
+    read_bytes = sum(len(line) for line in lines)
+    truncated = read_bytes < file.size
+    if truncated and lines and not lines[-1].endswith(b"\n"):
+        # the last line was cut by the bytes limit
+        lines = lines[:-1]
+
+    content = b"".join(lines)
+    encoding = detect_encoding(BytesIO(content), default="utf-8")
+    text = content.decode(encoding, errors="ignore")
+    try:
+        dialect = csv.Sniffer().sniff(
+            text[: current_app.config.get("PREVIEWER_CSV_VALIDATION_BYTES", 1024)],
+            delimiters=current_app.config.get(
+                "PREVIEWER_CSV_SNIFFER_ALLOWED_DELIMITERS"
+            ),
+        )
+    except csv.Error:
+        dialect = csv.excel
+    return list(csv.reader(text.splitlines(), dialect)), truncated
+
+
+def preview(file):
+    """Render the first ``APP_RDM_PREVIEWER_CSV_MAX_LINES`` lines of the file."""
+    rows, truncated = read_rows(file)
+    return render_template(
+        "invenio_app_rdm/records/csv_preview.html",
+        file=file,
+        header=rows[0] if rows else [],
+        rows=rows[1:],
+        truncated=truncated,
+    )
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Dispatch of the files to previewers by extension."""
+
+from functools import lru_cache
+from os.path import splitext
+
+from flask import current_app
+from invenio_previewer.proxies import current_previewer
+
+
+@lru_cache(maxsize=4096)
+def file_extension(key):
+    """Get the lowercase extension of a file key, without the dot."""
+    return splitext(key)[1][1:].lower()
+
+
+def get_previewable_extensions(plugin):
+    """Get the (lowercase) extensions a previewer declares, ``None`` if none."""
+    extensions = getattr(plugin, "previewable_extensions", None)
+    if not extensions:
+        return None
+    return frozenset(str(ext).lstrip(".").lower() for ext in extensions)
+
+
+def get_previewers(extension):
+    """Get the previewers that may preview files with the given extension.
+
+    The previewers declaring their ``previewable_extensions`` are kept if they
+    declare the extension, the others are always kept, and checked on the real
+    file. The table is built once per extension, in the
+    ``PREVIEWER_PREFERENCE`` order, and kept for the lifetime of the
+    application.
+    """
+    table = current_app.extensions.setdefault("invenio-app-rdm-previewers", {})
+    previewers = table.get(extension)
+    if previewers is None:
+        candidates = []
+        for plugin in current_previewer.iter_previewers():
+            extensions = get_previewable_extensions(plugin)
+            if extensions is None or extension in extensions:
+                candidates.append(plugin)
+        previewers = table[extension] = tuple(candidates)
+    return previewers
+
+
+def get_previewer_name(plugin):
+    """Get the name of a previewer plugin, e.g. ``zip``."""
+    return plugin.__name__.rsplit(".", 1)[-1]
+
+
+def select_previewer(file):
+    """Get the first previewer that can preview a file, if any."""
+    for plugin in get_previewers(file_extension(file.filename)):
+        if plugin.can_preview(file):
+            return plugin
+    return None
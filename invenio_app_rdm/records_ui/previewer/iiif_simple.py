@@ -10,7 +10,7 @@
 
 from os.path import splitext
 
-from flask import current_app, render_template
+from flask import current_app, render_template, url_for
 from werkzeug.local import LocalProxy
 
 previewable_extensions = LocalProxy(lambda: current_app.config["IIIF_FORMATS"].keys())
@@ -43,6 +43,18 @@ def preview(file):
     size = LocalProxy(lambda: current_app.config["IIIF_SIMPLE_PREVIEWER_SIZE"])
 
     url = f"{file.data['links']['iiif_base']}/full/{size}/0/default.{format}"
+    record = file.record
+    if (
+        current_app.config.get("APP_RDM_IIIF_DERIVATIVES_ENABLED")
+        and record is not None
+        and not getattr(record._record, "is_draft", False)
+    ):
+        url = url_for(
+            "invenio_app_rdm_records.record_file_derivative",
+            pid_value=record.id,
+            name="preview",
+            filename=file.filename,
+        )
     return render_template(
         current_app.config["IIIF_PREVIEW_TEMPLATE"],
         css_bundles=["iiif-simple-previewer.css"],
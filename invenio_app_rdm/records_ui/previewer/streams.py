@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Size-bounded reading of the previewed files."""
+
+import zipfile
+
+from flask import current_app
+
+
+def get_max_read_bytes(previewer_name):
+    """Get how many bytes a previewer may read from a file, ``None`` if unbounded."""
+    config = current_app.config
+    caps = config.get("APP_RDM_PREVIEWER_MAX_READ_BYTES", {})
+    if previewer_name in caps:
+        return caps[previewer_name]
+    return config.get("APP_RDM_PREVIEWER_DEFAULT_MAX_READ_BYTES")
+
+
+class BoundedStream:
+    """Read-only file wrapper, which stops reading after ``max_bytes``.
+
+    Reads past the limit behave like the end of the file, so previewers
+    reading a whole file only get its head. The limit is an absolute offset
+    in the file, so seeking back (e.g. to sniff the file first) does not
+    shrink what is left to read.
+    """
+
+    def __init__(self, fp, max_bytes):
+        """Constructor."""
+        self._fp = fp
+        self._max_bytes = max_bytes
+
+    def _bound(self, size):
+        """Bound a read size to what is left before the limit."""
+        remaining = max(self._max_bytes - self._fp.tell(), 0)
+        if size is None or size < 0 or size > remaining:
+            return remaining
+        return size
+
+    def read(self, size=-1):
+        """Read at most ``size`` bytes, within the limit."""
+        size = self._bound(size)
+        if size <= 0:
+            return b""
+        return self._fp.read(size)
+
+    def readline(self, size=-1):
+        """Read a line, within the limit."""
+        size = self._bound(size)
+        if size <= 0:
+            return b""
+        return self._fp.readline(size)
+
+    def __iter__(self):
+        """Iterate over the lines, within the limit."""
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+    def close(self):
+        """Close the wrapped file."""
+        self._fp.close()
+
+    def __enter__(self):
+        """Enter the context."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the file when leaving the context."""
+        self.close()
+
+    def __getattr__(self, name):
+        """Delegate everything else (e.g. seek, tell) to the wrapped file."""
+        return getattr(self._fp, name)
+
+
+def read_head(fp, max_bytes):
+    """Read the first ``max_bytes`` bytes of a file."""
+    return BoundedStream(fp, max_bytes).read()
+
+
+def read_lines(fp, max_lines, max_bytes):
+    """Read the first ``max_lines`` lines of a file, within ``max_bytes``."""
+    lines = []
+    for line in BoundedStream(fp, max_bytes):
+        lines.append(line)
+        if len(lines) >= max_lines:
+            break
+    return lines
+
+
+def list_zip_entries(fp, max_entries):
+    """List the entries of a ZIP file from its central directory.
+
+    Only the end of the (seekable) file is read, whatever its size.
+    """
+    with zipfile.ZipFile(fp) as zf:
+        infos = zf.infolist()
+        return {
+            "total": len(infos),
+            "entries": [
+                {
+                    "name": info.filename,
+                    "size": info.file_size,
+                    "compressed_size": info.compress_size,
+                    "is_dir": info.is_dir(),
+                }
+                for info in infos[:max_entries]
+            ],
+        }
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Text preview, reading only the head of the file."""
+
+from io import BytesIO
+
+from flask import current_app, render_template
+from invenio_previewer.proxies import current_previewer
+from invenio_previewer.utils import detect_encoding
+
+previewable_extensions = ["txt"]
+
+
+def can_preview(file):
+    """Check if the file can be previewed.
+
+    :param file: The file to be previewed, which must be able to read its head.
+    :returns: Boolean
+    """
+    return (
+        hasattr(file, "read_head")
+        and file.is_local()
+        and file.has_extensions(*[f".{ext}" for ext in previewable_extensions])
+    )
+
+
+def preview(file):
+    """Render the first ``PREVIEWER_TXT_MAX_BYTES`` bytes of the file."""
+    max_bytes = current_app.config.get("PREVIEWER_TXT_MAX_BYTES", 1024 * 1024)
+    if max_bytes is None or max_bytes < 0:
+        max_bytes = file.size
+    content = file.read_head(max_bytes)
+    encoding = detect_encoding(BytesIO(content), default="utf-8")
+    return render_template(
+        "invenio_previewer/txt.html",
+        file=file,
+        content=content.decode(encoding, errors="ignore"),
+        js_bundles=current_previewer.js_bundles,
+        css_bundles=["txt_css.css"],
+        truncated=max_bytes < file.size,
+    )
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""ZIP preview, listing the entries from the central directory only."""
+
+import zipfile
+
+from flask import current_app, render_template
+from invenio_previewer.extensions.zip import children_to_list
+from invenio_previewer.proxies import current_previewer
+
+previewable_extensions = ["zip"]
+
+
+def can_preview(file):
+    """Check if the file can be previewed.
+
+    :param file: The file to be previewed, which must be able to list its entries.
+    :returns: Boolean
+    """
+    return (
+        hasattr(file, "list_zip_entries")
+        and file.is_local()
+        and file.has_extensions(*[f".{ext}" for ext in previewable_extensions])
+    )
+
+
+def make_tree(listing):
+    """Create the tree of the listed entries of a ZIP file."""
+    tree = {"type": "folder", "id": -1, "children": {}}
+    for i, entry in enumerate(listing["entries"]):
+        node = tree
+        for name in entry["name"].split("/"):
+            if name == "":
+                node["type"] = "folder"
+                continue
+            if name not in node["children"]:
+                node["children"][name] = {
+                    "name": name,
+                    "type": "item",
+                    "id": f"item{i}",
+                    "children": {},
+                }
+            node = node["children"][name]
+        node["size"] = entry["size"]
+    return tree
+
+
+def preview(file):
+    """Render the first ``PREVIEWER_ZIP_MAX_FILES`` entries of the file."""
+    max_entries = current_app.config.get("PREVIEWER_ZIP_MAX_FILES", 1000)
+    tree = {"type": "folder", "id": -1, "children": {}}
+    limit_reached, error = False, None
+    try:
+        listing = file.list_zip_entries(max_entries)
+        tree = make_tree(listing)
+        limit_reached = listing["total"] > max_entries
+    except zipfile.LargeZipFile:
+        error = "Zipfile is too large to be previewed."
+    except Exception as e:
+        current_app.logger.warning(str(e), exc_info=True)
+        error = "Zipfile is not previewable."
+
+    return render_template(
+        "invenio_previewer/zip.html",
+        file=file,
+        tree=children_to_list(tree)["children"],
+        limit_reached=limit_reached,
+        error=error,
+        js_bundles=current_previewer.js_bundles,
+        css_bundles=current_previewer.css_bundles + ["zip_css.css"],
+    )
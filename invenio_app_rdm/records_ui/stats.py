@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Emission of the statistics events of the record pages.
+
+Events can be buffered in memory and published in batches from a background
+thread, so that the request only builds the event data.
+"""
+
+import atexit
+import os
+from collections import deque
+from threading import Event, Lock, Thread
+
+from flask import current_app
+from invenio_stats.proxies import current_stats
+
+
+class StatsEventsBuffer:
+    """Bounded in-process buffer of stats events, published in batches.
+
+    When the buffer is full the oldest events are dropped and counted in
+    ``dropped``. Events are flushed every ``flush_interval`` seconds, and on
+    interpreter shutdown.
+    """
+
+    def __init__(self, app, maxsize, batch_size, flush_interval):
+        """Constructor."""
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.published = 0
+        self._events = deque(maxlen=maxsize)
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+        self._pid = None
+
+    def append(self, event_type, event):
+        """Add an event to the buffer, starting the flushing thread if needed."""
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append((event_type, event))
+        self._ensure_started()
+
+    def _ensure_started(self):
+        """Start the flushing thread, once per (forked) process."""
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = Thread(
+                target=self._run, name="app-rdm-stats-events", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        """Flush the buffer periodically until stopped."""
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def _pop_batch(self):
+        """Remove up to ``batch_size`` events from the buffer."""
+        with self._lock:
+            count = min(self.batch_size, len(self._events))
+            return [self._events.popleft() for _ in range(count)]
+
+    def flush(self):
+        """Publish all the buffered events, in batches."""
+        batch = self._pop_batch()
+        while batch:
+            events_by_type = {}
+            for event_type, event in batch:
+                events_by_type.setdefault(event_type, []).append(event)
+
+            with self.app.app_context():
+                for event_type, events in events_by_type.items():
+                    try:
+                        current_stats.publish(event_type, events)
+                        with self._lock:
+                            self.published += len(events)
+                    except Exception:
+                        with self._lock:
+                            self.dropped += len(events)
+                        current_app.logger.exception(
+                            "Failed to publish %s stats events.", event_type
+                        )
+            batch = self._pop_batch()
+
+    def stop(self):
+        """Stop the flushing thread and publish the remaining events."""
+        self._stop.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=self.flush_interval * 2)
+        self.flush()
+
+
+def get_stats_events_buffer(app):
+    """Get the stats events buffer of an application, creating it if needed."""
+    buffer = app.extensions.get("invenio-app-rdm-stats-buffer")
+    if buffer is None:
+        config = app.config
+        buffer = StatsEventsBuffer(
+            app,
+            maxsize=config["APP_RDM_STATS_EVENTS_BUFFER_SIZE"],
+            batch_size=config["APP_RDM_STATS_EVENTS_BUFFER_BATCH_SIZE"],
+            flush_interval=config["APP_RDM_STATS_EVENTS_BUFFER_FLUSH_INTERVAL"],
+        )
+        app.extensions["invenio-app-rdm-stats-buffer"] = buffer
+        atexit.register(buffer.stop)
+    return buffer
+
+
+def emit_stats_event(event_type, **kwargs):
+    """Emit a stats event, buffering it if enabled.
+
+    The event data is always built within the request, as the event builders
+    depend on it, while publishing it is deferred to the buffer.
+    """
+    emitter = current_stats.get_event_emitter(event_type)
+    # same as the emitter, only the registered events are sent
+    if emitter is None or event_type not in current_stats.events:
+        return
+
+    app = current_app._get_current_object()
+    if not app.config.get("APP_RDM_STATS_EVENTS_BUFFER_ENABLED"):
+        emitter(app, **kwargs)
+        return
+
+    # same as the emitter, the event is lost rather than failing the request
+    try:
+        event = {}
+        for builder in emitter.builders:
+            event = builder(event, app, **kwargs)
+            if event is None:
+                return
+    except Exception:
+        current_app.logger.exception("Failed to build a %s stats event.", event_type)
+        return
+    get_stats_events_buffer(app).append(event_type, event)
@@ -12,6 +12,7 @@
 from itertools import chain
 
 from flask import current_app
+from invenio_base.utils import obj_or_import_string
 from invenio_records.dictutils import dict_set
 from invenio_records.errors import MissingModelError
 from invenio_records_files.api import FileObject
@@ -88,3 +89,24 @@ def dump_external_resource(
         },
         "template": template,
     }
+
+
+_export_serializers = {}
+"""Per-process registry of the instantiated exporters serializers."""
+
+
+def get_export_serializer(exporter):
+    """Get the serializer of a configured record exporter.
+
+    The serializer is imported and instantiated only once per process, and
+    reused across requests.
+
+    :param exporter: An exporter configuration from ``APP_RDM_RECORD_EXPORTERS``.
+    """
+    params = exporter.get("params", {})
+    key = (repr(exporter["serializer"]), repr(params))
+    serializer = _export_serializers.get(key)
+    if serializer is None:
+        serializer = obj_or_import_string(exporter["serializer"])(**params)
+        _export_serializers[key] = serializer
+    return serializer
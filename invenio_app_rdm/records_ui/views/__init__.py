@@ -24,6 +24,7 @@ from invenio_records_resources.services.errors import (
 )
 
 from ...theme.views import create_url_rule
+from ..memo import add_memo_debug_header
 from ..searchapp import search_app_context
 from .deposits import community_upload, deposit_create, deposit_edit
 from .filters import (
@@ -48,14 +49,18 @@ from .records import (
     not_found_error,
     record_detail,
     record_export,
+    record_file_derivative,
     record_file_download,
     record_file_preview,
+    record_files_list,
     record_from_pid,
     record_latest,
     record_media_file_download,
+    record_media_files_list,
     record_permission_denied_error,
     record_thumbnail,
     record_tombstone_error,
+    records_bulk_export,
 )
 
 
@@ -106,6 +111,13 @@ def create_blueprint(app):
         )
     )
 
+    blueprint.add_url_rule(
+        **create_url_rule(
+            routes["records_bulk_export"],
+            default_view_func=records_bulk_export,
+        )
+    )
+
     blueprint.add_url_rule(
         **create_url_rule(
             routes["record_file_preview"],
@@ -119,6 +131,24 @@ def create_blueprint(app):
             default_view_func=record_file_download,
         )
     )
+    blueprint.add_url_rule(
+        **create_url_rule(
+            routes["record_files_list"],
+            default_view_func=record_files_list,
+        )
+    )
+    blueprint.add_url_rule(
+        **create_url_rule(
+            routes["record_media_files_list"],
+            default_view_func=record_media_files_list,
+        )
+    )
+    blueprint.add_url_rule(
+        **create_url_rule(
+            routes["record_file_derivative"],
+            default_view_func=record_file_derivative,
+        )
+    )
     blueprint.add_url_rule(
         **create_url_rule(
             routes["record_thumbnail"],
@@ -189,4 +219,6 @@ def create_blueprint(app):
     # Register context processor
     blueprint.app_context_processor(search_app_context)
 
+    blueprint.after_app_request(add_memo_debug_header)
+
     return blueprint
@@ -9,14 +9,16 @@
 
 """Routes for record-related pages provided by Invenio-App-RDM."""
 
-from functools import wraps
+import hashlib
+from functools import partial, wraps
 
 from flask import current_app, g, make_response, redirect, request, session, url_for
-from flask_login import login_required
+from flask_login import current_user, login_required
 from invenio_communities.communities.resources.serializer import (
     UICommunityJSONSerializer,
 )
 from invenio_communities.proxies import current_communities
+from invenio_i18n.ext import current_i18n
 from invenio_pidstore.errors import PIDDoesNotExistError
 from invenio_rdm_records.proxies import current_rdm_records
 from invenio_rdm_records.resources.serializers.signposting import (
@@ -24,9 +26,13 @@ from invenio_rdm_records.resources.serializers.signposting import (
 )
 from invenio_records_resources.services.errors import PermissionDeniedError
 from sqlalchemy.orm.exc import NoResultFound
+from werkzeug.http import is_resource_modified
 
+from invenio_app_rdm import __version__
 from invenio_app_rdm.urls import record_url_for
 
+from ..memo import identity_key, memoize, memoized_call
+
 
 def service():
     """Get the record service."""
@@ -53,6 +59,47 @@ def draft_media_files_service():
     return current_rdm_records.records_media_files_service.draft_files
 
 
+def _list_resolved_record_files(record, is_media=False):
+    """List the files of an already resolved record or draft.
+
+    This does what the files services' ``list_files`` does, but reuses the
+    record instead of resolving its PID and loading it again. Results are
+    memoized for the rest of the request.
+    """
+    record_ = record._record
+    key = (
+        "media_files" if is_media else "files",
+        record_.id,
+        record_.is_draft,
+        identity_key(g.identity),
+    )
+    return memoize(key, lambda: _list_record_files(record_, record.id, is_media))
+
+
+def _list_record_files(record_, id_, is_media):
+    """List the files of a record API object, as ``list_files`` does."""
+    if is_media:
+        service = (
+            draft_media_files_service() if record_.is_draft else media_files_service()
+        )
+    else:
+        service = draft_files_service() if record_.is_draft else files_service()
+    if not isinstance(record_, service.record_cls):
+        # e.g. media files are accessed through a dedicated record class
+        record_ = service.record_cls(dict(record_), model=record_.model)
+
+    service.require_permission(g.identity, "read_files", record=record_)
+    service.run_components("list_files", id_, g.identity, record_)
+    return service.file_result_list(
+        service,
+        g.identity,
+        results=record_.files.values(),
+        record=record_,
+        links_tpl=service.file_links_list_tpl(id_),
+        links_item_tpl=service.file_links_item_tpl(id_),
+    )
+
+
 def pass_record_latest(f):
     """Decorate a view to pass the latest version of a record."""
 
@@ -152,7 +199,11 @@ def pass_record_from_pid(f):
 
 
 def pass_record_or_draft(expand=False):
-    """Decorate to retrieve the record or draft using the record service."""
+    """Decorate to retrieve the record or draft using the record service.
+
+    Reads are memoized for the rest of the request, so that other decorators
+    (e.g. ``pass_record_files``) can reuse the record.
+    """
 
     def decorator(f):
         @wraps(f)
@@ -162,21 +213,28 @@ def pass_record_or_draft(expand=False):
             include_deleted = kwargs.get("include_deleted", False)
             read_kwargs = {
                 "id_": pid_value,
-                "identity": g.identity,
                 "expand": expand,
             }
 
             if is_preview:
                 try:
-                    record = service().read_draft(**read_kwargs)
+                    record = memoized_call(
+                        service(), "read_draft", g.identity, **read_kwargs
+                    )
                 except NoResultFound:
                     try:
-                        record = service().read(
-                            include_deleted=include_deleted, **read_kwargs
+                        record = memoized_call(
+                            service(),
+                            "read",
+                            g.identity,
+                            include_deleted=include_deleted,
+                            **read_kwargs,
                         )
                     except NoResultFound:
                         # If the parent pid is being used we can get the id of the latest record and redirect
-                        latest_version = service().read_latest(**read_kwargs)
+                        latest_version = service().read_latest(
+                            identity=g.identity, **read_kwargs
+                        )
                         return redirect(
                             url_for(
                                 "invenio_app_rdm_records.record_detail",
@@ -186,12 +244,18 @@ def pass_record_or_draft(expand=False):
                         )
             else:
                 try:
-                    record = service().read(
-                        include_deleted=include_deleted, **read_kwargs
+                    record = memoized_call(
+                        service(),
+                        "read",
+                        g.identity,
+                        include_deleted=include_deleted,
+                        **read_kwargs,
                     )
                 except NoResultFound:
                     # If the parent pid is being used we can get the id of the latest record and redirect
-                    latest_version = service().read_latest(**read_kwargs)
+                    latest_version = service().read_latest(
+                        identity=g.identity, **read_kwargs
+                    )
                     return redirect(
                         url_for(
                             "invenio_app_rdm_records.record_detail",
@@ -266,7 +330,11 @@ def pass_file_metadata(f):
 
 
 def pass_record_files(f):
-    """Decorate a view to pass a record's files using the files service."""
+    """Decorate a view to pass a record's files using the files service.
+
+    When the record was already resolved by ``pass_record_or_draft``, its
+    files are listed without resolving it again.
+    """
 
     @wraps(f)
     def view(**kwargs):
@@ -275,7 +343,9 @@ def pass_record_files(f):
         read_kwargs = {"id_": pid_value, "identity": g.identity}
 
         try:
-            if is_preview:
+            if kwargs.get("record") is not None:
+                files = _list_resolved_record_files(kwargs["record"])
+            elif is_preview:
                 try:
                     files = draft_files_service().list_files(**read_kwargs)
                 except NoResultFound:
@@ -297,7 +367,11 @@ def pass_record_files(f):
 
 
 def pass_record_media_files(f):
-    """Decorate a view to pass a record's media files using the files service."""
+    """Decorate a view to pass a record's media files using the files service.
+
+    When the record was already resolved by ``pass_record_or_draft``, its
+    media files are listed without resolving it again.
+    """
 
     @wraps(f)
     def view(**kwargs):
@@ -306,7 +380,11 @@ def pass_record_media_files(f):
         read_kwargs = {"id_": pid_value, "identity": g.identity}
 
         try:
-            if is_preview:
+            if kwargs.get("record") is not None:
+                media_files = _list_resolved_record_files(
+                    kwargs["record"], is_media=True
+                )
+            elif is_preview:
                 try:
                     media_files = draft_media_files_service().list_files(**read_kwargs)
                 except NoResultFound:
@@ -358,7 +436,9 @@ def pass_draft_community(f):
     def view(**kwargs):
         comid = request.args.get("community")
         if comid:
-            community = current_communities.service.read(id_=comid, identity=g.identity)
+            community = memoized_call(
+                current_communities.service, "read", g.identity, id_=comid
+            )
             kwargs["community"] = UICommunityJSONSerializer().dump_obj(
                 community.to_dict()
             )
@@ -455,6 +535,107 @@ def add_signposting_metadata_resources(f):
     return view
 
 
+def _get_record_etag(record):
+    """Compute a strong ETag for the current view of a record.
+
+    The ETag covers the record, parent, versions and files revisions, as well
+    as everything else the response depends on: the view and its arguments,
+    the exporter configuration, the locale, the user, the secret link token of
+    the session and the application version.
+    """
+    record_ = record._record
+    parts = [
+        __version__,
+        request.endpoint,
+        sorted((request.view_args or {}).items()),
+        sorted(request.args.items(multi=True)),
+        record.id,
+        record_.revision_id,
+        record_.parent.revision_id,
+        record_.versions.latest_id,
+        str(current_i18n.locale),
+        current_user.get_id() if current_user.is_authenticated else None,
+        # the access granted by a secret link (hashed with the other parts)
+        session.get("token"),
+    ]
+    for bucket_attr in ("bucket", "media_bucket"):
+        bucket = getattr(record_, bucket_attr, None)
+        parts.append(bucket.updated if bucket is not None else None)
+
+    export_format = (request.view_args or {}).get("export_format")
+    if export_format:
+        exporters = current_app.config.get("APP_RDM_RECORD_EXPORTERS", {})
+        exporter = exporters.get(export_format, {})
+        parts.extend([exporter.get("serializer"), exporter.get("params")])
+
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _get_record_last_modified(record):
+    """Get the last modification date of a record, its parent or its files."""
+    record_ = record._record
+    dates = [record_.updated, record_.parent.updated]
+    for bucket_attr in ("bucket", "media_bucket"):
+        bucket = getattr(record_, bucket_attr, None)
+        if bucket is not None:
+            dates.append(bucket.updated)
+    dates = [d for d in dates if d is not None]
+    return max(dates) if dates else None
+
+
+def conditional_record_response(f=None, on_not_modified=None):
+    """Add validators to a record view's response and handle conditional requests.
+
+    A strong ETag and a Last-Modified header are computed from the record
+    before the view is called, so that a ``304 Not Modified`` response can be
+    returned without rendering or serializing anything. Previews are excluded
+    as drafts are expected to change between two requests.
+
+    :param on_not_modified: called with the record when a ``304`` is returned
+        instead of calling the view, e.g. to count the views of a page.
+    """
+    if f is None:
+        return partial(conditional_record_response, on_not_modified=on_not_modified)
+
+    @wraps(f)
+    def view(*args, **kwargs):
+        # Relies on other decorators having operated before it
+        record = kwargs.get("record")
+        if (
+            record is None
+            or kwargs.get("is_preview")
+            or request.method not in ("GET", "HEAD")
+        ):
+            return f(*args, **kwargs)
+
+        etag = _get_record_etag(record)
+        last_modified = _get_record_last_modified(record)
+
+        if not is_resource_modified(
+            request.environ, etag=etag, last_modified=last_modified
+        ):
+            response = make_response("", 304)
+            if on_not_modified is not None:
+                on_not_modified(record)
+        else:
+            response = make_response(f(*args, **kwargs))
+            # e.g. errors, or redirects which depend on the configuration
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        # clients can keep the response, but should always revalidate it
+        response.cache_control.no_cache = True
+        if current_user.is_authenticated or session.get("token"):
+            response.cache_control.private = True
+
+        return response
+
+    return view
+
+
 def secret_link_or_login_required():
     """Skip login redirection check for requests with secret links.
 
@@ -14,6 +14,7 @@
 from copy import deepcopy
 
 from flask import current_app, g, redirect
+from flask_babel import force_locale
 from flask_login import login_required
 from invenio_communities.errors import CommunityDeletedError
 from invenio_communities.proxies import current_communities
@@ -27,12 +28,19 @@ from invenio_rdm_records.services.components.pids import _get_optional_doi_trans
 from invenio_rdm_records.services.schemas import RDMRecordSchema
 from invenio_rdm_records.services.schemas.utils import dump_empty
 from invenio_records_resources.services.errors import PermissionDeniedError
-from invenio_search.engine import dsl
-from invenio_vocabularies.proxies import current_service as vocabulary_service
 from invenio_vocabularies.records.models import VocabularyScheme
 from marshmallow_utils.fields.babel import gettext_from_dict
 from sqlalchemy.orm import load_only
 
+from ..cache import (
+    get_cached_vocabularies_options,
+    is_vocabularies_options_cacheable,
+    read_all_vocabulary,
+    set_cached_vocabularies_options,
+    vocabularies_options_cache_key,
+)
+from ..custom_fields import get_custom_fields_plan
+from ..memo import memoized_call
 from ..utils import set_default_value
 from .decorators import (
     no_cache_response,
@@ -138,9 +146,20 @@ def get_record_permissions(actions, record=None):
 class VocabulariesOptions:
     """Holds React form vocabularies options."""
 
-    def __init__(self):
-        """Constructor."""
+    def __init__(self, identity=None):
+        """Constructor.
+
+        :param identity: The identity reading the vocabularies, defaults to the
+            current one.
+        """
+        self._identity = identity
         self._vocabularies = {}
+        self._resource_types = None
+
+    @property
+    def identity(self):
+        """Identity reading the vocabularies."""
+        return self._identity or g.identity
 
     # Utilities
     def _get_label(self, hit):
@@ -151,57 +170,76 @@ class VocabulariesOptions:
             current_app.config.get("BABEL_DEFAULT_LOCALE", "en"),
         )
 
-    def _get_type_subtype_label(self, hit, type_labels):
-        """Return (type, subtype) pair for this hit."""
-        id_ = hit["id"]
-        type_ = hit.get("props", {}).get("type")
+    def _get_type_subtype_label(self, id_, resource_type, index):
+        """Return (type, subtype) pair for this resource type."""
+        type_ = resource_type["type"]
 
         if id_ == type_:
             # dataset-like case
-            return (self._get_label(hit), "")
-        elif type_ not in type_labels:
+            return (resource_type["label"], "")
+        elif type_ not in index:
             # safety net to generate a valid type, subtype and not break search
-            return (self._get_label(hit), "")
+            return (resource_type["label"], "")
         else:
-            return (type_labels[type_], self._get_label(hit))
-
-    def _resource_types(self, extra_filter):
-        """Dump resource type vocabulary."""
-        type_ = "resourcetypes"
-        all_resource_types = vocabulary_service.read_all(
-            g.identity,
-            fields=["id", "props", "title", "icon"],
-            type=type_,
-            # Sorry, we have over 100+ resource types entry at NU actually
-            max_records=150,
-        )
-        type_labels = {
-            hit["id"]: self._get_label(hit)
-            for hit in all_resource_types.to_dict()["hits"]["hits"]
-        }
-        subset_resource_types = vocabulary_service.read_all(
-            g.identity,
-            fields=["id", "props", "title", "icon"],
-            type=type_,
-            extra_filter=extra_filter,
-            # Sorry, we have over 100+ resource types entry at NU actually
-            max_records=150,
-        )
-
-        return [
-            {
-                "icon": hit.get("icon", ""),
-                "id": hit["id"],
-                "subtype_name": self._get_type_subtype_label(hit, type_labels)[1],
-                "type_name": self._get_type_subtype_label(hit, type_labels)[0],
+            return (index[type_]["label"], resource_type["label"])
+
+    def _resource_types_index(self):
+        """Read all the resource types once, indexed by id."""
+        if self._resource_types is None:
+            limit = current_app.config["APP_RDM_DEPOSIT_FORM_RESOURCE_TYPES_LIMIT"]
+            results = read_all_vocabulary(
+                self.identity,
+                type="resourcetypes",
+                fields=["id", "props", "title", "icon", "tags"],
+                # the options are cached as a whole, and invalidated on changes
+                cache=not is_vocabularies_options_cacheable(),
+                max_records=limit,
+            )
+            if results.total > limit:
+                current_app.logger.warning(
+                    "Only %s out of %s resource types are shown in the deposit "
+                    "form, see APP_RDM_DEPOSIT_FORM_RESOURCE_TYPES_LIMIT.",
+                    limit,
+                    results.total,
+                )
+            self._resource_types = {
+                hit["id"]: {
+                    "label": self._get_label(hit),
+                    "type": hit.get("props", {}).get("type"),
+                    "tags": hit.get("tags", []),
+                    "icon": hit.get("icon", ""),
+                }
+                for hit in results.to_dict()["hits"]["hits"]
             }
-            for hit in subset_resource_types.to_dict()["hits"]["hits"]
-        ]
+        return self._resource_types
+
+    def _dump_resource_types(self, tag):
+        """Dump the resource types with the given tag."""
+        index = self._resource_types_index()
+        dumped = []
+        for id_, resource_type in index.items():
+            if tag not in resource_type["tags"]:
+                continue
+            type_name, subtype_name = self._get_type_subtype_label(
+                id_, resource_type, index
+            )
+            dumped.append(
+                {
+                    "icon": resource_type["icon"],
+                    "id": id_,
+                    "subtype_name": subtype_name,
+                    "type_name": type_name,
+                }
+            )
+        return dumped
 
     def _dump_vocabulary_w_basic_fields(self, vocabulary_type):
         """Dump vocabulary with id and title field."""
-        results = vocabulary_service.read_all(
-            g.identity, fields=["id", "title"], type=vocabulary_type
+        results = read_all_vocabulary(
+            self.identity,
+            type=vocabulary_type,
+            fields=["id", "title"],
+            cache=not is_vocabularies_options_cacheable(),
         )
         return [
             {
@@ -214,9 +252,7 @@ class VocabulariesOptions:
     # Vocabularies
     def depositable_resource_types(self):
         """Return depositable resource type options (value, label) pairs."""
-        self._vocabularies["resource_type"] = self._resource_types(
-            dsl.Q("term", tags="depositable")
-        )
+        self._vocabularies["resource_type"] = self._dump_resource_types("depositable")
         return self._vocabularies["resource_type"]
 
     def subjects(self):
@@ -274,7 +310,7 @@ class VocabulariesOptions:
 
     def linkable_resource_types(self):
         """Dump linkable resource type vocabulary."""
-        return self._resource_types(dsl.Q("term", tags="linkable"))
+        return self._dump_resource_types("linkable")
 
     def identifier_schemes(self):
         """Dump identifiers scheme (fake) vocabulary.
@@ -295,7 +331,21 @@ class VocabulariesOptions:
         }
 
     def dump(self):
-        """Dump into dict."""
+        """Dump into dict.
+
+        The vocabularies read from the search cluster are cached per locale if
+        ``APP_RDM_DEPOSIT_FORM_VOCABULARIES_CACHE_ENABLED`` is set.
+        """
+        cache_key = None
+        if is_vocabularies_options_cacheable():
+            cache_key = vocabularies_options_cache_key(current_i18n.locale)
+            vocabularies = get_cached_vocabularies_options(cache_key)
+            if vocabularies is not None:
+                self._vocabularies = vocabularies
+                # not cached, as the labels can be lazy translations
+                self._vocabularies["identifiers"]["scheme"] = self.identifier_schemes()
+                return self._vocabularies
+
         # TODO: Nest vocabularies inside "metadata" key so that frontend dumber
         self.depositable_resource_types()
         self.title_types()
@@ -307,41 +357,31 @@ class VocabulariesOptions:
         self.identifiers()
         # We removed
         # vocabularies["relation_type"] = _dump_relation_types_vocabulary()
+
+        if cache_key:
+            identifiers = self._vocabularies["identifiers"]
+            set_cached_vocabularies_options(
+                cache_key,
+                {
+                    **self._vocabularies,
+                    "identifiers": {
+                        k: v for k, v in identifiers.items() if k != "scheme"
+                    },
+                },
+            )
         return self._vocabularies
 
 
+def warm_up_vocabularies_options(identity, locales):
+    """Cache the vocabularies options of the deposit form for the given locales."""
+    for locale in locales:
+        with current_app.test_request_context(), force_locale(locale):
+            VocabulariesOptions(identity=identity).dump()
+
+
 def load_custom_fields():
     """Load custom fields configuration."""
-    conf = current_app.config
-    conf_ui = conf.get("RDM_CUSTOM_FIELDS_UI", [])
-    conf_backend = {cf.name: cf for cf in conf.get("RDM_CUSTOM_FIELDS", [])}
-    _vocabulary_fields = []
-    error_labels = {}
-
-    for section_cfg in conf_ui:
-        fields = section_cfg["fields"]
-        for field in fields:
-            field_instance = conf_backend.get(field["field"])
-            # Compute the dictionary to map field path to error labels
-            # for each custom field. This is the label shown at the top of the upload
-            # form
-            field_error_label = field.get("props", {}).get("label")
-            if field_error_label:
-                error_labels[f"custom_fields.{field['field']}"] = field_error_label
-            if getattr(field_instance, "relation_cls", None):
-                sort_by = field.get("props", {}).get("sort_by")
-                if sort_by:
-                    field_instance.sort_by = sort_by
-                # add vocabulary options to field's properties
-                field["props"]["options"] = field_instance.options(g.identity)
-                # mark field as vocabulary
-                field["is_vocabulary"] = True
-                _vocabulary_fields.append(field["field"])
-    return {
-        "ui": conf_ui,
-        "vocabularies": _vocabulary_fields,
-        "error_labels": error_labels,
-    }
+    return get_custom_fields_plan().load()
 
 
 def get_user_communities_memberships():
@@ -500,8 +540,8 @@ def deposit_edit(pid_value, draft=None, draft_files=None, files_locked=True):
     if community:
         # TODO: handle deleted community
         try:
-            community = current_communities.service.read(
-                id_=community["id"], identity=g.identity
+            community = memoized_call(
+                current_communities.service, "read", g.identity, id_=community["id"]
             )
             community_theme = community.to_dict().get("theme", {})
         except CommunityDeletedError:
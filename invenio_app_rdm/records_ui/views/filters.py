@@ -10,8 +10,6 @@
 
 """Filters to be used in the Jinja templates."""
 
-from os.path import splitext
-
 import idutils
 from babel.numbers import format_compact_decimal, format_decimal
 from flask import current_app, url_for
@@ -21,6 +19,7 @@ from invenio_previewer.views import is_previewable
 from invenio_records_files.api import FileObject
 from invenio_records_permissions.policies import get_record_permission_policy
 
+from ..previewer.dispatch import file_extension
 from ..previewer.iiif_simple import previewable_extensions as image_extensions
 
 
@@ -39,7 +38,7 @@ def select_preview_file(files, default_preview=None):
     """Return file to preview or None if no previewable file."""
     selected = None
     for f in files or []:
-        file_type = splitext(f.get("key", ""))[1][1:].lower()
+        file_type = file_extension(f.get("key", ""))
         if is_previewable(file_type):
             if selected is None:
                 selected = f
@@ -88,32 +87,27 @@ def pid_url(identifier, scheme=None, url_scheme="https"):
 
 def has_previewable_files(files):
     """Check if any of the files is previewable."""
-    # 'splitext' inclues the dot of the file extension in the
-    # extension, we have to get rid of that
-    extensions = [splitext(f["key"])[-1].strip(".").lower() for f in files]
-    return any([is_previewable(ext) for ext in extensions])
+    return any(is_previewable(file_extension(f["key"])) for f in files)
 
 
 def has_images(files):
     """Check if any of the files are images (previewable by iiif_simple)."""
-    extensions = [splitext(f["key"])[-1].strip(".").lower() for f in files]
+    extensions = [file_extension(f["key"]) for f in files]
     return any(ext in image_extensions for ext in extensions)
 
 
 def order_entries(files):
-    """Re-order the file entries, if an order is given."""
+    """Re-order the file entries, if an order is given.
+
+    Entries missing from the order are appended alphabetically, and keys of
+    the order without entry are ignored.
+    """
     order = files.get("order")
     files = files.get("entries", [])
     if order:
-        files_ = files.copy()
-        keys = [f["key"] for f in files]
-
-        def get_file(key):
-            idx = keys.index(key)
-            keys.pop(idx)
-            return files_.pop(idx)
-
-        files = [get_file(key) for key in order]
+        entries = {f["key"]: f for f in files}
+        ordered = [entries.pop(key) for key in order if key in entries]
+        files = ordered + sorted(entries.values(), key=lambda x: x["key"].lower())
     else:
         # sort alphabetically by filekey
         files = sorted(files, key=lambda x: x["key"].lower())
@@ -9,13 +9,19 @@
 
 """Routes for record-related pages provided by Invenio-App-RDM."""
 
-import itertools
-from os.path import splitext
-from pathlib import Path
-
-from flask import abort, current_app, g, redirect, render_template, request, url_for
+from contextlib import closing
+
+from flask import (
+    abort,
+    current_app,
+    g,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
 from flask_login import current_user
-from invenio_base.utils import obj_or_import_string
 from invenio_communities.communities.resources.serializer import (
     UICommunityJSONSerializer,
 )
@@ -29,19 +35,48 @@ from invenio_rdm_records.records.systemfields.access.access_settings import (
     AccessSettings,
 )
 from invenio_rdm_records.resources.serializers import UIJSONSerializer
-from invenio_stats.proxies import current_stats
-from invenio_users_resources.proxies import current_user_resources
 from marshmallow import ValidationError
 
-from invenio_app_rdm.records_ui.previewer.iiif_simple import (
-    previewable_extensions as image_extensions,
+from ..cache import (
+    export_cache_key,
+    get_cached_export,
+    get_cached_landing_page,
+    get_preview_artifact,
+    is_export_cacheable,
+    is_landing_page_cacheable,
+    landing_page_cache_key,
+    set_cached_export,
+    set_cached_landing_page,
 )
-
-from ..utils import get_external_resources
+from ..downloads import is_partial_download, send_file_item
+from ..exports import BulkExporter
+from ..files import list_file_list_page, paginate_file_list
+from ..images import (
+    get_cached_derivative,
+    get_derivative_mimetype,
+    get_derivative_spec,
+    get_rendered_thumbnail,
+    get_thumbnail,
+    is_derivatives_enabled,
+    is_rendered_thumbnail_cacheable,
+    schedule_derivatives,
+)
+from ..memo import get_user_avatar, memoized_call
+from ..previewer.dispatch import file_extension, get_previewer_name, select_previewer
+from ..previewer.streams import (
+    BoundedStream,
+    get_max_read_bytes,
+    list_zip_entries,
+    read_head,
+    read_lines,
+)
+from ..stats import emit_stats_event
+from ..utils import get_export_serializer, get_external_resources
 from .decorators import (
     add_signposting_content_resources,
     add_signposting_landing_page,
     add_signposting_metadata_resources,
+    conditional_record_response,
     pass_file_item,
     pass_file_metadata,
     pass_include_deleted,
@@ -84,8 +119,8 @@ def get_record_community(record):
         # deleted communities with tombstones are not identified as ghost records
         # at the moment because `read_many()` function is not filtering them out
         try:
-            community = current_communities.service.read(
-                id_=community_id, identity=g.identity
+            community = memoized_call(
+                current_communities.service, "read", g.identity, id_=community_id
             )
             # community has not tombstone
             return community, community_id
@@ -95,6 +130,12 @@ def get_record_community(record):
         return None, None
 
 
+def emit_record_view_event(record):
+    """Emit a record view stats event."""
+    if record is not None:
+        emit_stats_event("record-view", record=record._record, via_api=False)
+
+
 class PreviewFile:
     """Preview file implementation for InvenioRDM.
 
@@ -110,6 +151,7 @@ class PreviewFile:
         self.size = self.data["size"]
         self.filename = self.data["key"]
         self.bucket = self.data["bucket_id"]
+        self.previewer_name = None
         self.uri = url or url_for(
             "invenio_app_rdm_records.record_file_download",
             pid_value=record_pid_value,
@@ -125,13 +167,49 @@ class PreviewFile:
 
         Each `exts` has the format `.{file type}` e.g. `.txt` .
         """
-        file_ext = splitext(self.data["key"])[1].lower()
-        return file_ext in exts
+        ext = file_extension(self.filename)
+        return (f".{ext}" if ext else "") in exts
 
-    def open(self):
-        """Open the file."""
+    def _open(self):
+        """Open the file from its storage."""
         return self.file._file.file.storage().open()
 
+    def open(self):
+        """Open the file, bounded to what its previewer may read."""
+        fp = self._open()
+        max_bytes = get_max_read_bytes(self.previewer_name)
+        return fp if max_bytes is None else BoundedStream(fp, max_bytes)
+
+    def _artifact(self, name, compute):
+        """Get an artifact of the opened file, cached by checksum."""
+
+        def compute_from_file():
+            with closing(self._open()) as fp:
+                return compute(fp)
+
+        return get_preview_artifact(self.data.get("checksum"), name, compute_from_file)
+
+    def read_head(self, max_bytes):
+        """Read the first ``max_bytes`` bytes of the file."""
+        return self._artifact(f"head:{max_bytes}", lambda fp: read_head(fp, max_bytes))
+
+    def read_lines(self, max_lines, max_bytes=None):
+        """Read the first ``max_lines`` lines of the file.
+
+        At most ``max_bytes`` bytes are read, defaulting to the previewer cap.
+        """
+        max_bytes = max_bytes or get_max_read_bytes(self.previewer_name) or self.size
+        return self._artifact(
+            f"lines:{max_lines}:{max_bytes}",
+            lambda fp: read_lines(fp, max_lines, max_bytes),
+        )
+
+    def list_zip_entries(self, max_entries):
+        """List the entries of a ZIP file, reading only its central directory."""
+        return self._artifact(
+            f"zip:{max_entries}", lambda fp: list_zip_entries(fp, max_entries)
+        )
+
 
 #
 # Views
@@ -141,6 +219,7 @@ class PreviewFile:
 @pass_is_preview
 @pass_include_deleted
 @pass_record_or_draft(expand=True)
+@conditional_record_response(on_not_modified=emit_record_view_event)
 @pass_record_files
 @pass_record_media_files
 @add_signposting_landing_page
@@ -148,8 +227,16 @@ def record_detail(
     pid_value, record, files, media_files, is_preview=False, include_deleted=False
 ):
     """Record detail page (aka landing page)."""
-    files_dict = None if files is None else files.to_dict()
-    media_files_dict = None if media_files is None else media_files.to_dict()
+    cache_key = None
+    if is_landing_page_cacheable(record, is_preview, include_deleted):
+        cache_key = landing_page_cache_key(record)
+        page = get_cached_landing_page(cache_key)
+        if page is not None:
+            emit_record_view_event(record)
+            return page
+
+    files_dict = paginate_file_list(files)
+    media_files_dict = paginate_file_list(media_files)
 
     access = record._record.parent["access"]
     if "settings" not in access or access["settings"] is None:
@@ -165,9 +252,7 @@ def record_detail(
     avatar = None
 
     if current_user.is_authenticated:
-        avatar = current_user_resources.users_service.links_item_tpl.expand(
-            g.identity, current_user
-        )["avatar"]
+        avatar = get_user_avatar()
 
     if is_preview and is_draft:
         # it is possible to save incomplete drafts that break the normal
@@ -211,10 +296,7 @@ def record_detail(
                     )
                     record_ui["ui"]["new_draft_parent_doi"] = parent_doi
 
-    # emit a record view stats event
-    emitter = current_stats.get_event_emitter("record-view")
-    if record is not None and emitter is not None:
-        emitter(current_app, record=record._record, via_api=False)
+    emit_record_view_event(record)
 
     record_owner = (
         record_ui.get("expanded", {})
@@ -230,7 +312,7 @@ def record_detail(
     )
     theme = resolved_community.get("theme", {}) if resolved_community else None
 
-    return render_community_theme_template(
+    page = render_community_theme_template(
         current_app.config.get("APP_RDM_RECORD_LANDING_PAGE_TEMPLATE"),
         theme=theme,
         record=record_ui,
@@ -262,9 +344,15 @@ def record_detail(
         ),  # record created with system_identity have not owners e.g demo
     )
 
+    if cache_key is not None:
+        set_cached_landing_page(cache_key, page)
+
+    return page
+
 
 @pass_is_preview
 @pass_record_or_draft(expand=False)
+@conditional_record_response
 @add_signposting_metadata_resources
 def record_export(
     pid_value, record, export_format=None, permissions=None, is_preview=False
@@ -275,10 +363,18 @@ def record_export(
     if exporter is None:
         abort(404)
 
-    serializer = obj_or_import_string(exporter["serializer"])(
-        **exporter.get("params", {})
-    )
-    exported_record = serializer.serialize_object(record.to_dict())
+    cache_key = None
+    exported_record = None
+    if is_export_cacheable(record, is_preview):
+        cache_key = export_cache_key(record, export_format, exporter)
+        exported_record = get_cached_export(cache_key)
+
+    if exported_record is None:
+        serializer = get_export_serializer(exporter)
+        exported_record = serializer.serialize_object(record.to_dict())
+        if cache_key is not None:
+            set_cached_export(cache_key, exported_record)
+
     contentType = exporter.get("content-type", export_format)
     filename = exporter.get("filename", export_format).format(id=pid_value)
     headers = {
@@ -288,6 +384,27 @@ def record_export(
     return (exported_record, 200, headers)
 
 
+def records_bulk_export(export_format=None):
+    """Stream all the visible records in an export format."""
+    if not current_app.config.get("APP_RDM_RECORDS_BULK_EXPORT_ENABLED"):
+        abort(404)
+
+    params = {}
+    if request.args.get("q"):
+        params["q"] = request.args["q"]
+    try:
+        exporter = BulkExporter(export_format, g.identity, params=params)
+    except KeyError:
+        abort(404)
+
+    headers = {"Content-Disposition": f"attachment; filename={exporter.filename}"}
+    return current_app.response_class(
+        stream_with_context(iter(exporter)),
+        mimetype=exporter.content_type,
+        headers=headers,
+    )
+
+
 @pass_is_preview
 @pass_include_deleted
 @pass_record_or_draft(expand=False)
@@ -316,16 +433,68 @@ def record_file_preview(
     if file_previewer:
         previewer = current_previewer.previewers.get(file_previewer)
         if previewer and previewer.can_preview(fileobj):
+            fileobj.previewer_name = file_previewer
             return previewer.preview(fileobj)
 
-    # Go through all previewers to find the first one that can preview the file
-    for plugin in current_previewer.iter_previewers():
-        if plugin.can_preview(fileobj):
-            return plugin.preview(fileobj)
+    # Find the first previewer that can preview the file, among the ones
+    # handling its extension
+    plugin = select_previewer(fileobj)
+    if plugin is not None:
+        fileobj.previewer_name = get_previewer_name(plugin)
+        return plugin.preview(fileobj)
 
+    fileobj.previewer_name = "default"
     return default_previewer.preview(fileobj)
 
 
+def _files_list_response(files):
+    """Build the response of a page of the files listing."""
+    if files is None:
+        abort(403)
+
+    config = current_app.config
+    max_size = config["APP_RDM_RECORD_FILES_LIST_MAX_SIZE"]
+    size = (
+        request.args.get("size", type=int)
+        or config["APP_RDM_RECORD_FILES_PAGE_SIZE"]
+        or max_size
+    )
+    try:
+        return list_file_list_page(
+            files,
+            max(1, min(size, max_size)),
+            after=request.args.get("after"),
+            prefix=request.args.get("prefix"),
+            sort=request.args.get("sort", "order"),
+        )
+    except ValueError:
+        abort(400)
+
+
+@pass_is_preview
+@pass_record_or_draft(expand=False)
+@conditional_record_response
+@pass_record_files
+def record_files_list(pid_value, record, files=None, is_preview=False, **kwargs):
+    """List a page of the files of a record, as JSON.
+
+    Pages are selected with the ``size`` and ``after`` (cursor) arguments, and
+    the files can be filtered with ``prefix`` and sorted with ``sort``.
+    """
+    return _files_list_response(files)
+
+
+@pass_is_preview
+@pass_record_or_draft(expand=False)
+@conditional_record_response
+@pass_record_media_files
+def record_media_files_list(
+    pid_value, record, media_files=None, is_preview=False, **kwargs
+):
+    """List a page of the media files of a record, as JSON."""
+    return _files_list_response(media_files)
+
+
 @pass_is_preview
 @pass_file_item(is_media=False)
 @add_signposting_content_resources
@@ -333,40 +502,58 @@ def record_file_download(pid_value, file_item=None, is_preview=False, **kwargs):
     """Download a file from a record."""
     download = bool(request.args.get("download"))
 
-    # emit a file download stats event
-    emitter = current_stats.get_event_emitter("file-download")
-    if file_item is not None and emitter is not None:
+    # emit a file download stats event, once per transfer
+    if file_item is not None and not is_partial_download(file_item):
         obj = file_item._file.object_version
-        emitter(current_app, record=file_item._record, obj=obj, via_api=False)
+        emit_stats_event(
+            "file-download", record=file_item._record, obj=obj, via_api=False
+        )
+
+    return send_file_item(file_item, as_attachment=download)
+
+
+@pass_file_item(is_media=False)
+def record_file_derivative(pid_value, name, filename, file_item=None, **kwargs):
+    """Serve a pre-rendered IIIF derivative of an image file.
 
-    return file_item.send_file(as_attachment=download)
+    Missing derivatives are scheduled for rendering and the IIIF server is
+    used in the meantime.
+    """
+    spec = get_derivative_spec(filename, name)
+    if spec is None or not is_derivatives_enabled():
+        abort(404)
+
+    checksum = file_item._file.object_version.file.checksum
+    derivative = get_cached_derivative(checksum, name)
+    if derivative is None:
+        schedule_derivatives(pid_value)
+        file = current_rdm_records.records_service.files.read_file_metadata(
+            id_=pid_value, file_key=filename, identity=g.identity
+        )
+        size, image_format = spec
+        return redirect(
+            f"{file['links']['iiif_base']}/full/{size}/0/default.{image_format}"
+        )
+    return current_app.response_class(
+        derivative, mimetype=get_derivative_mimetype(filename, name)
+    )
 
 
 @pass_record_or_draft(expand=False)
+@conditional_record_response
 def record_thumbnail(pid_value, size, record=None, **kwargs):
     """Display a record's thumbnail."""
     # Verify against allowed thumbnail sizes
     if size not in current_app.config["APP_RDM_RECORD_THUMBNAIL_SIZES"]:
         abort(404)
-    files = record.data.get("files", {})
-    default_preview = files.get("default_preview")
-    file_entries = files.get("entries", {})
-    if file_entries:
-        file_key = next(
-            (
-                key
-                for key in itertools.chain([default_preview], file_entries)
-                if key and Path(key).suffix[1:] in image_extensions
-            ),
-            None,
+    file_key, iiif_base_url = get_thumbnail(record)
+    if not file_key:
+        return abort(404)
+    if is_rendered_thumbnail_cacheable(record):
+        return current_app.response_class(
+            get_rendered_thumbnail(record, file_key, size), mimetype="image/png"
         )
-        if file_key:
-            file = current_rdm_records.records_service.files.read_file_metadata(
-                id_=pid_value, file_key=file_key, identity=g.identity
-            )
-            iiif_base_url = file["links"]["iiif_base"]
-            return redirect(f"{iiif_base_url}/full/{size},/0/default.png")
-    return abort(404)
+    return redirect(f"{iiif_base_url}/full/{size},/0/default.png")
 
 
 # Media files download
@@ -378,13 +565,14 @@ def record_media_file_download(pid_value, file_item=None, is_preview=False, **kw
     """Download a media file from a record."""
     download = bool(request.args.get("download"))
 
-    # emit a file download stats event
-    emitter = current_stats.get_event_emitter("file-download")
-    if file_item is not None and emitter is not None:
+    # emit a file download stats event, once per transfer
+    if file_item is not None and not is_partial_download(file_item):
         obj = file_item._file.object_version
-        emitter(current_app, record=file_item._record, obj=obj, via_api=False)
+        emit_stats_event(
+            "file-download", record=file_item._record, obj=obj, via_api=False
+        )
 
-    return file_item.send_file(as_attachment=download)
+    return send_file_item(file_item, as_attachment=download)
 
 
 @pass_record_latest
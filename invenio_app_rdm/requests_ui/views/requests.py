@@ -30,9 +30,10 @@ from invenio_records_resources.services.errors import PermissionDeniedError
 from invenio_requests.customizations import AcceptAction
 from invenio_requests.resolvers.registry import ResolverRegistry
 from invenio_requests.views.decorators import pass_request
-from invenio_users_resources.proxies import current_user_resources
 from sqlalchemy.orm.exc import NoResultFound
 
+from ...records_ui.files import paginate_file_list
+from ...records_ui.memo import get_user_avatar, memoized_call
 from ...records_ui.utils import get_external_resources
 from ...records_ui.views.decorators import (
     draft_files_service,
@@ -82,11 +83,17 @@ def _resolve_topic_record(request):
                     g.identity.provides.add(community_inclusion_need)
                     break
             # read published record
-            record = current_rdm_records_service.read(g.identity, pid, expand=True)
+            record = memoized_call(
+                current_rdm_records_service, "read", g.identity, id_=pid, expand=True
+            )
         else:
             # read draft
-            record = current_rdm_records_service.read_draft(
-                g.identity, pid, expand=True
+            record = memoized_call(
+                current_rdm_records_service,
+                "read_draft",
+                g.identity,
+                id_=pid,
+                expand=True,
             )
     except (NoResultFound, PIDDoesNotExistError):
         # We catch PIDDoesNotExistError because a published record with
@@ -96,7 +103,9 @@ def _resolve_topic_record(request):
         # layer.
         try:
             # read published record
-            record = current_rdm_records_service.read(g.identity, pid, expand=True)
+            record = memoized_call(
+                current_rdm_records_service, "read", g.identity, id_=pid, expand=True
+            )
         except NoResultFound:
             # record tab not displayed when the record is not found
             # the request is probably not open anymore
@@ -135,7 +144,7 @@ def _resolve_record_or_draft_files(record, request):
                 )
         except NoResultFound:
             files = files_service().list_files(id_=record_pid, identity=g.identity)
-        return files.to_dict()
+        return paginate_file_list(files)
     return None
 
 
@@ -158,7 +167,7 @@ def _resolve_record_or_draft_media_files(record, request):
             media_files = media_files_service().list_files(
                 id_=record_pid, identity=g.identity
             )
-        return media_files.to_dict()
+        return paginate_file_list(media_files)
     return None
 
 
@@ -166,9 +175,7 @@ def _resolve_record_or_draft_media_files(record, request):
 @pass_request(expand=True)
 def user_dashboard_request_view(request, **kwargs):
     """User dashboard request details view."""
-    avatar = current_user_resources.users_service.links_item_tpl.expand(
-        g.identity, current_user
-    )["avatar"]
+    avatar = get_user_avatar()
 
     request_type = request["type"]
     request_is_accepted = request["status"] == AcceptAction.status_to
@@ -235,9 +242,7 @@ def user_dashboard_request_view(request, **kwargs):
 @pass_community(serialize=True)
 def community_dashboard_request_view(request, community, community_ui, **kwargs):
     """Community dashboard requests details view."""
-    avatar = current_user_resources.users_service.links_item_tpl.expand(
-        g.identity, current_user
-    )["avatar"]
+    avatar = get_user_avatar()
 
     request_type = request["type"]
 
@@ -6,40 +6,137 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 """Celery tasks for invenio-app-rdm."""
 
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import sqlalchemy as sa
 from celery import shared_task
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
 from invenio_db import db
 from invenio_files_rest.models import FileInstance
 
-from .utils.files import send_integrity_report_email
+from .records_ui.images import generate_derivatives
+from .records_ui.views.deposits import warm_up_vocabularies_options
+from .utils.files import send_integrity_report_email, verify_files_checksums
+
+files_integrity_progress_key = "app-rdm:files-integrity-progress"
+"""Cache key of the progress of the files verification."""
+
+files_integrity_timeout = 60 * 60 * 24
+"""Timeout in seconds of the progress of the files verification."""
+
+
+def _verify_files_chunk(app, file_ids, deadline):
+    """Verify a chunk of files in a thread, within its own application context."""
+    with app.app_context():
+        return verify_files_checksums(file_ids, deadline=deadline)
+
+
+def _iter_verification_chunks(files, chunk_size, bytes_budget):
+    """Split the files to verify into chunks of ids, within the bytes budget."""
+    chunk, total_bytes = [], 0
+    for file_id, size in files:
+        total_bytes += size or 0
+        if bytes_budget is not None and total_bytes > bytes_budget:
+            break
+        chunk.append(file_id)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def verify_pending_files():
+    """Verify again the files that errored during their last check.
+
+    Files are verified in chunks by a pool of threads, which bounds the
+    concurrent reads from the storage, and each chunk is committed at once.
+    The verification stops at the time and bytes budgets, leaving the files
+    with the oldest checks first for the next run. The progress is logged
+    and kept in the cache.
+    """
+    config = current_app.config
+    time_budget = config["APP_RDM_FILES_INTEGRITY_VERIFY_TIME_BUDGET"]
+    deadline = time.monotonic() + time_budget if time_budget else None
+
+    files = (
+        db.session.query(FileInstance.id, FileInstance.size)
+        .filter(FileInstance.last_check.is_(None), FileInstance.uri.is_not(None))
+        .order_by(FileInstance.last_check_at)
+        .all()
+    )
+    chunks = _iter_verification_chunks(
+        files,
+        config["APP_RDM_FILES_INTEGRITY_VERIFY_CHUNK_SIZE"],
+        config["APP_RDM_FILES_INTEGRITY_VERIFY_BYTES_BUDGET"],
+    )
+    progress = {"pending": len(files), "checked": 0, "bytes": 0}
+
+    def _update_progress(checked, checked_bytes):
+        progress["checked"] += checked
+        progress["bytes"] += checked_bytes
+        current_cache.set(
+            files_integrity_progress_key, progress, timeout=files_integrity_timeout
+        )
+
+    _update_progress(0, 0)
+    workers = config["APP_RDM_FILES_INTEGRITY_VERIFY_WORKERS"]
+    if workers <= 1:
+        for chunk in chunks:
+            try:
+                _update_progress(*verify_files_checksums(chunk, deadline=deadline))
+            except Exception:
+                # the session is reused by the next chunks and the report
+                db.session.rollback()
+                current_app.logger.exception("Failed to verify files checksums.")
+    else:
+        app = current_app._get_current_object()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_verify_files_chunk, app, chunk, deadline)
+                for chunk in chunks
+            ]
+            for future in as_completed(futures):
+                try:
+                    _update_progress(*future.result())
+                except Exception:
+                    current_app.logger.exception("Failed to verify files checksums.")
+
+    current_app.logger.info(
+        "Verified %(checked)s of %(pending)s pending files (%(bytes)s bytes).",
+        progress,
+    )
+    return progress
 
 
 @shared_task()
 def file_integrity_report():
     """Send a report of uhealthy/missing files to system admins."""
     # First retry verifying files that errored during their last check
-    files = FileInstance.query.filter(
-        FileInstance.last_check.is_(None),
+    verify_pending_files()
+
+    # the report entries are generated while streaming the query
+    unhealthy_files = FileInstance.query.filter(
+        sa.or_(FileInstance.last_check.is_(None), FileInstance.last_check.is_(False)),
         FileInstance.uri.is_not(None),
-    )
-    for f in files:
-        try:
-            f.clear_last_check()
-            db.session.commit()
-            f.verify_checksum(throws=False)
-            db.session.commit()
-        except Exception:
-            pass  # Don't fail sending the report in case of some file error
-
-    unhealthy_files = (
-        FileInstance.query.filter(
-            sa.or_(
-                FileInstance.last_check.is_(None), FileInstance.last_check.is_(False)
-            ),
-            FileInstance.uri.is_not(None),
-        )
-        .order_by(FileInstance.created.desc())
-        .all()
-    )
+    ).order_by(FileInstance.created.desc(), FileInstance.id)
 
     send_integrity_report_email(unhealthy_files)
+
+
+@shared_task()
+def warm_up_vocabularies_cache():
+    """Cache the deposit form vocabularies options of all the languages."""
+    conf = current_app.config
+    locales = [conf.get("BABEL_DEFAULT_LOCALE", "en")]
+    locales += [code for code, _ in conf.get("I18N_LANGUAGES", [])]
+    warm_up_vocabularies_options(system_identity, locales)
+
+
+@shared_task(ignore_result=True)
+def generate_iiif_derivatives(record_id):
+    """Render and cache the missing IIIF derivatives of a record's images."""
+    generate_derivatives(record_id)
@@ -7,6 +7,7 @@
 // under the terms of the MIT License; see LICENSE file for more details.
 
 import $ from "jquery";
+import { i18next } from "@translations/invenio_app_rdm/i18next";
 
 $("#record-doi-badge").on("click", function () {
   $("#doi-modal").modal("show");
@@ -109,3 +110,70 @@ $statsInfoPopup.on("blur", function (event) {
   $(event.target).popup("hide");
   $(event.target).attr("aria-expanded", false);
 });
+
+// Files list: load the next pages of the files of records with many files
+function formatFileSize(bytes, binary) {
+  const base = binary ? 1024 : 1000;
+  const units = binary
+    ? ["KiB", "MiB", "GiB", "TiB", "PiB"]
+    : ["kB", "MB", "GB", "TB", "PB"];
+  if (bytes < base) {
+    return `${bytes} Bytes`;
+  }
+  let value = bytes / base;
+  let unit = 0;
+  while (value >= base && unit < units.length - 1) {
+    value /= base;
+    unit++;
+  }
+  return `${value.toFixed(1)} ${units[unit]}`;
+}
+
+function filesListRow(file, $more) {
+  const key = file.key.split("/").map(encodeURIComponent).join("/");
+  const downloadUrl = $more.attr("data-files-download-url").replace("__key__", key);
+  const binarySizes = $more.attr("data-files-binary-sizes") === "true";
+
+  return $("<tr>").append(
+    $("<td>", { class: "ten wide" }).append(
+      $("<div>").append($("<a>", { href: downloadUrl, text: file.key })),
+      $("<small>", { class: "ui text-muted font-tiny", text: file.checksum || "" })
+    ),
+    $("<td>", { text: formatFileSize(file.size || 0, binarySizes) }),
+    $("<td>", { class: "right aligned" }).append(
+      $("<a>", {
+        role: "button",
+        class: "ui compact mini button",
+        href: downloadUrl,
+      }).append(
+        $("<i>", { "class": "download icon", "aria-hidden": "true" }),
+        i18next.t("Download")
+      )
+    )
+  );
+}
+
+$(".files-list-more-button").on("click", function () {
+  const $button = $(this);
+  const $more = $button.closest(".files-list-more");
+  const $tbody = $more.siblings("table.files").find("tbody");
+  const url = new URL($more.attr("data-files-list-url"), window.location.origin);
+  url.searchParams.set("after", $more.attr("data-files-list-after"));
+
+  $button.addClass("loading").prop("disabled", true);
+  $.getJSON(url.toString())
+    .done(function (page) {
+      const files = page.entries.filter((file) => !file.access?.hidden);
+      files.forEach((file) => $tbody.append(filesListRow(file, $more)));
+      const $shown = $more.find(".files-list-shown");
+      $shown.text(parseInt($shown.text(), 10) + page.entries.length);
+      if (page.next) {
+        $more.attr("data-files-list-after", page.next);
+      } else {
+        $button.remove();
+      }
+    })
+    .always(function () {
+      $button.removeClass("loading").prop("disabled", false);
+    });
+});
@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-App-RDM is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Batch engine of the record migrations of the upgrade scripts.
+
+Records are read in fixed-size batches ordered by id (keyset pagination), so
+that only one batch is in memory at a time. Each batch is committed together
+with a checkpoint, which a migration interrupted by a crash resumes from. A
+failing record does not abort the migration: its changes are rolled back and
+the error is collected. The ids of the failed records are kept in the
+checkpoint, and retried by the next run, which only marks the migration done
+once none of them fails.
+
+The updates run in a savepoint per record, so they must not commit the
+session (e.g. with a service call, which is a unit of work): they can return a
+function instead, called once the batch is committed. Its errors are collected
+too, but the changes of the record are kept.
+
+Usage in an upgrade script::
+
+    def update_record(record):
+        record["$schema"] = "local://records/record-v6.0.0.json"
+        record.commit()
+
+    migration = RecordsMigration("12.0-to-13.0", update_record)
+    migration.run(RDMRecord)
+    migration.run(RDMDraft)
+    migration.report()
+
+With ``workers``, the records are partitioned by ranges of their parent id
+and each partition is migrated by its own process, with its own database
+session. The partitions of the records and of the drafts are migrated one
+class after the other, so that the parents are never updated concurrently.
+
+The checkpoints are stored in the ``app_rdm_migration_checkpoint`` table,
+which is created when needed and can be dropped once the upgrade is over.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import deepcopy
+from datetime import datetime
+from multiprocessing import get_context
+from uuid import UUID
+
+import sqlalchemy as sa
+from click import secho
+from flask import current_app
+from invenio_db import db
+
+checkpoints_table = sa.Table(
+    "app_rdm_migration_checkpoint",
+    sa.MetaData(),
+    sa.Column("name", sa.String(255), primary_key=True),
+    sa.Column("last_id", sa.String(36), nullable=True),
+    sa.Column("processed", sa.Integer, nullable=False, default=0),
+    sa.Column("errors", sa.Integer, nullable=False, default=0),
+    sa.Column("failed", sa.JSON, nullable=True),
+    sa.Column("done", sa.Boolean, nullable=False, default=False),
+    sa.Column("updated", sa.DateTime, nullable=False),
+)
+"""Checkpoints of the migrations, one row per migration and record class."""
+
+
+def get_checkpoint(name):
+    """Get the checkpoint of a migration, ``None`` if it never ran."""
+    checkpoints_table.create(bind=db.engine, checkfirst=True)
+    row = db.session.execute(
+        sa.select(checkpoints_table).where(checkpoints_table.c.name == name)
+    ).first()
+    return dict(row._mapping) if row else None
+
+
+def save_checkpoint(name, **values):
+    """Save the checkpoint of a migration, in the current transaction."""
+    values["updated"] = datetime.utcnow()
+    updated = db.session.execute(
+        checkpoints_table.update()
+        .where(checkpoints_table.c.name == name)
+        .values(**values)
+    )
+    if not updated.rowcount:
+        db.session.execute(checkpoints_table.insert().values(name=name, **values))
+
+
+def delete_checkpoint(name):
+    """Delete the checkpoint of a migration, so that it starts over."""
+    checkpoints_table.create(bind=db.engine, checkfirst=True)
+    db.session.execute(
+        checkpoints_table.delete().where(checkpoints_table.c.name == name)
+    )
+    db.session.commit()
+
+
+_worker_state = None
+
+
+def _init_worker(app, migration, record_cls, update, resume):
+    """Keep the (forked) application and migration, to run the partitions."""
+    global _worker_state
+    _worker_state = (app, migration, record_cls, update, resume)
+
+
+def _run_partition(partition):
+    """Migrate a partition of the records inside a pool worker."""
+    app, migration, record_cls, update, resume = _worker_state
+    # start from the settings, not the progress, of the forked migration
+    worker_migration = RecordsMigration(
+        migration.name,
+        migration.update,
+        batch_size=migration.batch_size,
+        dry_run=migration.dry_run,
+        verbose=migration.verbose,
+        workers=migration.workers,
+    )
+    with app.app_context():
+        worker_migration._run(record_cls, update, None, resume, partition=partition)
+    return worker_migration.processed, worker_migration.changed, worker_migration.errors
+
+
+class RecordsMigration:
+    """Migration of records (or drafts, communities...) in checkpointed batches.
+
+    :param name: the name of the migration, which identifies its checkpoints.
+    :param update: the function migrating a record, which commits it. Errors
+        it raises are collected and the changes of the record rolled back. It
+        can return a function, called once the batch is committed, for what
+        commits the session itself.
+    :param batch_size: the number of records committed at once.
+    :param dry_run: roll back all the changes and only report the records
+        which would change. The update function must skip the side effects
+        outside of the database (e.g. DOI registrations) and the service
+        calls which commit, as they cannot be rolled back.
+    :param verbose: report each migrated record.
+    :param workers: the number of processes migrating the records, each one
+        a partition of them. A resumed migration must use the same number.
+    """
+
+    def __init__(
+        self,
+        name,
+        update,
+        batch_size=1000,
+        dry_run=False,
+        verbose=False,
+        workers=1,
+    ):
+        """Constructor."""
+        self.name = name
+        self.update = update
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.verbose = verbose
+        self.workers = workers
+        self.processed = 0
+        self.changed = 0
+        self.errors = []
+
+    def checkpoint_name(self, record_cls, partition=None):
+        """Get the name of the checkpoint of a record class (partition)."""
+        name = f"{self.name}:{record_cls.model_cls.__tablename__}"
+        if partition is not None:
+            name += f":{partition}/{self.workers}"
+        return name
+
+    def partition_bounds(self, partition):
+        """Get the ``[lower, upper)`` range of ids of a partition.
+
+        Ids being random UUIDs, the ranges split the UUID space evenly. The
+        upper bound of the last partition is ``None``.
+        """
+        lower = UUID(int=partition * 2**128 // self.workers)
+        if partition == self.workers - 1:
+            return lower, None
+        return lower, UUID(int=(partition + 1) * 2**128 // self.workers)
+
+    def partition_filter(self, record_cls, partition):
+        """Get the filter of the records of a partition.
+
+        Records are partitioned by ranges of their parent id, so that all the
+        versions of a record are in the same partition, or by ranges of their
+        id if they have no parent (e.g. communities).
+        """
+        model_cls = record_cls.model_cls
+        column = getattr(model_cls, "parent_id", model_cls.id)
+        lower, upper = self.partition_bounds(partition)
+        conditions = [column >= lower]
+        if upper is not None:
+            conditions.append(column < upper)
+        in_range = sa.and_(*conditions)
+        if partition == 0:
+            return sa.or_(column.is_(None), in_range)
+        return in_range
+
+    def iter_batches(self, record_cls, after=None, ids=None, partition=None):
+        """Iterate over the records in batches, ordered by id.
+
+        Each batch is queried after the last id of the previous one, which
+        keeps the queries fast however far the migration is.
+        """
+        model_cls = record_cls.model_cls
+        while True:
+            query = model_cls.query.order_by(model_cls.id)
+            if ids is not None:
+                query = query.filter(model_cls.id.in_(ids))
+            if partition is not None:
+                query = query.filter(self.partition_filter(record_cls, partition))
+            if after is not None:
+                query = query.filter(model_cls.id > after)
+            batch = query.limit(self.batch_size).all()
+            if not batch:
+                return
+            # read before the batch is committed and expunged
+            last_id = batch[-1].id
+            yield batch
+            after = last_id
+
+    def add_error(self, id_, error):
+        """Collect the error of a record."""
+        self.errors.append((str(id_), repr(error)))
+        secho(f"> Error {id_}: {repr(error)}", fg="red", err=True)
+
+    def migrate_record(self, record_cls, model, update):
+        """Migrate a single record, in a savepoint.
+
+        :returns: the function to call once the record is committed, if any.
+        """
+        record = record_cls(model.data, model=model)
+        original = deepcopy(model.json) if self.dry_run else None
+        try:
+            with db.session.begin_nested():
+                after_commit = update(record)
+        except Exception as e:
+            self.add_error(model.id, e)
+            return None
+
+        self.processed += 1
+        if self.dry_run and model.json != original:
+            self.changed += 1
+            if self.verbose:
+                secho(f"> Would update: {model.id}", fg="yellow")
+        elif self.verbose:
+            secho(f"> Updated: {model.id}", fg="green")
+        return after_commit if callable(after_commit) else None
+
+    def run_after_commit(self, id_, after_commit):
+        """Call the function returned by the update of a committed record."""
+        try:
+            after_commit()
+        except Exception as e:
+            db.session.rollback()
+            self.add_error(id_, e)
+
+    def run(self, record_cls, update=None, ids=None, resume=True):
+        """Migrate all the records of a record class.
+
+        :param update: the function migrating the records of this class,
+            instead of the one of the migration.
+        :param ids: only migrate the records with these ids (e.g. to retry the
+            failed ones), without checkpoint.
+        :param resume: resume from the last checkpoint, if any.
+        """
+        if self.workers > 1 and ids is None:
+            self._run_parallel(record_cls, update, resume)
+        else:
+            self._run(record_cls, update, ids, resume)
+
+    def _run_parallel(self, record_cls, update, resume):
+        """Migrate the partitions of the records in a pool of processes."""
+        name = self.checkpoint_name(record_cls)
+        # create the checkpoints table once, and do not share the connections
+        get_checkpoint(name)
+        db.session.commit()
+        db.session.remove()
+        db.engine.dispose()
+
+        app = current_app._get_current_object()
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context("fork"),
+            initializer=_init_worker,
+            initargs=(app, self, record_cls, update, resume),
+        ) as executor:
+            futures = {
+                executor.submit(_run_partition, partition): partition
+                for partition in range(self.workers)
+            }
+            for future in as_completed(futures):
+                partition = futures[future]
+                try:
+                    processed, changed, errors = future.result()
+                except Exception as e:
+                    self.errors.append((f"partition {partition}", repr(e)))
+                    secho(
+                        f"> Error in partition {partition}: {e!r}", fg="red", err=True
+                    )
+                    continue
+                self.processed += processed
+                self.changed += changed
+                self.errors.extend(errors)
+                secho(
+                    f"{name}: partition {partition} done, "
+                    f"{self.processed} records processed.",
+                    fg="green",
+                )
+
+    def _run(self, record_cls, update, ids, resume, partition=None):
+        """Migrate the records of a record class, or of one of its partitions."""
+        name = self.checkpoint_name(record_cls, partition=partition)
+        checkpoint = None
+        if ids is None and not self.dry_run:
+            checkpoint = {
+                "last_id": None,
+                "processed": 0,
+                "errors": 0,
+                "failed": [],
+                "done": False,
+            }
+            # also creates the checkpoints table if needed
+            saved = get_checkpoint(name)
+            if not resume:
+                saved = None
+            if saved and saved["done"]:
+                secho(f"{name} already migrated, skipping.", fg="green")
+                return
+            if saved and saved["last_id"]:
+                secho(f"Resuming {name} after {saved['last_id']}.", fg="yellow")
+                checkpoint.update({key: saved[key] for key in checkpoint})
+                checkpoint["failed"] = checkpoint["failed"] or []
+
+        update = update or self.update
+        if checkpoint and checkpoint["failed"]:
+            # the records which failed in the previous runs are retried first
+            failed, checkpoint["failed"] = checkpoint["failed"], []
+            secho(f"{name}: retrying {len(failed)} failed records.", fg="yellow")
+            for batch in self.iter_batches(record_cls, ids=failed):
+                self._migrate_batch(name, record_cls, batch, update, checkpoint)
+
+        after = None
+        if checkpoint and checkpoint["last_id"]:
+            after = UUID(checkpoint["last_id"])
+        batches = self.iter_batches(
+            record_cls, after=after, ids=ids, partition=partition
+        )
+        for batch in batches:
+            if checkpoint is not None:
+                checkpoint["last_id"] = str(batch[-1].id)
+                checkpoint["processed"] += len(batch)
+            self._migrate_batch(name, record_cls, batch, update, checkpoint)
+
+        if checkpoint is not None:
+            # not done while records failed, so that the next run retries them
+            checkpoint["done"] = not checkpoint["failed"]
+            save_checkpoint(name, **checkpoint)
+            db.session.commit()
+
+    def _migrate_batch(self, name, record_cls, batch, update, checkpoint):
+        """Migrate and commit a batch of records, with the checkpoint if any."""
+        errors = len(self.errors)
+        after_commits = []
+        for model in batch:
+            after_commit = self.migrate_record(record_cls, model, update)
+            if after_commit is not None:
+                after_commits.append((model.id, after_commit))
+
+        if self.dry_run:
+            db.session.rollback()
+        else:
+            self._save_failures(name, checkpoint, errors)
+            db.session.commit()
+            errors = len(self.errors)
+            for id_, after_commit in after_commits:
+                self.run_after_commit(id_, after_commit)
+            if len(self.errors) > errors:
+                self._save_failures(name, checkpoint, errors)
+                db.session.commit()
+        # the records of the batch are not needed anymore
+        db.session.expunge_all()
+        secho(f"{name}: {self.processed} records processed.", fg="green")
+
+    def _save_failures(self, name, checkpoint, errors):
+        """Save the checkpoint, with the records failed since ``errors``."""
+        if checkpoint is None:
+            return
+        failed = [id_ for id_, _ in self.errors[errors:]]
+        checkpoint["failed"] = checkpoint["failed"] + failed
+        checkpoint["errors"] = len(checkpoint["failed"])
+        save_checkpoint(name, **checkpoint)
+
+    def report(self):
+        """Report the outcome of the migration, returning if it succeeded."""
+        if self.dry_run:
+            secho(
+                f"Dry run: {self.changed} of {self.processed} records would change.",
+                fg="green",
+            )
+        else:
+            secho(f"{self.processed} records migrated.", fg="green")
+
+        if self.errors:
+            secho(f"{len(self.errors)} records failed to migrate:", fg="red", err=True)
+            for id_, error in self.errors:
+                secho(f"{id_}: {error}", fg="red", err=True)
+            secho(
+                "The other records were migrated. Please fix the above listed "
+                "errors and run the migration again, which retries the failed "
+                "records (or see the ``ids`` argument of ``RecordsMigration.run``).",
+                fg="yellow",
+                err=True,
+            )
+        return not self.errors
@@ -38,24 +38,33 @@ This script has been tested with following data:
   - drafts visible
   - records visible
 """
+
 import sys
+from functools import partial
 
 from click import secho
 from flask import current_app
 from invenio_access.permissions import system_identity
 from invenio_communities.communities.records.api import Community
 from invenio_communities.communities.records.systemfields.access import ReviewPolicyEnum
-from invenio_db import db
 from invenio_rdm_records.fixtures import PrioritizedVocabulariesFixtures
 from invenio_rdm_records.proxies import current_rdm_records
 from invenio_rdm_records.records.api import RDMDraft, RDMRecord
 
+from invenio_app_rdm.upgrade_scripts.engine import RecordsMigration
+
 
-def execute_upgrade():
+def execute_upgrade(dry_run=False, batch_size=1000, workers=1):
     """Execute the upgrade from InvenioRDM 11.0 to 12.0.0.
 
     Please read the disclaimer on this module before thinking about executing
     this function!
+
+    Communities, records and drafts are migrated in batches of ``batch_size``,
+    each committed on its own, by ``workers`` processes, and an interrupted
+    upgrade resumes where it stopped. With ``dry_run``, nothing is committed
+    and the records which would change are reported, without creating nor
+    registering the DOIs of the parents.
     """
 
     def migrate_review_policy(community_record):
@@ -66,8 +75,18 @@ def execute_upgrade():
             "review_policy", ReviewPolicyEnum.CLOSED.value
         )
 
-    def update_parent(record):
-        """Update parent schema and parent communities for older records."""
+    def update_community(community):
+        # production data could have problems without it
+        if community:
+            migrate_review_policy(community)
+            community.commit()
+
+    def update_parent(record, dry_run=False):
+        """Update parent schema and parent communities for older records.
+
+        :returns: the registration of the new parent DOI, if any, to call once
+            the record is committed (it commits the session itself).
+        """
         new_parent_schema = "local://records/parent-v3.0.0.json"
         record.parent["$schema"] = new_parent_schema
 
@@ -83,7 +102,9 @@ def execute_upgrade():
             record.parent["pids"] = {}
 
             if (
-                current_app.config["DATACITE_ENABLED"]
+                # the registration commits, and cannot be rolled back
+                not dry_run
+                and current_app.config["DATACITE_ENABLED"]
                 and "doi" in current_app.config["RDM_PARENT_PERSISTENT_IDENTIFIERS"]
                 and current_app.config["RDM_PARENT_PERSISTENT_IDENTIFIERS"]["doi"][
                     "is_enabled"
@@ -97,11 +118,12 @@ def execute_upgrade():
                 )
                 record.parent["pids"] = pids
                 # Have to commit here otherwise register_or_update won't get
-                # the above data
+                # the above data, once the batch of records is committed
                 record.parent.commit()
 
                 if isinstance(record, RDMRecord):
-                    current_rdm_records.records_service.pids.register_or_update(
+                    return partial(
+                        current_rdm_records.records_service.pids.register_or_update,
                         id_=record["id"],
                         identity=system_identity,
                         scheme="doi",
@@ -109,98 +131,57 @@ def execute_upgrade():
                     )
         # Catch all commit for the parent
         record.parent.commit()
+        return None
 
-    def update_record(record):
+    def update_record(record, dry_run=False):
         # skipping deleted records because can't be committed
         if record.is_deleted:
             return
 
-        try:
-            secho(f"Updating record : {record.pid.pid_value}", fg="yellow")
-
-            # otherwise the save would not work, due to new attributes
-            # (media_files, parent_doi) used
-            record["$schema"] = "local://records/record-v6.0.0.json"
+        # otherwise the save would not work, due to new attributes
+        # (media_files, parent_doi) used
+        record["$schema"] = "local://records/record-v6.0.0.json"
 
-            # Initialize media files as disabled if not any
-            record.setdefault("media_files", {"enabled": False})
-            if record.media_files.bucket is None:
-                record.media_files.create_bucket()
+        # Initialize media files as disabled if not any
+        record.setdefault("media_files", {"enabled": False})
+        if record.media_files.bucket is None:
+            record.media_files.create_bucket()
 
-            update_parent(record)
+        register_parent_doi = update_parent(record, dry_run=dry_run)
 
-            record.commit()
-
-            secho(f"> Updated parent: {record.parent.pid.pid_value}", fg="green")
-            secho(f"> Updated record: {record.pid.pid_value}\n", fg="green")
-            return None
-        except Exception as e:
-            secho(f"> Error {repr(e)}", fg="red")
-            error = f"Record {record.pid.pid_value} failed to update"
-            return error
+        record.commit()
+        return register_parent_doi
 
     secho("Starting data migration...", fg="green")
 
     # upgrading vocabularies
-    pvf = PrioritizedVocabulariesFixtures(system_identity)
-    pvf.load()
+    if not dry_run:
+        pvf = PrioritizedVocabulariesFixtures(system_identity)
+        pvf.load()
+
+    migration = RecordsMigration(
+        "11.0-to-12.0",
+        partial(update_record, dry_run=dry_run),
+        batch_size=batch_size,
+        dry_run=dry_run,
+        workers=workers,
+    )
 
     # Migrating communities
-    communities = Community.model_cls.query.all()
-
-    for community_data in communities:
-        community = Community(community_data.data, model=community_data)
-
-        # production data could have problems without it
-        if community:
-            migrate_review_policy(community)
-            community.commit()
+    migration.run(Community, update=update_community)
 
     # Migrating records and drafts
-    errors = []
-    for record_metadata in RDMRecord.model_cls.query.all():
-        record = RDMRecord(record_metadata.data, model=record_metadata)
-        error = update_record(record)
-
-        if error:
-            errors.append(error)
-
-    for draft_metadata in RDMDraft.model_cls.query.all():
-        draft = RDMDraft(draft_metadata.data, model=draft_metadata)
-        error = update_record(draft)
-        if error:
-            errors.append(error)
+    migration.run(RDMRecord)
+    migration.run(RDMDraft)
 
-    success = not errors
-
-    if success:
-        secho("Commiting to DB", nl=True)
-        db.session.commit()
+    if not migration.report():
+        sys.exit(1)
+    if not dry_run:
         secho(
             "Data migration completed, please rebuild the search indices now.",
             fg="green",
         )
 
-    else:
-        secho("Rollback", nl=True)
-        db.session.rollback()
-        secho(
-            "Upgrade aborted due to the following errors:",
-            fg="red",
-            err=True,
-        )
-
-        for error in errors:
-            secho(error, fg="red", err=True)
-
-        msg = (
-            "The changes have been rolled back. "
-            "Please fix the above listed errors and try the upgrade again",
-        )
-        secho(msg, fg="yellow", err=True)
-
-        sys.exit(1)
-
 
 # if the script is executed on its own, perform the upgrade
 if __name__ == "__main__":
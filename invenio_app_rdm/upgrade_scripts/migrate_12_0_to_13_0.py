@@ -23,16 +23,22 @@ This script has been tested with following data:
 import sys
 
 from click import secho
-from invenio_db import db
 from invenio_rdm_records.records.api import RDMDraft, RDMRecord
 
+from invenio_app_rdm.upgrade_scripts.engine import RecordsMigration
 
-def execute_upgrade():
+
+def execute_upgrade(dry_run=False, batch_size=1000, workers=1):
     """Execute the upgrade from InvenioRDM 12.0 to 13.0.0.
 
     Please read the disclaimer on this module before thinking about executing
     this function!
     THIS MODULE IS WORK IN PROGRESS, UNTIL official v13 release
+
+    Records are migrated in batches of ``batch_size``, each committed on its
+    own, by ``workers`` processes, and an interrupted upgrade resumes where it
+    stopped. With ``dry_run``, nothing is committed and the records which
+    would change are reported.
     """
 
     def update_record(record):
@@ -40,67 +46,30 @@ def execute_upgrade():
         if record.is_deleted:
             return
 
-        try:
-            secho(f"Updating record : {record.pid.pid_value}", fg="yellow")
-
-            # TODO: Add any record datamodel migration code here
-            record.commit()
-
-            secho(f"> Updated parent: {record.parent.pid.pid_value}", fg="green")
-            secho(f"> Updated record: {record.pid.pid_value}\n", fg="green")
-            return None
-        except Exception as e:
-            secho(f"> Error {repr(e)}", fg="red")
-            error = f"Record {record.pid.pid_value} failed to update"
-            return error
+        # TODO: Add any record datamodel migration code here
+        record.commit()
 
     secho("Starting data migration...", fg="green")
 
     # Migrating records and drafts
-    errors = []
-    for record_metadata in RDMRecord.model_cls.query.all():
-        record = RDMRecord(record_metadata.data, model=record_metadata)
-        error = update_record(record)
-
-        if error:
-            errors.append(error)
-
-    for draft_metadata in RDMDraft.model_cls.query.all():
-        draft = RDMDraft(draft_metadata.data, model=draft_metadata)
-        error = update_record(draft)
-        if error:
-            errors.append(error)
-
-    success = not errors
-
-    if success:
-        secho("Commiting to DB", nl=True)
-        db.session.commit()
+    migration = RecordsMigration(
+        "12.0-to-13.0",
+        update_record,
+        batch_size=batch_size,
+        dry_run=dry_run,
+        workers=workers,
+    )
+    migration.run(RDMRecord)
+    migration.run(RDMDraft)
+
+    if not migration.report():
+        sys.exit(1)
+    if not dry_run:
         secho(
             "Data migration completed, please rebuild the search indices now.",
             fg="green",
         )
 
-    else:
-        secho("Rollback", nl=True)
-        db.session.rollback()
-        secho(
-            "Upgrade aborted due to the following errors:",
-            fg="red",
-            err=True,
-        )
-
-        for error in errors:
-            secho(error, fg="red", err=True)
-
-        msg = (
-            "The changes have been rolled back. "
-            "Please fix the above listed errors and try the upgrade again",
-        )
-        secho(msg, fg="yellow", err=True)
-
-        sys.exit(1)
-
 
 # if the script is executed on its own, perform the upgrade
 if __name__ == "__main__":
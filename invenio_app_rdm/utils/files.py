@@ -9,12 +9,17 @@
 
 from __future__ import absolute_import, print_function
 
+import csv
+import time
 from datetime import datetime
+from io import StringIO
+from itertools import islice
 
 import sqlalchemy as sa
 from flask import current_app
 from flask_mail import Message
-from invenio_files_rest.models import FileInstance
+from invenio_db import db
+from invenio_files_rest.models import FileInstance, ObjectVersion
 from invenio_rdm_records.records.models import RDMDraftMetadata, RDMRecordMetadata
 from pytz import utc
 
@@ -32,36 +37,102 @@ def checksum_verification_files_query():
     return files
 
 
+def verify_files_checksums(file_ids, deadline=None):
+    """Verify the checksums of files, committing once for all of them.
+
+    Files which are not verified before the ``deadline`` (a
+    ``time.monotonic()`` value) are left untouched.
+
+    :returns: the number of verified files and their total size.
+    """
+    checked = checked_bytes = 0
+    if deadline is not None and time.monotonic() > deadline:
+        return checked, checked_bytes
+
+    files = FileInstance.query.filter(FileInstance.id.in_(file_ids)).all()
+    for f in files:
+        if deadline is not None and time.monotonic() > deadline:
+            break
+        try:
+            f.verify_checksum(throws=False)
+        except Exception:
+            pass  # Don't fail the other files in case of some file error
+        checked += 1
+        checked_bytes += f.size or 0
+    db.session.commit()
+    return checked, checked_bytes
+
+
 def render_email_from_context(template, context):
-    """Renders a template using a provided context."""
+    """Renders a template using a provided context.
+
+    The template is rendered as a stream, so that the iterables of the context
+    are only consumed while rendering it.
+    """
     template = current_app.jinja_env.get_or_select_template(template)
-    return template.render(context)
+    return "".join(template.generate(context))
+
+
+def _iter_batches(files, batch_size):
+    """Iterate over the files in lists of at most ``batch_size`` files."""
+    if hasattr(files, "yield_per"):
+        files = files.yield_per(batch_size)
+    files = iter(files)
+    batch = list(islice(files, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(files, batch_size))
+
+
+def _get_buckets_owners(model, bucket_ids):
+    """Map bucket ids to the (non-deleted) drafts or records owning them.
+
+    Only the ids of the drafts or records are read, not their whole JSON.
+    """
+    pid = model.json["id"].as_string()
+    rows = db.session.query(model.bucket_id, pid).filter(
+        model.bucket_id.in_(bucket_ids), pid.is_not(None)
+    )
+    return {bucket_id: {"id": id_} for bucket_id, id_ in rows}
 
 
-def generate_integrity_report_entries(files):
-    """Generates the report entries."""
-    entries = []
-    for file in files:
-        entry = _generate_report_entry(file)
-        entries.append(entry)
-    return entries
+def iter_integrity_report_entries(files, batch_size=None):
+    """Generate the report entries, looking up the files in batches.
 
+    The object versions, drafts and records of each batch of files are read
+    with one query each, so that the number of queries does not grow with the
+    number of files.
+    """
+    batch_size = batch_size or current_app.config.get(
+        "APP_RDM_FILES_INTEGRITY_REPORT_BATCH_SIZE", 1000
+    )
+    for batch in _iter_batches(files, batch_size):
+        objects = (
+            ObjectVersion.query.with_entities(
+                ObjectVersion.file_id, ObjectVersion.key, ObjectVersion.bucket_id
+            )
+            .filter(ObjectVersion.file_id.in_([f.id for f in batch]))
+            .order_by(ObjectVersion.created)
+            .all()
+        )
+        bucket_ids = {o.bucket_id for o in objects}
+        drafts = _get_buckets_owners(RDMDraftMetadata, bucket_ids)
+        records = _get_buckets_owners(RDMRecordMetadata, bucket_ids)
 
-def _generate_report_entry(file):
-    """Generates a single report for a file."""
-    entry = {"file": file}
-    for o in file.objects:
-        entry["filename"] = o.key
+        objects_by_file = {}
+        for o in objects:
+            objects_by_file.setdefault(o.file_id, []).append(o)
 
-        # Find records/drafts for the files
-        draft = get_draft_from_bucket(o.bucket_id)
-        if draft and draft.json:
-            entry["draft"] = draft.json
-        else:
-            record = get_record_from_bucket(o.bucket_id)
-            if record and record.json:
-                entry["record"] = record.json
-    return entry
+        for file in batch:
+            entry = {"file": file}
+            for o in objects_by_file.get(file.id, []):
+                entry["filename"] = o.key
+                # Find records/drafts for the files
+                if o.bucket_id in drafts:
+                    entry["draft"] = drafts[o.bucket_id]
+                elif o.bucket_id in records:
+                    entry["record"] = records[o.bucket_id]
+            yield entry
 
 
 def get_record_from_bucket(bucket_id):
@@ -90,24 +161,91 @@ def get_report_template():
     return tpl
 
 
-def render_report_email(files):
-    """Renders the report e-mail from a list of files."""
-    entries = generate_integrity_report_entries(files)
-    tpl = get_report_template()
-    context = {"entries": entries}
-    return render_email_from_context(tpl, context)
+def _count_files(files):
+    """Count the files of a list or a query."""
+    if isinstance(files, (list, tuple)):
+        return len(files)
+    return files.count()
+
+
+_report_csv_header = [
+    "id",
+    "uri",
+    "filename",
+    "created",
+    "checksum",
+    "last_check_at",
+    "last_check",
+    "record",
+    "draft",
+]
+
+
+def _report_csv_row(entry, base_url):
+    """Get the CSV row of a report entry."""
+    file = entry["file"]
+    record, draft = entry.get("record"), entry.get("draft")
+    return [
+        file.id,
+        file.uri,
+        entry.get("filename", ""),
+        file.created,
+        file.checksum,
+        file.last_check_at,
+        file.last_check,
+        f"{base_url}/records/{record['id']}" if record else "",
+        f"{base_url}/uploads/{draft['id']}" if draft else "",
+    ]
+
+
+def render_report_email(files, total=None, attachment=None):
+    """Renders the report e-mail from a list (or query) of files.
+
+    The entries are generated while the template is rendered. With an
+    ``attachment`` file, all the entries are written to it as CSV and only
+    the first ``APP_RDM_FILES_INTEGRITY_REPORT_ATTACHMENT_THRESHOLD`` ones are
+    rendered in the e-mail.
+    """
+    entries = iter_integrity_report_entries(files)
+    context = {"total": total, "attachment": attachment is not None}
+    if attachment is not None:
+        base_url = current_app.config.get("SITE_UI_URL", "")
+        limit = current_app.config[
+            "APP_RDM_FILES_INTEGRITY_REPORT_ATTACHMENT_THRESHOLD"
+        ]
+        writer = csv.writer(attachment)
+        writer.writerow(_report_csv_header)
+        first_entries = []
+        for entry in entries:
+            writer.writerow(_report_csv_row(entry, base_url))
+            if len(first_entries) < limit:
+                first_entries.append(entry)
+        entries = first_entries
+
+    context["entries"] = entries
+    return render_email_from_context(get_report_template(), context)
 
 
 def send_integrity_report_email(files):
     """Sends an e-mail with a report on the provided files.
 
+    Reports of more than ``APP_RDM_FILES_INTEGRITY_REPORT_ATTACHMENT_THRESHOLD``
+    files are also attached as CSV.
+
     APP configs ('MAIL_DEFAULT_SENDER', 'APP_RDM_ADMIN_EMAIL_RECIPIENT') must be set.
     Oherwise a warning is logged.
     """
     try:
-        if files:
+        total = _count_files(files)
+        if total:
             subject = get_report_subject()
-            body = render_report_email(files)
+            threshold = current_app.config[
+                "APP_RDM_FILES_INTEGRITY_REPORT_ATTACHMENT_THRESHOLD"
+            ]
+            attachment = None
+            if threshold is not None and total > threshold:
+                attachment = StringIO()
+            body = render_report_email(files, total=total, attachment=attachment)
             sender = current_app.config["MAIL_DEFAULT_SENDER"]
             admin_email = current_app.config["APP_RDM_ADMIN_EMAIL_RECIPIENT"]
             recipients = admin_email
@@ -115,6 +253,12 @@ def send_integrity_report_email(files):
                 recipients = [admin_email]
             mail_ext = current_app.extensions["mail"]
             msg = Message(subject, sender=sender, recipients=recipients, body=body)
+            if attachment is not None:
+                msg.attach(
+                    "files_integrity_report.csv",
+                    "text/csv",
+                    attachment.getvalue().encode("utf-8"),
+                )
             mail_ext.send(msg)
     except Exception as e:
         current_app.logger.error("Integrity report not sent. Error: {}".format(str(e)))
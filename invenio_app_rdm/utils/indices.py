@@ -0,0 +1,657 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Direct, throttled and resumable rebuild of the search indices.
+
+The indices are either rebuilt in place (``IndexRebuild``), or in new indices
+which replace the live ones once loaded (``IndexSwap``), without downtime.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from threading import Lock
+from uuid import UUID
+
+import sqlalchemy as sa
+from click import secho
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_db import db
+from invenio_records.api import Record
+from invenio_search.engine import search
+from invenio_search.proxies import current_search
+from invenio_search.utils import build_alias_name, build_index_name
+
+from ..upgrade_scripts.engine import (
+    checkpoints_table,
+    delete_checkpoint,
+    get_checkpoint,
+    save_checkpoint,
+)
+
+
+class RateLimiter:
+    """Limit the number of documents indexed per second, across threads."""
+
+    def __init__(self, rate=None):
+        """Constructor."""
+        self.rate = rate
+        self._lock = Lock()
+        self._next = time.monotonic()
+
+    def wait(self, count):
+        """Wait until ``count`` documents can be indexed."""
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + count / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+def get_reindex_targets(service):
+    """Get the (record class, indexer) pairs a service indexes.
+
+    Only services of records stored in the database are supported (i.e.
+    records, drafts, communities, requests, vocabularies), others are
+    reindexed through their own ``rebuild_index``.
+    """
+    record_cls = getattr(service, "record_cls", None)
+    indexer = getattr(service, "indexer", None)
+    if (
+        not isinstance(record_cls, type)
+        or not issubclass(record_cls, Record)
+        or record_cls.model_cls is None
+        or indexer is None
+    ):
+        return []
+
+    targets = [(record_cls, indexer)]
+    draft_cls = getattr(service, "draft_cls", None)
+    draft_indexer = getattr(service, "draft_indexer", None)
+    if draft_cls is not None and draft_indexer is not None:
+        targets.append((draft_cls, draft_indexer))
+    return targets
+
+
+def _index_actions(indexer, ids, failures, index=None):
+    """Build the bulk actions indexing the records, collecting the failures."""
+    for id_ in ids:
+        try:
+            action = indexer._index_action({"id": str(id_), "op": "index"})
+        except Exception as e:
+            failures.append((str(id_), repr(e)))
+            continue
+        if index is not None:
+            action["_index"] = index
+        yield action
+
+
+def _format_progress(name, indexed, total, started, initial):
+    """Format the progress of a reindex, with its rate and ETA."""
+    elapsed = time.monotonic() - started
+    rate = (indexed - initial) / elapsed if elapsed else 0
+    percent = indexed * 100 // total if total else 100
+    eta = timedelta(seconds=int((total - indexed) / rate)) if rate else "-"
+    return f"{name}: {indexed}/{total} ({percent}%), {rate:.0f} docs/s, ETA {eta}"
+
+
+def _filter_records(query, model_cls, since=None, ids=None, until=None):
+    """Filter a query of records by update date and ids."""
+    if since is not None:
+        query = query.filter(model_cls.updated >= since)
+    if until is not None:
+        query = query.filter(model_cls.updated < until)
+    if ids is not None:
+        query = query.filter(model_cls.id.in_(ids))
+    return query
+
+
+class IndexRebuild:
+    """Rebuild of the index of a record class, indexing the records directly.
+
+    Records are read by chunks of ids (in id order) and sent to the search
+    cluster with the bulk API, at most ``limiter.rate`` documents per second.
+    A checkpoint is saved after each chunk, so that a failed rebuild resumes
+    after the last indexed record. It is deleted once the rebuild is over.
+
+    :param index: the index to write to, instead of the write alias of the
+        record class (e.g. a new index, before it replaces the live one).
+    :param since: only index the records updated since this (UTC) datetime,
+        and delete the documents of the records deleted since then.
+    :param ids: only index the records with these ids, and delete the
+        documents of the deleted ones.
+    :param until: only index the records updated before this (UTC) datetime.
+    :param checkpoint: save checkpoints, to resume a failed rebuild.
+    :param keep_checkpoint: keep the checkpoint once the rebuild is over,
+        marked as done, instead of deleting it.
+    """
+
+    progress_interval = 10
+    """Minimum number of seconds between two progress reports."""
+
+    def __init__(
+        self,
+        name,
+        record_cls,
+        indexer,
+        chunk_size=500,
+        limiter=None,
+        index=None,
+        since=None,
+        ids=None,
+        until=None,
+        checkpoint=True,
+        keep_checkpoint=False,
+    ):
+        """Constructor."""
+        self.name = name
+        self.record_cls = record_cls
+        self.indexer = indexer
+        self.chunk_size = chunk_size
+        self.limiter = limiter or RateLimiter()
+        self.index = index
+        self.since = since
+        self.ids = ids
+        self.until = until
+        self.checkpoint = checkpoint
+        self.keep_checkpoint = keep_checkpoint
+        self.indexed = 0
+        self.failures = []
+
+    @property
+    def checkpoint_name(self):
+        """Name of the checkpoint of the rebuild."""
+        name = f"reindex:{self.name}:{self.record_cls.model_cls.__tablename__}"
+        if self.index is not None:
+            name += f":{self.index}"
+        return name
+
+    @property
+    def partial(self):
+        """Whether only some of the records are (re)indexed."""
+        return any(v is not None for v in (self.since, self.ids, self.until))
+
+    def query(self):
+        """Query the ids of the records to index."""
+        model_cls = self.record_cls.model_cls
+        query = db.session.query(model_cls.id)
+        if hasattr(model_cls, "is_deleted"):
+            query = query.filter(model_cls.is_deleted.is_(False))
+        return _filter_records(query, model_cls, self.since, self.ids, self.until)
+
+    def removed_query(self):
+        """Query the ids of the (soft) deleted records, to delete from the index.
+
+        Only for partial reindexes, a full one indexes in a new index or
+        leaves the documents of the deleted records untouched.
+        """
+        model_cls = self.record_cls.model_cls
+        if not self.partial or not hasattr(model_cls, "is_deleted"):
+            return None
+        query = db.session.query(model_cls.id)
+        query = query.filter(model_cls.is_deleted.is_(True))
+        return _filter_records(query, model_cls, self.since, self.ids, self.until)
+
+    def bulk_index(self, ids):
+        """Index the records with the bulk API, returning the number of failures."""
+        failures = []
+        _, failed = search.helpers.bulk(
+            self.indexer.client,
+            _index_actions(self.indexer, ids, failures, index=self.index),
+            chunk_size=self.chunk_size,
+            stats_only=True,
+            raise_on_error=False,
+        )
+        self.failures.extend(failures)
+        return failed + len(failures)
+
+    def delete_removed(self):
+        """Delete the documents of the (soft) deleted records."""
+        ids = self.removed_query()
+        if ids is None:
+            return
+        index = self.index or build_alias_name(self.record_cls.index._name)
+        # the documents which were never indexed are missing, as expected
+        search.helpers.bulk(
+            self.indexer.client,
+            (
+                {"_op_type": "delete", "_index": index, "_id": str(row.id)}
+                for row in ids.yield_per(self.chunk_size)
+            ),
+            chunk_size=self.chunk_size,
+            raise_on_error=False,
+        )
+
+    def queue(self):
+        """Send the records to the indexing queue, instead of indexing them.
+
+        :returns: the number of queued records.
+        """
+        queued = self.query().count()
+        self.indexer.bulk_index(row.id for row in self.query().yield_per(1000))
+        removed = self.removed_query()
+        if removed is not None:
+            self.indexer.bulk_delete(row.id for row in removed.yield_per(1000))
+        return queued
+
+    def run(self, resume=True):
+        """Index all the records, resuming from the checkpoint if any."""
+        model_cls = self.record_cls.model_cls
+        saved = None
+        if self.checkpoint and resume:
+            saved = get_checkpoint(self.checkpoint_name)
+        after = UUID(saved["last_id"]) if saved and saved["last_id"] else None
+        self.indexed = saved["processed"] if saved else 0
+        errors = saved["errors"] if saved else 0
+        if after is not None:
+            secho(f"{self.name}: resuming after {after}.", fg="yellow")
+
+        total = self.query().count()
+        started = reported = time.monotonic()
+        initial = self.indexed
+        while True:
+            query = self.query().order_by(model_cls.id)
+            if after is not None:
+                query = query.filter(model_cls.id > after)
+            ids = [row.id for row in query.limit(self.chunk_size)]
+            if not ids:
+                break
+
+            self.limiter.wait(len(ids))
+            errors += self.bulk_index(ids)
+            after = ids[-1]
+            self.indexed += len(ids)
+
+            if self.checkpoint:
+                save_checkpoint(
+                    self.checkpoint_name,
+                    last_id=str(after),
+                    processed=self.indexed,
+                    errors=errors,
+                    done=False,
+                )
+            db.session.commit()
+            # the indexed records are not needed anymore
+            db.session.expunge_all()
+
+            if time.monotonic() - reported >= self.progress_interval:
+                reported = time.monotonic()
+                secho(
+                    _format_progress(self.name, self.indexed, total, started, initial)
+                )
+
+        self.delete_removed()
+        if self.checkpoint and self.keep_checkpoint:
+            save_checkpoint(
+                self.checkpoint_name,
+                last_id=str(after) if after else None,
+                processed=self.indexed,
+                errors=errors,
+                done=True,
+            )
+            db.session.commit()
+        elif self.checkpoint:
+            delete_checkpoint(self.checkpoint_name)
+        secho(
+            f"{self.name}: {self.indexed} documents indexed, {errors} failed.",
+            fg="green" if not errors else "yellow",
+        )
+        return errors
+
+
+class IndexSwap:
+    """Blue/green rebuild of the index of a record class.
+
+    The records are bulk-loaded into a new index, with the refresh disabled
+    and no replicas, while the searches and the writes keep using the live
+    index. The records updated in the meantime are indexed again, the
+    settings of the live index are restored on the new one and, if it has as
+    many documents as the database, the aliases of the live index are moved
+    to it in a single request. The old index is kept, to roll back.
+
+    The checkpoint of the load is kept until the swap, so that a failed
+    rebuild resumes with the same new index, instead of loading another one.
+    """
+
+    def __init__(self, name, record_cls, indexer, chunk_size=500, limiter=None):
+        """Constructor."""
+        self.name = name
+        self.record_cls = record_cls
+        self.indexer = indexer
+        self.chunk_size = chunk_size
+        self.limiter = limiter
+
+    @property
+    def client(self):
+        """Search cluster client."""
+        return self.indexer.client
+
+    @property
+    def index_name(self):
+        """Name of the index of the record class, without prefix nor suffix."""
+        return self.record_cls.index._name
+
+    def rebuild(self, **kwargs):
+        """Get a rebuild of the records of the record class."""
+        return IndexRebuild(
+            self.name,
+            self.record_cls,
+            self.indexer,
+            chunk_size=self.chunk_size,
+            limiter=self.limiter,
+            **kwargs,
+        )
+
+    def live_indices(self):
+        """Get the indices behind the write alias, with their aliases."""
+        alias = build_alias_name(self.index_name)
+        if not self.client.indices.exists_alias(name=alias):
+            raise RuntimeError(f"{alias} is not an alias, its index cannot be swapped.")
+        return self.client.indices.get_alias(index=alias)
+
+    def pending_index(self):
+        """Get the new index of an interrupted rebuild, if it still exists."""
+        prefix = self.rebuild(index="").checkpoint_name
+        row = db.session.execute(
+            sa.select(checkpoints_table.c.name).where(
+                checkpoints_table.c.name.startswith(prefix, autoescape=True)
+            )
+        ).first()
+        if row is None:
+            return None
+        index = row.name[len(prefix) :]
+        return index if self.client.indices.exists(index=index) else None
+
+    def create_index(self):
+        """Create the new index, without refresh nor replicas."""
+        index = build_index_name(self.index_name)
+        with open(current_search.mappings[self.index_name]) as f:
+            body = json.load(f)
+        settings = body.setdefault("settings", {}).setdefault("index", {})
+        settings.update({"refresh_interval": "-1", "number_of_replicas": 0})
+        self.client.indices.create(index=index, body=body)
+        return index
+
+    def created(self, index):
+        """Get when an index was created, as a (UTC) datetime."""
+        settings = self.client.indices.get_settings(index=index)
+        created = int(settings[index]["settings"]["index"]["creation_date"])
+        return datetime.utcfromtimestamp(created / 1000)
+
+    def restore_settings(self, index, live_index):
+        """Restore the refresh interval and replicas of the live index."""
+        settings = self.client.indices.get_settings(index=live_index)
+        settings = settings[live_index]["settings"]["index"]
+        self.client.indices.put_settings(
+            index=index,
+            body={
+                "index": {
+                    # ``None`` restores the default
+                    "refresh_interval": settings.get("refresh_interval"),
+                    "number_of_replicas": settings.get("number_of_replicas"),
+                }
+            },
+        )
+        self.client.indices.refresh(index=index)
+
+    def count_documents(self, index, until):
+        """Count the documents of the records created before a (UTC) datetime."""
+        query = {"range": {"created": {"lt": until.isoformat()}}}
+        return self.client.count(index=index, body={"query": query})["count"]
+
+    def count_records(self, until):
+        """Count the records created before a (UTC) datetime, as of then.
+
+        The records deleted since are counted as well, as their documents are
+        only deleted from the new index by the catch-up after the swap.
+        """
+        model_cls = self.record_cls.model_cls
+        query = db.session.query(model_cls.id).filter(model_cls.created < until)
+        if hasattr(model_cls, "is_deleted"):
+            query = query.filter(
+                sa.or_(
+                    model_cls.is_deleted.is_(False),
+                    model_cls.updated >= until,
+                )
+            )
+        return query.count()
+
+    def swap(self, index, live_indices):
+        """Move the aliases of the live indices to the new index, atomically."""
+        actions = []
+        for live_index, value in live_indices.items():
+            for alias in value["aliases"]:
+                actions.append({"remove": {"index": live_index, "alias": alias}})
+                actions.append({"add": {"index": index, "alias": alias}})
+        self.client.indices.update_aliases(body={"actions": actions})
+
+    def run(self, resume=True):
+        """Rebuild the index in a new index, then swap them.
+
+        :returns: the name of the new index.
+        :raises RuntimeError: if the new index is missing documents, in which
+            case the live index is left untouched and a rerun resumes with the
+            new index.
+        """
+        live_indices = self.live_indices()
+        index = self.pending_index() if resume else None
+        if index is None:
+            index = self.create_index()
+        secho(f"{self.name}: loading {index}.", fg="yellow")
+
+        load = self.rebuild(index=index, keep_checkpoint=True)
+        load.run(resume=resume)
+        # the records updated during the load may be stale in the new index,
+        # the ones updated from now on are left to the catch-up after the swap
+        caught_up = datetime.utcnow()
+        self.rebuild(
+            index=index, since=self.created(index), until=caught_up, checkpoint=False
+        ).run()
+        self.restore_settings(index, next(iter(live_indices)))
+
+        # the records created or deleted since do not change the counts
+        indexed = self.count_documents(index, caught_up)
+        expected = self.count_records(caught_up)
+        if indexed != expected:
+            raise RuntimeError(
+                f"{index} has {indexed} documents instead of {expected}, "
+                "the live index was not swapped."
+            )
+
+        self.swap(index, live_indices)
+        delete_checkpoint(load.checkpoint_name)
+        # and the records updated during the catch-up, now through the aliases
+        self.rebuild(since=caught_up, checkpoint=False).run()
+        secho(
+            f"{self.name}: swapped {index} for {', '.join(live_indices)}, which "
+            "can be deleted once the new index is validated.",
+            fg="green",
+        )
+        return index
+
+
+def rebuild_service_index(
+    app,
+    name,
+    service,
+    chunk_size=500,
+    limiter=None,
+    resume=True,
+    swap=False,
+    since=None,
+    ids=None,
+):
+    """Rebuild the index of a service, in its own application context.
+
+    :param swap: rebuild the indices in new indices, swapped for the live
+        ones once loaded (see ``IndexSwap``).
+    :param since: only reindex the records updated since this (UTC) datetime.
+    :param ids: only reindex the records with these ids.
+    :returns: the number of documents which failed to be indexed.
+    :raises NotImplementedError: if the service does not use the search cluster.
+    """
+    if not hasattr(service, "rebuild_index"):
+        raise NotImplementedError()
+
+    with app.app_context():
+        targets = get_reindex_targets(service)
+        partial = since is not None or ids is not None
+        if not targets and partial:
+            secho(f"{name}: cannot be reindexed partially, skipping.", fg="yellow")
+            return 0
+        if not targets:
+            if swap:
+                secho(f"{name}: cannot be swapped, reindexing in place.", fg="yellow")
+            service.rebuild_index(system_identity)
+            return 0
+
+        errors = 0
+        for record_cls, indexer in targets:
+            if swap:
+                # a new index missing documents is not swapped, but raises
+                IndexSwap(
+                    name, record_cls, indexer, chunk_size=chunk_size, limiter=limiter
+                ).run(resume=resume)
+                continue
+            rebuild = IndexRebuild(
+                name,
+                record_cls,
+                indexer,
+                chunk_size=chunk_size,
+                limiter=limiter,
+                since=since,
+                ids=ids,
+                # partial reindexes are short, and differ from run to run
+                checkpoint=not partial,
+            )
+            errors += rebuild.run(resume=resume)
+        return errors
+
+
+def queue_service_index(name, service, since=None, ids=None):
+    """Send the records of a service updated since a date, or by id, to the queue.
+
+    :returns: the number of queued records.
+    :raises NotImplementedError: if the records of the service cannot be
+        selected (e.g. it does not use the search cluster).
+    """
+    targets = get_reindex_targets(service)
+    if not targets:
+        raise NotImplementedError()
+
+    queued = 0
+    for record_cls, indexer in targets:
+        rebuild = IndexRebuild(name, record_cls, indexer, since=since, ids=ids)
+        queued += rebuild.queue()
+    return queued
+
+
+def iter_index_drift(record_cls, indexer, chunk_size=500, since=None, ids=None):
+    """Iterate over the records whose document is missing, stale or deleted.
+
+    Documents are indexed with the revision of their record as (external)
+    version, so a document whose version differs from the revision in the
+    database is stale. Only the records of the database are checked, not the
+    documents without record.
+
+    :returns: an iterator of ``(id, reason)`` tuples.
+    """
+    model_cls = record_cls.model_cls
+    alias = build_alias_name(record_cls.index._name)
+    has_deleted = hasattr(model_cls, "is_deleted")
+    columns = [model_cls.id, model_cls.version_id]
+    if has_deleted:
+        columns.append(model_cls.is_deleted)
+    query = db.session.query(*columns).order_by(model_cls.id)
+    query = _filter_records(query, model_cls, since, ids)
+
+    after = None
+    while True:
+        chunk = query
+        if after is not None:
+            chunk = chunk.filter(model_cls.id > after)
+        rows = chunk.limit(chunk_size).all()
+        if not rows:
+            return
+        after = rows[-1].id
+
+        docs = indexer.client.mget(
+            index=alias, body={"ids": [str(row.id) for row in rows]}, _source=False
+        )["docs"]
+        for row, doc in zip(rows, docs):
+            # see ``Record.revision_id``
+            revision_id = row.version_id - 1
+            if has_deleted and row.is_deleted:
+                if doc.get("found"):
+                    yield str(row.id), "deleted"
+            elif not doc.get("found"):
+                yield str(row.id), "missing"
+            elif doc["_version"] != revision_id:
+                yield str(row.id), f"version {doc['_version']} != {revision_id}"
+
+
+def rebuild_indices(
+    services,
+    workers=1,
+    chunk_size=500,
+    max_rate=None,
+    resume=True,
+    swap=False,
+    since=None,
+    ids=None,
+):
+    """Rebuild the indices of services, ``workers`` services at a time.
+
+    :param services: the services to reindex, by name.
+    :param max_rate: the maximum number of documents indexed per second, by
+        all the services together.
+    :param resume: resume the rebuilds from their last checkpoint, if any.
+    :param swap: rebuild the indices without downtime, see ``IndexSwap``.
+    :param since: only reindex the records updated since this (UTC) datetime.
+    :param ids: only reindex the records with these ids.
+    :returns: the number of failed documents by service name, ``None`` for
+        the services which do not use the search cluster and the exception
+        for the services whose rebuild failed.
+    """
+    # create the checkpoints table once, before the threads use it
+    checkpoints_table.create(bind=db.engine, checkfirst=True)
+    app = current_app._get_current_object()
+    limiter = RateLimiter(max_rate)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                rebuild_service_index,
+                app,
+                name,
+                service,
+                chunk_size=chunk_size,
+                limiter=limiter,
+                resume=resume,
+                swap=swap,
+                since=since,
+                ids=ids,
+            ): name
+            for name, service in services.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except NotImplementedError:
+                results[name] = None
+            except Exception as e:
+                # the other services go on, this one resumes on the next run
+                secho(f"{name}: rebuild failed: {e!r}", fg="red", err=True)
+                results[name] = e
+    return results
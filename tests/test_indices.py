@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio App RDM is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the rebuild of the search indices."""
+
+import time
+from datetime import datetime
+
+import pytest
+from invenio_access.permissions import system_identity
+from invenio_rdm_records.proxies import current_rdm_records
+from invenio_rdm_records.records.api import RDMDraft, RDMRecord
+
+from invenio_app_rdm.upgrade_scripts.engine import get_checkpoint
+from invenio_app_rdm.utils.indices import (
+    IndexSwap,
+    RateLimiter,
+    get_reindex_targets,
+    iter_index_drift,
+    rebuild_indices,
+)
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(100)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.wait(10)
+    # the first 10 documents are not delayed, the 20 next ones are
+    assert time.monotonic() - started >= 0.2
+
+    limiter = RateLimiter()
+    started = time.monotonic()
+    limiter.wait(10**6)
+    assert time.monotonic() - started < 0.1
+
+
+def test_rebuild_indices(running_app, minimal_record):
+    service = current_rdm_records.records_service
+    assert [cls for cls, _ in get_reindex_targets(service)] == [RDMRecord, RDMDraft]
+
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)
+    service.indexer.delete(record._record)
+    RDMRecord.index.refresh()
+
+    results = rebuild_indices({"records": service}, chunk_size=1)
+    assert results == {"records": 0}
+    RDMRecord.index.refresh()
+    assert service.search(system_identity).total == 1
+    assert get_checkpoint("reindex:records:rdm_records_metadata") is None
+
+
+def test_rebuild_indices_swap(running_app, minimal_record):
+    service = current_rdm_records.records_service
+    draft = service.create(system_identity, minimal_record)
+    service.publish(system_identity, draft.id)
+    live_indices = IndexSwap("records", RDMRecord, service.indexer).live_indices()
+
+    results = rebuild_indices({"records": service}, swap=True)
+    assert results == {"records": 0}
+    # the aliases moved to the new indices, the old ones are kept
+    client = service.indexer.client
+    for live_index, value in live_indices.items():
+        assert client.indices.exists(index=live_index)
+        assert not client.indices.get_alias(index=live_index)[live_index]["aliases"]
+        for alias in value["aliases"]:
+            assert live_index not in client.indices.get_alias(name=alias)
+        client.indices.delete(index=live_index)
+
+    RDMRecord.index.refresh()
+    assert service.search(system_identity).total == 1
+
+
+def test_index_drift(running_app, minimal_record):
+    service = current_rdm_records.records_service
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)._record
+    since = datetime.utcnow()
+    service.indexer.delete(record)
+    RDMRecord.index.refresh()
+
+    drift = list(iter_index_drift(RDMRecord, service.indexer, since=record.updated))
+    assert drift == [(str(record.id), "missing")]
+
+    # nothing was updated since, so nothing is reindexed
+    assert rebuild_indices({"records": service}, since=since) == {"records": 0}
+    assert list(iter_index_drift(RDMRecord, service.indexer, ids=[record.id]))
+
+    rebuild_indices({"records": service}, ids=[record.id])
+    assert not list(iter_index_drift(RDMRecord, service.indexer, ids=[record.id]))
+
+
+def test_index_swap_resume(running_app, minimal_record, monkeypatch):
+    service = current_rdm_records.records_service
+    draft = service.create(system_identity, minimal_record)
+    service.publish(system_identity, draft.id)
+    index_swap = IndexSwap("records", RDMRecord, service.indexer)
+    live_indices = index_swap.live_indices()
+
+    count_records = IndexSwap.count_records
+    monkeypatch.setattr(IndexSwap, "count_records", lambda self, until: -1)
+    with pytest.raises(RuntimeError):
+        index_swap.run()
+    # the new index is kept, to be resumed
+    index = index_swap.pending_index()
+    assert index is not None and index not in live_indices
+
+    monkeypatch.setattr(IndexSwap, "count_records", count_records)
+    assert index_swap.run() == index
+    assert index_swap.pending_index() is None
+    for live_index in live_indices:
+        service.indexer.client.indices.delete(index=live_index)
@@ -6,7 +6,10 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 """Test invenio-app-rdm celery tasks."""
 
-from invenio_app_rdm.tasks import file_integrity_report
+from invenio_db import db
+from invenio_files_rest.models import FileInstance
+
+from invenio_app_rdm.tasks import file_integrity_report, verify_pending_files
 
 
 def test_task_file_integrity_report(app, invalid_file_instance):
@@ -102,3 +105,68 @@ def test_integrity_report_default_template(app, invalid_file_instance):
         assert "URI: {}".format(uri) in mail_sent.body
         assert "ID: {}".format(str(file_id)) in mail_sent.body
         assert "Name: {}".format(file_name) in mail_sent.body
+
+
+def test_integrity_report_csv_attachment(app, invalid_file_instance):
+    """Test that large reports are attached as CSV."""
+    mail = app.extensions.get("mail")
+    file_name = invalid_file_instance.objects[0].key
+
+    with mail.record_messages() as outbox:
+        app.config["APP_RDM_ADMIN_EMAIL_RECIPIENT"] = "test@invenio.org"
+        app.config["MAIL_DEFAULT_SENDER"] = "test@invenio.org"
+        app.config["APP_RDM_FILES_INTEGRITY_REPORT_ATTACHMENT_THRESHOLD"] = 0
+        try:
+            file_integrity_report()
+        finally:
+            app.config["APP_RDM_FILES_INTEGRITY_REPORT_ATTACHMENT_THRESHOLD"] = 1000
+        assert len(outbox) == 1
+        mail_sent = outbox[0]
+        assert "attached CSV report" in mail_sent.body
+        assert "ID: {}".format(invalid_file_instance.id) not in mail_sent.body
+
+        (attachment,) = mail_sent.attachments
+        assert attachment.content_type == "text/csv"
+        report = attachment.data.decode("utf-8")
+        assert report.startswith("id,uri,filename,")
+        assert (
+            "{},{}".format(invalid_file_instance.id, invalid_file_instance.uri)
+            in report
+        )
+        assert file_name in report
+
+
+def test_verify_pending_files(app, invalid_file_instance):
+    """Test the verification of the files which errored during their last check."""
+    file_id = invalid_file_instance.id
+    invalid_file_instance.last_check = None
+    db.session.commit()
+
+    app.config["APP_RDM_FILES_INTEGRITY_VERIFY_WORKERS"] = 1
+    try:
+        progress = verify_pending_files()
+    finally:
+        app.config["APP_RDM_FILES_INTEGRITY_VERIFY_WORKERS"] = 4
+
+    assert progress["checked"] == progress["pending"] == 1
+    assert progress["bytes"] == invalid_file_instance.size
+    assert FileInstance.query.get(file_id).last_check is False
+
+
+def test_verify_pending_files_failure(app, invalid_file_instance, monkeypatch):
+    """Test that a failed verification is logged, without failing the task."""
+    invalid_file_instance.last_check = None
+    db.session.commit()
+
+    def _fail(file_ids, deadline=None):
+        raise IOError("Storage unavailable.")
+
+    monkeypatch.setattr("invenio_app_rdm.tasks.verify_files_checksums", _fail)
+    app.config["APP_RDM_FILES_INTEGRITY_VERIFY_WORKERS"] = 1
+    try:
+        progress = verify_pending_files()
+    finally:
+        app.config["APP_RDM_FILES_INTEGRITY_VERIFY_WORKERS"] = 4
+
+    assert progress["pending"] == 1
+    assert progress["checked"] == 0
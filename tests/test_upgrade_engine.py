@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-App-RDM is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the batch engine of the upgrade scripts."""
+
+from functools import partial
+from uuid import UUID
+
+from invenio_access.permissions import system_identity
+from invenio_rdm_records.proxies import current_rdm_records
+from invenio_rdm_records.records.api import RDMRecord
+
+from invenio_app_rdm.cli import upgrade
+from invenio_app_rdm.upgrade_scripts.engine import RecordsMigration, get_checkpoint
+
+
+def _update_title(record):
+    record["metadata"]["title"] = "Migrated"
+    record.commit()
+
+
+def _fail(record):
+    raise ValueError("failed")
+
+
+def test_records_migration(running_app, minimal_record):
+    service = current_rdm_records.records_service
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)
+
+    # a dry run reports the changes without committing them
+    migration = RecordsMigration("test", _update_title, batch_size=1, dry_run=True)
+    migration.run(RDMRecord)
+    assert migration.report()
+    assert migration.changed == migration.processed == 1
+    assert RDMRecord.pid.resolve(record.id)["metadata"]["title"] != "Migrated"
+    assert get_checkpoint("test:rdm_records_metadata") is None
+
+    # failures are collected, without aborting the migration
+    migration = RecordsMigration("test-failing", _fail, batch_size=1)
+    migration.run(RDMRecord)
+    assert not migration.report()
+    assert len(migration.errors) == 1
+    # and kept, to be retried by the next run
+    checkpoint = get_checkpoint("test-failing:rdm_records_metadata")
+    assert not checkpoint["done"]
+    assert checkpoint["failed"] == [str(record.id)]
+
+    migration = RecordsMigration("test-failing", _update_title, batch_size=1)
+    migration.run(RDMRecord)
+    assert migration.report()
+    assert migration.processed == 1
+    checkpoint = get_checkpoint("test-failing:rdm_records_metadata")
+    assert checkpoint["done"] and not checkpoint["failed"]
+
+    migration = RecordsMigration("test", _update_title, batch_size=1)
+    migration.run(RDMRecord)
+    assert migration.report()
+    assert RDMRecord.pid.resolve(record.id)["metadata"]["title"] == "Migrated"
+    checkpoint = get_checkpoint("test:rdm_records_metadata")
+    assert checkpoint["done"] and checkpoint["processed"] == 1
+
+    # a completed migration is not run again
+    migration = RecordsMigration("test", _fail, batch_size=1)
+    migration.run(RDMRecord)
+    assert migration.report()
+
+
+def test_records_migration_after_commit(running_app, minimal_record):
+    service = current_rdm_records.records_service
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)
+
+    def _update(record):
+        _update_title(record)
+        return partial(_fail, record)
+
+    migration = RecordsMigration("test-after-commit", _update, batch_size=1)
+    migration.run(RDMRecord)
+    assert not migration.report()
+    assert [id_ for id_, _ in migration.errors] == [str(record.id)]
+    # the record was committed before the failure
+    assert RDMRecord.pid.resolve(record.id)["metadata"]["title"] == "Migrated"
+    checkpoint = get_checkpoint("test-after-commit:rdm_records_metadata")
+    assert checkpoint["failed"] == [str(record.id)]
+
+
+def test_records_migration_workers(running_app, minimal_record):
+    service = current_rdm_records.records_service
+    records = []
+    for _ in range(3):
+        draft = service.create(system_identity, minimal_record)
+        records.append(service.publish(system_identity, draft.id))
+
+    migration = RecordsMigration("test-workers", _update_title, batch_size=1, workers=2)
+    migration.run(RDMRecord)
+    assert migration.report()
+    assert migration.processed == 3
+    for record in records:
+        assert RDMRecord.pid.resolve(record.id)["metadata"]["title"] == "Migrated"
+    for partition in range(2):
+        name = migration.checkpoint_name(RDMRecord, partition=partition)
+        assert get_checkpoint(name)["done"]
+
+
+def test_records_migration_partitions():
+    migration = RecordsMigration("test", _update_title, workers=4)
+    assert migration.checkpoint_name(RDMRecord, partition=1) == (
+        "test:rdm_records_metadata:1/4"
+    )
+    # the partitions cover the whole UUID space, without overlapping
+    bounds = [migration.partition_bounds(p) for p in range(4)]
+    assert bounds[0][0] == UUID(int=0)
+    assert bounds[-1][1] is None
+    for (_, upper), (lower, _) in zip(bounds, bounds[1:]):
+        assert upper == lower
+
+
+def test_upgrade_cli_unknown_script(running_app):
+    runner = running_app.app.test_cli_runner()
+    for script in ["migrate_0_0_to_0_1", "engine"]:
+        result = runner.invoke(upgrade, [script])
+        assert result.exit_code == 2
+        assert "Unknown upgrade script" in result.output
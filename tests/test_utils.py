@@ -7,8 +7,22 @@
 
 """Tests for utility functions."""
 
+import zipfile
 from datetime import datetime
-
+from io import BytesIO
+
+from flask import g
+
+from invenio_app_rdm.records_ui.cache import LRUCache
+from invenio_app_rdm.records_ui.custom_fields import CustomFieldsPlan
+from invenio_app_rdm.records_ui.memo import RequestMemo
+from invenio_app_rdm.records_ui.previewer import csv_head, zip_listing
+from invenio_app_rdm.records_ui.previewer.streams import (
+    BoundedStream,
+    list_zip_entries,
+    read_head,
+    read_lines,
+)
 from invenio_app_rdm.records_ui.utils import set_default_value
 
 
@@ -65,3 +79,144 @@ def test_set_default_value__explicit_and_automatic_prefix():
         dict1["metadata"]["publication_date"] == dict2["metadata"]["publication_date"]
     )
     assert dict1["metadata"]["publication_date"] == value
+
+
+def test_lru_cache():
+    """Test the least recently used entries are evicted first."""
+    cache = LRUCache()
+    cache.set("a", 1, maxsize=2)
+    cache.set("b", 2, maxsize=2)
+    assert cache.get("a") == 1
+
+    # "b" is now the least recently used entry
+    cache.set("c", 3, maxsize=2)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_request_memo():
+    """Test the request memo computes each value once."""
+    memo = RequestMemo()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "value"
+
+    assert memo.get_or_call("key", compute) == "value"
+    assert memo.get_or_call("key", compute) == "value"
+    assert len(calls) == 1
+    assert memo.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_custom_fields_plan(app):
+    """Test compiling the custom fields plan leaves the config untouched."""
+
+    class VocabularyField:
+        name = "cern:experiments"
+        relation_cls = object
+        sort_by = None
+
+        def options(self, identity):
+            return [{"sort_by": self.sort_by}]
+
+    ui = [
+        {
+            "section": "CERN",
+            "fields": [
+                {
+                    "field": "cern:experiments",
+                    "props": {"label": "Experiments", "sort_by": "title_sort"},
+                },
+                {"field": "cern:beams", "props": {}},
+            ],
+        }
+    ]
+    field = VocabularyField()
+    plan = CustomFieldsPlan.compile(
+        {"RDM_CUSTOM_FIELDS_UI": ui, "RDM_CUSTOM_FIELDS": [field]}
+    )
+
+    assert plan.vocabularies == ("cern:experiments",)
+    assert dict(plan.error_labels) == {"custom_fields.cern:experiments": "Experiments"}
+    assert plan.ui[0]["fields"][0]["is_vocabulary"]
+    assert dict(plan.sort_by) == {"cern:experiments": "title_sort"}
+    assert field.sort_by is None
+    assert "is_vocabulary" not in ui[0]["fields"][0]
+
+    with app.test_request_context():
+        g.identity = None
+        options = plan.read_options("cern:experiments")
+    assert options == [{"sort_by": "title_sort"}]
+    assert field.sort_by is None
+
+
+def test_bounded_stream():
+    """Test reads stop at the byte limit, whatever the seeks."""
+    stream = BoundedStream(BytesIO(b"a\nbb\nccc\n"), 5)
+    assert stream.read(2) == b"a\n"
+    # seeking back does not shrink what is left to read
+    stream.seek(0)
+    assert stream.read() == b"a\nbb\n"
+    assert stream.read() == b""
+
+    stream.seek(2)
+    assert list(stream) == [b"bb\n"]
+
+    assert read_head(BytesIO(b"a\nbb\nccc\n"), 3) == b"a\nb"
+    assert read_lines(BytesIO(b"a\nbb\nccc\n"), 2, 100) == [b"a\n", b"bb\n"]
+    assert read_lines(BytesIO(b"a\nbb\nccc\n"), 10, 3) == [b"a\n", b"b"]
+
+
+def _zip_file():
+    fp = BytesIO()
+    with zipfile.ZipFile(fp, "w") as zf:
+        zf.writestr("data/", "")
+        zf.writestr("data/table.csv", "a,b\n1,2\n")
+    fp.seek(0)
+    return fp
+
+
+def test_list_zip_entries():
+    """Test listing the entries of a ZIP file."""
+    listing = list_zip_entries(_zip_file(), 1)
+    assert listing["total"] == 2
+    assert listing["entries"] == [
+        {"name": "data/", "size": 0, "compressed_size": 0, "is_dir": True}
+    ]
+
+    tree = zip_listing.make_tree(list_zip_entries(_zip_file(), 10))
+    folder = tree["children"]["data"]
+    assert folder["type"] == "folder"
+    assert folder["children"]["table.csv"]["size"] == 8
+
+
+class _HeadFile:
+    """File which only reads its lines, as the previewed files."""
+
+    def __init__(self, content):
+        self.content = content
+        self.size = len(content)
+
+    def read_lines(self, max_lines, max_bytes=None):
+        return read_lines(BytesIO(self.content), max_lines, max_bytes or self.size)
+
+
+def test_csv_head_rows(app):
+    """Test the CSV previewer only reads the first lines."""
+    app.config["APP_RDM_PREVIEWER_CSV_MAX_LINES"] = 2
+    try:
+        rows, truncated = csv_head.read_rows(_HeadFile(b"a;b\n1;2\n3;4\n"))
+    finally:
+        app.config["APP_RDM_PREVIEWER_CSV_MAX_LINES"] = 1000
+    assert rows == [["a", "b"], ["1", "2"]]
+    assert truncated
+
+    rows, truncated = csv_head.read_rows(_HeadFile(b"a,b\n1,2\n"))
+    assert rows == [["a", "b"], ["1", "2"]]
+    assert not truncated
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-App-RDM is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the bulk export of records."""
+
+import json
+
+from invenio_rdm_records.records.api import RDMRecord
+
+from invenio_app_rdm.cli import export_records
+
+
+def test_bulk_export_cli(running_app, record, tmp_path):
+    """Test exporting all records as JSON Lines."""
+    RDMRecord.index.refresh()
+    output = tmp_path / "records.jsonl"
+
+    runner = running_app.app.test_cli_runner()
+    result = runner.invoke(export_records, ["json", "-o", str(output)])
+    assert result.exit_code == 0
+
+    lines = output.read_text().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["id"] == record.id
+
+
+def test_bulk_export_view(client, running_app, record):
+    """Test the bulk export view is disabled by default."""
+    res = client.get("/records/export/json")
+    assert res.status_code == 404
+
+    running_app.app.config["APP_RDM_RECORDS_BULK_EXPORT_ENABLED"] = True
+    try:
+        RDMRecord.index.refresh()
+        res = client.get("/records/export/datacite-xml")
+        assert res.status_code == 200
+        assert res.data.startswith(b"<?xml")
+        assert res.data.count(b"<resource") == 1
+    finally:
+        running_app.app.config["APP_RDM_RECORDS_BULK_EXPORT_ENABLED"] = False
@@ -9,10 +9,11 @@
 
 import pytest
 from invenio_access.permissions import system_identity
-from invenio_search.engine import dsl
+from invenio_cache import current_cache
 from invenio_vocabularies.proxies import current_service as vocabulary_service
 from invenio_vocabularies.records.api import Vocabulary
 
+from invenio_app_rdm.records_ui.cache import register_vocabularies_options_invalidation
 from invenio_app_rdm.records_ui.views.deposits import VocabulariesOptions
 
 
@@ -94,13 +95,38 @@ def test_resource_types(app, client_with_login, additional_resource_types):
         },
     ]
 
-    # the choice of this filter isn't important for the test
-    result = options._resource_types(dsl.Q("term", tags="depositable"))
+    # the choice of this tag isn't important for the test
+    result = options._dump_resource_types("depositable")
 
     sorted_result = sorted(result, key=lambda e: e["id"])
     assert expected == sorted_result
 
 
+def test_resource_types_single_search(
+    app, client_with_login, additional_resource_types, monkeypatch
+):
+    """Test that depositable and linkable types are read in one search."""
+    options = VocabulariesOptions()
+    read_all = vocabulary_service.read_all
+    calls = []
+
+    def counting_read_all(*args, **kwargs):
+        calls.append(kwargs.get("type"))
+        return read_all(*args, **kwargs)
+
+    monkeypatch.setattr(vocabulary_service, "read_all", counting_read_all)
+    depositable = options.depositable_resource_types()
+    linkable = options.linkable_resource_types()
+
+    assert calls == ["resourcetypes"]
+    assert {"publication", "publication-annotationcollection"} <= {
+        rt["id"] for rt in depositable
+    }
+    assert {"publication", "publication-annotationcollection"} <= {
+        rt["id"] for rt in linkable
+    }
+
+
 def test_dump_subjects_vocabulary(running_app):
     options = VocabulariesOptions()
     expected = {
@@ -113,3 +139,32 @@ def test_dump_subjects_vocabulary(running_app):
     result = options.subjects()
 
     assert expected == result
+
+
+def test_dump_cached_vocabularies(app, client_with_login, additional_resource_types):
+    """Test the vocabularies options are cached until a vocabulary changes."""
+    app.config["APP_RDM_DEPOSIT_FORM_VOCABULARIES_CACHE_ENABLED"] = True
+    register_vocabularies_options_invalidation()
+    current_cache.clear()
+    try:
+        dumped = VocabulariesOptions().dump()
+        assert VocabulariesOptions().dump() == dumped
+
+        vocabulary_service.create(
+            system_identity,
+            {
+                "id": "software",
+                "icon": "code",
+                "props": {"type": "software", "subtype": ""},
+                "title": {"en": "Software"},
+                "tags": ["depositable", "linkable"],
+                "type": "resourcetypes",
+            },
+        )
+        Vocabulary.index.refresh()
+
+        resource_types = VocabulariesOptions().dump()["resource_type"]
+        assert "software" in [rt["id"] for rt in resource_types]
+    finally:
+        current_cache.clear()
+        app.config["APP_RDM_DEPOSIT_FORM_VOCABULARIES_CACHE_ENABLED"] = False
@@ -35,3 +35,34 @@ def test_export_formats(client, running_app, cache, record):
     for f in formats:
         res = client.get(f"/records/{record.id}/export/{f}")
         assert res.status_code == 200
+
+
+def test_export_conditional_requests(client, running_app, cache, record):
+    """Test that exports can be revalidated with ETag and Last-Modified."""
+    res = client.get(f"/records/{record.id}/export/json")
+    assert res.status_code == 200
+    etag = res.headers["ETag"]
+    assert res.headers["Last-Modified"]
+
+    res = client.get(
+        f"/records/{record.id}/export/json", headers={"If-None-Match": etag}
+    )
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+
+    # another format is a different representation
+    res = client.get(
+        f"/records/{record.id}/export/csl", headers={"If-None-Match": etag}
+    )
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+    # the access granted by a secret link changes the representation
+    with client.session_transaction() as session:
+        session["token"] = "secret-link-token"
+    res = client.get(
+        f"/records/{record.id}/export/json", headers={"If-None-Match": etag}
+    )
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+    assert "private" in res.headers["Cache-Control"]
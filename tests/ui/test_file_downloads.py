@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-App-RDM is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the record file downloads."""
+
+from types import SimpleNamespace
+
+import pytest
+from invenio_files_rest.models import Location
+
+from invenio_app_rdm.records_ui.downloads import is_partial_download
+
+
+@pytest.fixture()
+def offloaded_downloads(running_app):
+    """Offload the downloads of the default location to the proxy."""
+    config = running_app.app.config
+    location = Location.get_default().uri.rstrip("/") + "/"
+    config["APP_RDM_FILES_DOWNLOAD_OFFLOAD"] = "x-accel-redirect"
+    config["APP_RDM_FILES_DOWNLOAD_OFFLOAD_PATHS"] = {location: "/protected/"}
+    yield
+    config["APP_RDM_FILES_DOWNLOAD_OFFLOAD"] = None
+    config["APP_RDM_FILES_DOWNLOAD_OFFLOAD_PATHS"] = {}
+
+
+def test_offloaded_download(client, record_with_file, offloaded_downloads):
+    """Test that the transfer is handed to the proxy."""
+    res = client.get(f"/records/{record_with_file.id}/files/article.txt?download=1")
+    assert res.status_code == 200
+    assert res.headers["X-Accel-Redirect"].startswith("/protected/")
+    assert res.headers["Content-Disposition"] == 'attachment; filename="article.txt"'
+    assert res.data == b""
+
+
+def test_streamed_download(client, record_with_file):
+    """Test that files are streamed when offloading is disabled."""
+    res = client.get(f"/records/{record_with_file.id}/files/article.txt")
+    assert res.status_code == 200
+    assert "X-Accel-Redirect" not in res.headers
+    assert res.data == b"test file content"
+
+
+def test_range_download(client, record_with_file):
+    """Test downloading a single byte range."""
+    url = f"/records/{record_with_file.id}/files/article.txt"
+    res = client.get(url, headers={"Range": "bytes=5-8"})
+    assert res.status_code == 206
+    assert res.headers["Content-Range"] == "bytes 5-8/17"
+    assert res.data == b"file"
+
+    # resuming with an outdated validator sends the whole file
+    res = client.get(url, headers={"Range": "bytes=5-", "If-Range": '"md5:outdated"'})
+    assert res.status_code == 200
+    assert res.data == b"test file content"
+
+    res = client.get(url, headers={"Range": "bytes=100-"})
+    assert res.status_code == 416
+    assert res.headers["Content-Range"] == "bytes */17"
+
+
+def test_multi_range_download(client, record_with_file):
+    """Test downloading several byte ranges at once."""
+    url = f"/records/{record_with_file.id}/files/article.txt"
+    res = client.get(url, headers={"Range": "bytes=0-3,-7"})
+    assert res.status_code == 206
+    assert res.mimetype == "multipart/byteranges"
+    assert int(res.headers["Content-Length"]) == len(res.data)
+    assert b"Content-Range: bytes 0-3/17\r\n\r\ntest\r\n" in res.data
+    assert b"Content-Range: bytes 10-16/17\r\n\r\ncontent\r\n" in res.data
+
+
+def test_is_partial_download(app):
+    """Test that only the resumed transfers are partial downloads."""
+    file_instance = SimpleNamespace(checksum="md5:abc", updated=None)
+    object_version = SimpleNamespace(file=file_instance)
+    file_item = SimpleNamespace(_file=SimpleNamespace(object_version=object_version))
+
+    with app.test_request_context(headers={"Range": "bytes=5-"}):
+        assert is_partial_download(file_item)
+    with app.test_request_context(headers={"Range": "bytes=0-"}):
+        assert not is_partial_download(file_item)
+    with app.test_request_context(
+        headers={"Range": "bytes=5-", "If-Range": '"md5:abc"'}
+    ):
+        assert is_partial_download(file_item)
+    # the whole file is sent when the precondition fails
+    headers = {"Range": "bytes=5-", "If-Range": '"md5:outdated"'}
+    with app.test_request_context(headers=headers):
+        assert not is_partial_download(file_item)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-App-RDM is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the paginated listing of the record files."""
+
+import pytest
+from invenio_access.permissions import system_identity
+from invenio_rdm_records.proxies import current_rdm_records
+
+from invenio_app_rdm.records_ui.files import (
+    list_file_list_page,
+    list_files_page,
+    paginate_file_list,
+    paginate_files,
+)
+
+
+@pytest.fixture()
+def files():
+    """Dumped files of a record, with a pending upload."""
+    entries = [
+        {"key": f"file-{i:02}.txt", "size": i, "status": "completed"} for i in range(10)
+    ]
+    entries.append({"key": "pending.txt", "size": 100, "status": "pending"})
+    return {"enabled": True, "entries": entries, "default_preview": "file-08.txt"}
+
+
+def test_paginate_files(app, files):
+    page = paginate_files(files, size=3)
+    assert [f["key"] for f in page["entries"]] == [
+        "file-00.txt",
+        "file-01.txt",
+        "file-02.txt",
+        # the default preview is always kept
+        "file-08.txt",
+    ]
+    assert page["totals"] == {"count": 10, "bytes": 45}
+    assert page["next"] == "file-02.txt"
+
+    page = paginate_files(files, size=20)
+    assert len(page["entries"]) == 10
+    assert page["next"] is None
+
+
+def test_list_files_page(files):
+    page = list_files_page(files, 4)
+    assert [f["key"] for f in page["entries"]][-1] == "file-03.txt"
+    assert page["next"] == "file-03.txt"
+
+    page = list_files_page(files, 4, after=page["next"])
+    assert page["entries"][0]["key"] == "file-04.txt"
+
+    page = list_files_page(files, 4, sort="-size", prefix="file-0")
+    assert [f["key"] for f in page["entries"]] == [
+        "file-09.txt",
+        "file-08.txt",
+        "file-07.txt",
+        "file-06.txt",
+    ]
+    assert page["totals"] == {"count": 10, "bytes": 45}
+
+    with pytest.raises(ValueError):
+        list_files_page(files, 4, sort="unknown")
+    with pytest.raises(ValueError):
+        list_files_page(files, 4, after="unknown.txt")
+
+
+def test_files_list_view(client, record_with_file):
+    res = client.get(f"/records/{record_with_file.id}/files-list?size=1")
+    assert res.status_code == 200
+    assert [f["key"] for f in res.json["entries"]] == ["article.txt"]
+    assert res.json["totals"]["count"] == 1
+    assert res.json["next"] is None
+
+    res = client.get(f"/records/{record_with_file.id}/files-list?sort=unknown")
+    assert res.status_code == 400
+
+
+def test_paginate_file_list(running_app, record_with_file):
+    file_list = current_rdm_records.records_service.files.list_files(
+        system_identity, record_with_file.id
+    )
+    assert paginate_file_list(file_list, size=1) == paginate_files(
+        file_list.to_dict(), size=1
+    )
+
+    page = list_file_list_page(file_list, 1)
+    assert [f["key"] for f in page["entries"]] == ["article.txt"]
+    # only the entries of the page are serialized, with their links
+    assert "content" in page["entries"][0]["links"]
+    assert page["totals"] == {"count": 1, "bytes": 17}
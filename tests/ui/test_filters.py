@@ -1,4 +1,6 @@
-from invenio_app_rdm.records_ui.views.filters import get_scheme_label
+import pytest
+
+from invenio_app_rdm.records_ui.views.filters import get_scheme_label, order_entries
 
 
 def test_get_scheme_label(app):
@@ -8,3 +10,43 @@ def test_get_scheme_label(app):
     assert "arXiv" == get_scheme_label("arxiv")
 
     assert "Bibcode" == get_scheme_label("ads")
+
+
+def test_order_entries():
+    entries = [{"key": "b.txt"}, {"key": "C.txt"}, {"key": "a.txt"}]
+
+    assert [f["key"] for f in order_entries({"entries": entries})] == [
+        "a.txt",
+        "b.txt",
+        "C.txt",
+    ]
+
+    # entries missing from the order are appended, unknown keys ignored
+    files = {"entries": entries, "order": ["C.txt", "missing.txt", "a.txt"]}
+    assert [f["key"] for f in order_entries(files)] == ["C.txt", "a.txt", "b.txt"]
+
+
+class _Entry(dict):
+    """File entry counting the lookups of its keys."""
+
+    lookups = 0
+
+    def __getitem__(self, key):
+        _Entry.lookups += 1
+        return super().__getitem__(key)
+
+
+@pytest.mark.parametrize("size", [10, 1000, 10000])
+def test_order_entries_linear(size):
+    """Ordering the entries is linear in their number."""
+    entries = [_Entry(key=f"file-{i}.txt") for i in range(size)]
+    order = [f"file-{i}.txt" for i in reversed(range(size))]
+    entries.append(_Entry(key="unordered.txt"))
+
+    _Entry.lookups = 0
+    ordered = order_entries({"entries": entries, "order": order})
+
+    assert ordered[0]["key"] == f"file-{size - 1}.txt"
+    assert ordered[-1]["key"] == "unordered.txt"
+    # a quadratic implementation looks the entries up about size**2 times
+    assert _Entry.lookups <= 2 * (size + 1) + 2
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-App-RDM is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the landing page cache."""
+
+import pytest
+from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
+from invenio_rdm_records.proxies import current_rdm_records
+
+
+@pytest.fixture(scope="function")
+def landing_page_cache(running_app):
+    """Enable the landing page cache on a clean cache."""
+    config = running_app.app.config
+    config["APP_RDM_RECORD_LANDING_PAGE_CACHE_ENABLED"] = True
+    try:
+        current_cache.clear()
+        yield current_cache
+    finally:
+        current_cache.clear()
+        config["APP_RDM_RECORD_LANDING_PAGE_CACHE_ENABLED"] = False
+
+
+def test_landing_page_cache(client, landing_page_cache, record):
+    """Test that anonymous landing pages are cached per record revision."""
+    res = client.get(f"/records/{record.id}")
+    assert res.status_code == 200
+    assert "Link" in res.headers
+
+    # a cached page is served as long as the record revision does not change
+    res_cached = client.get(f"/records/{record.id}")
+    assert res_cached.status_code == 200
+    assert res_cached.data == res.data
+
+    # a new revision of the record is rendered again
+    service = current_rdm_records.records_service
+    draft = service.edit(system_identity, record.id)
+    data = draft.data
+    data["metadata"]["title"] = "An updated title"
+    service.update_draft(system_identity, draft.id, data)
+    service.publish(system_identity, draft.id)
+
+    res_updated = client.get(f"/records/{record.id}")
+    assert res_updated.status_code == 200
+    assert b"An updated title" in res_updated.data
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-App-RDM is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the dispatch of files to previewers."""
+
+from types import SimpleNamespace
+
+from invenio_app_rdm.records_ui.previewer.dispatch import (
+    file_extension,
+    get_previewable_extensions,
+    get_previewers,
+)
+
+
+def test_file_extension():
+    assert file_extension("data/Table.CSV") == "csv"
+    assert file_extension("README") == ""
+
+
+def test_get_previewable_extensions():
+    plugin = SimpleNamespace(previewable_extensions=["CSV", ".dsv"])
+    assert get_previewable_extensions(plugin) == {"csv", "dsv"}
+    # the previewers which do not declare them may preview any file
+    assert get_previewable_extensions(SimpleNamespace()) is None
+    assert (
+        get_previewable_extensions(SimpleNamespace(previewable_extensions=[])) is None
+    )
+
+
+def test_get_previewers(running_app):
+    names = [p.__name__.rsplit(".", 1)[-1] for p in get_previewers("pdf")]
+    assert "pdfjs" in names
+    for name in ("csv_papaparsejs", "txt", "json_prismjs", "ipynb", "mistune"):
+        assert name not in names
+    # the content of csv files or images is validated on the real file
+    assert "csv_papaparsejs" in [
+        p.__name__.rsplit(".", 1)[-1] for p in get_previewers("csv")
+    ]
+    assert "simple_image" in [
+        p.__name__.rsplit(".", 1)[-1] for p in get_previewers("png")
+    ]
+
+    # the table is built once per extension
+    assert get_previewers("pdf") is get_previewers("pdf")
+
+
+def test_txt_head_preview(client, record_with_file):
+    res = client.get(f"/records/{record_with_file.id}/preview/article.txt")
+    assert res.status_code == 200
+    assert b"test file content" in res.data
@@ -16,6 +16,8 @@ from invenio_search.engine import dsl
 from invenio_stats.proxies import current_stats
 from invenio_stats.tasks import process_events
 
+from invenio_app_rdm.records_ui.stats import get_stats_events_buffer
+
 
 @pytest.fixture()
 def empty_event_queues(running_app):
@@ -44,6 +46,46 @@ def test_record_view_events(
     assert event["via_api"] is False
 
 
+def test_revalidated_record_view_events(
+    client, running_app, index_templates, record, empty_event_queues
+):
+    """Test that revalidated landing page visits trigger events too."""
+    res = client.get(f"/records/{record.id}")
+    assert res.status_code == 200
+
+    res = client.get(
+        f"/records/{record.id}", headers={"If-None-Match": res.headers["ETag"]}
+    )
+    assert res.status_code == 304
+
+    queue = current_stats.events["record-view"].queue
+    events = list(queue.consume())
+    assert len(events) == 2
+    assert all(event["recid"] == record.id for event in events)
+
+
+def test_buffered_record_view_events(
+    client, running_app, index_templates, record, empty_event_queues
+):
+    """Test that buffered events are published once the buffer is flushed."""
+    app = running_app.app
+    app.config["APP_RDM_STATS_EVENTS_BUFFER_ENABLED"] = True
+    try:
+        res = client.get(f"/records/{record.id}")
+        assert res.status_code == 200
+
+        buffer = get_stats_events_buffer(app)
+        buffer.stop()
+
+        queue = current_stats.events["record-view"].queue
+        events = list(queue.consume())
+        assert len(events) == 1
+        assert events[0]["recid"] == record.id
+        assert buffer.dropped == 0
+    finally:
+        app.config["APP_RDM_STATS_EVENTS_BUFFER_ENABLED"] = False
+
+
 def test_record_view_statistics(
     client, running_app, index_templates, record, empty_event_queues
 ):
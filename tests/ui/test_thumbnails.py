@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# Invenio-App-RDM is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the record thumbnails and IIIF derivatives."""
+
+from invenio_app_rdm.records_ui.images import (
+    get_derivative_spec,
+    select_thumbnail_file,
+)
+
+
+class FakeRecord:
+    """Record result item exposing only its data."""
+
+    def __init__(self, files):
+        """Constructor."""
+        self.data = {"files": files}
+
+
+def test_select_thumbnail_file(running_app):
+    """Test the default preview image is preferred to the other images."""
+    files = {"entries": {"article.txt": {}, "figure.png": {}, "photo.jpg": {}}}
+    assert select_thumbnail_file(FakeRecord(files)) == "figure.png"
+
+    files["default_preview"] = "photo.jpg"
+    assert select_thumbnail_file(FakeRecord(files)) == "photo.jpg"
+
+    assert select_thumbnail_file(FakeRecord({"entries": {"article.txt": {}}})) is None
+
+
+def test_thumbnail_without_images(client, record_with_file):
+    """Test records without images have no thumbnail."""
+    res = client.get(f"/records/{record_with_file.id}/thumb250")
+    assert res.status_code == 404
+
+
+def test_derivative_spec(running_app):
+    """Test the IIIF parameters of the derivatives."""
+    assert get_derivative_spec("photo.png", "preview") == ("!800,800", "png")
+    assert get_derivative_spec("photo.tiff", "preview") == ("!800,800", "jpg")
+    assert get_derivative_spec("photo.tiff", "thumbnail-250") == ("250,", "png")
+    assert get_derivative_spec("photo.tiff", "thumbnail-251") is None
+
+
+def test_derivatives_disabled(client, record_with_file):
+    """Test derivatives are not served unless enabled."""
+    res = client.get(f"/records/{record_with_file.id}/derivatives/preview/article.txt")
+    assert res.status_code == 404